@@ -1,6 +1,11 @@
 import yfinance as yf
-from datetime import datetime, timedelta
-import os
+from datetime import datetime
+
+from algotrading.ajustes import ajustar_barras, deshacer_splits
+from algotrading.almacen import anexar_barras, cargar_barras
+from algotrading.descargas import descargar
+from algotrading.ingesta import ingerir
+from algotrading.remuestreo import remuestrear, remuestrear_almacen
 
 #Configuracion de parametros
 
@@ -16,11 +21,14 @@ datos = yf.download(ticker, start=fecha_inicial, end=fecha_final, interval=inter
 print('Datos Historicos')
 print(datos.head())
 
-#Guardar los datos en un archivo csv
+#Guardar los datos en el almacen local (datos/ohlcv/<ticker>/<intervalo>), en formato columnar binario
+# yf.download entrega los precios ya ajustados; el almacen guarda los precios negociados con Dividends y Stock Splits
+# (el ajuste se calcula localmente), asi que se llena con descargar, que solo pide los tramos que faltan
+
+descargar(ticker, fecha_inicial, fecha_final, intervalo)
 
-if not os.path.isdir("../datos"):
-    os.mkdir("../datos")
-datos.to_csv("../datos/datos_historicos.csv")
+#Los scripts pueden leer los datos del almacen sin volver a descargarlos
+print(cargar_barras(ticker, intervalo, inicio=fecha_inicial, fin=fecha_final).tail())
 
 #Ejemplos de uso de diferentes activos e intervalos de tiempo
 
@@ -29,19 +37,27 @@ datos.to_csv("../datos/datos_historicos.csv")
 intervalo_1m = yf.download(tickers="BTC-USD", interval="1m")
 print('Datos de 1 minuto:')
 print(intervalo_1m)
+# Yahoo Finance solo sirve 7 dias de barras de 1 minuto: anexarlas en cada ejecucion va acumulando la historia
+anexar_barras(intervalo_1m, "BTC-USD", "1m")
 
-#Ejemplo2: Descargar datos con intervalo de 15 minutos (limitado a 60 dias)
+#Ejemplo2: Barras de 15 minutos, 1 hora y 1 dia construidas a partir de las de 1 minuto, sin otra descarga
+# (Open de la primera barra, High maximo, Low minimo, Close de la ultima y Volume sumado). Cada vez que se guardan
+# nuevas barras de 1 minuto, remuestrear_almacen solo vuelve a agregar la ultima barra de cada intervalo.
 
-fecha_final = datetime.now()
-fecha_inicial = fecha_final - timedelta(days=30)
-fecha_final = fecha_final.strftime("%Y-%m-%d")
-fecha_inicial = fecha_inicial.strftime("%Y-%m-%d")
-intervalo_15m = yf.download(tickers="BTC-USD", start=fecha_inicial, end=fecha_final, interval="15m")
+for intervalo_grueso in ["15m", "1h", "1d"]:
+    remuestrear_almacen("BTC-USD", origen="1m", destino=intervalo_grueso)
+intervalo_15m = cargar_barras("BTC-USD", "15m")
 print("Datos de 15 minutos")
 print(intervalo_15m)
 
+# Las cubetas se cortan en la hora local de zona_horaria (por defecto, la del indice). Para acciones,
+# sesion=("09:30", "16:00") ademas descarta el pre y post mercado y alinea las horas a la apertura
+print(remuestrear(intervalo_1m, "1d", zona_horaria="America/New_York"))
+
+fecha_final = datetime.now().strftime("%Y-%m-%d")
+
 #Ejemplo3: Descargar datos con intervalo de 1 dia (No hay limite establecido)
-intervalo_1d = yf.download(tickers="CL=F", start="2010-01-01", end="2024-08-01", interval="1d")
+intervalo_1d = descargar("CL=F", "2010-01-01", "2024-08-01", "1d")
 print("Datos de 1 dia:")
 print(intervalo_1d)
 
@@ -55,7 +71,25 @@ print(accion_hist["Dividends"][accion_hist["Dividends"]!=0.0])
 #Imprimir splits
 print(accion_hist["Stock Splits"][accion_hist["Stock Splits"]!=0.0])
 
+# Ajustar localmente con los dividendos y splits: se parte de los precios negociados (sin ajustar) y se aplican los
+# factores de las acciones posteriores a cada barra. El resultado coincide con el ajuste de Yahoo Finance
+accion_sin_ajustar = deshacer_splits(accion.history(period="max", end=fecha_final, interval="1d", auto_adjust=False))
+accion_ajustada = ajustar_barras(accion_sin_ajustar)
+print("Diferencia maxima con el ajuste de Yahoo Finance:")
+print((accion_ajustada["Close"] / accion_hist["Close"] - 1).abs().max())
+
+#Ejemplo 5: Descarga masiva de varios activos e intervalos a la vez
+# Las descargas se reparten entre varios hilos, respetando un maximo de peticiones por segundo para que Yahoo Finance
+# no limite las consultas. Para un universo grande se puede usar la linea de comandos:
+#   python -m algotrading.ingesta --archivo-tickers universo.txt --intervalos 1d --inicio 2015-01-01
+
+resumen = ingerir(["AAPL", "TSLA", "AMZN", "^GSPC", "BTC-USD", "CL=F"], intervalos=["1d"], inicio="2020-01-01",
+                  fin=fecha_final, trabajadores=4, tasa=2)
+print("Simbolos por minuto:", resumen["simbolos_por_minuto"])
+
 #Recordatorio:
 # - Yahoo Finance es un proveedor de datos historicos por excelencia (es el más utilizado).
 # - Yahoo Finance puede limitar la frecuencia de las consultas si se realizan demasiadas peticiones
-#   en un corto periodo de tiempo.
\ No newline at end of file
+#   en un corto periodo de tiempo.
+# - Guardar las descargas en el almacen local evita repetir peticiones: cargar_barras lee solo el rango pedido
+#   directamente del disco (memory-mapped) en milisegundos.
\ No newline at end of file
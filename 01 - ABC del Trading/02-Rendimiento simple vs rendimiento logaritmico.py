@@ -1,4 +1,5 @@
-import yfinance as yf
+from algotrading.descargas import descargar
+from algotrading.metricas import rendimiento_logaritmico, rendimiento_simple
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -10,14 +11,16 @@ fecha_inicial = "2023-01-01"
 fecha_final = "2024-01-01"
 
 #Descargar Datos
-datos = yf.download(ticker, start=fecha_inicial, end=fecha_final, interval="1d")
+# Precios ajustados por splits y dividendos: sin ajuste un split aparece como una caida del precio y los dividendos
+# no cuentan en el rendimiento
+datos = descargar(ticker, inicio=fecha_inicial, fin=fecha_final, intervalo="1d", ajustar=True)
 
 #Calcular el Rendimiento Simple
-datos["Rendimiento_Simple"] = datos ["Close"].pct_change() # datos ["Close"] / datos ["Close"].shift(periods=1) -1
+datos["Rendimiento_Simple"] = rendimiento_simple(datos["Close"]) # datos ["Close"] / datos ["Close"].shift(periods=1) -1
 
 #Calcular el Rendimiento Logaritmico
 
-datos["Rendimiento_Logaritmico"] = np.log(datos["Close"] / datos ["Close"].shift(periods=1))
+datos["Rendimiento_Logaritmico"] = rendimiento_logaritmico(datos["Close"])
 
 #Mostrar los primeros registros
 print("Datos con Rendimiento Simple y Logaritmico:")
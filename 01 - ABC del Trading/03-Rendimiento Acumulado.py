@@ -1,7 +1,7 @@
 #Importar librerias
 
-import yfinance as yf
-import numpy as np
+from algotrading.descargas import descargar
+from algotrading.metricas import rendimiento_acumulado, rendimiento_logaritmico, rendimiento_simple
 import matplotlib.pyplot as plt
 
 #Definir Acción
@@ -9,19 +9,21 @@ ticker = "AMZN"
 
 #Descargar datos
 
-datos = yf.download(ticker, start="2023-01-01", end="2024-01-01", interval="1d")
+# Precios ajustados por splits y dividendos: sin ajuste un split aparece como una caida del precio y los dividendos
+# no cuentan en el rendimiento
+datos = descargar(ticker, inicio="2023-01-01", fin="2024-01-01", intervalo="1d", ajustar=True)
 
 #Calcular el rendimiento simple
-datos["Rendimiento_Simple"] = datos["Close"].pct_change()
+datos["Rendimiento_Simple"] = rendimiento_simple(datos["Close"])
 
 #Calcular Rendimiento Logaritmico
-datos["Rendimiento_Logaritmico"] = np.log(datos["Close"] /datos["Close"].shift(periods=1))
+datos["Rendimiento_Logaritmico"] = rendimiento_logaritmico(datos["Close"])
 
 #Calcular el Rendimiento Simple Acumulado
-datos["Rendimiento_Simple_Acumulado"] = (1 + datos["Rendimiento_Simple"]).cumprod() -1
+datos["Rendimiento_Simple_Acumulado"] = rendimiento_acumulado(datos["Rendimiento_Simple"])
 
 #Calcular el Rendimiento Logaritmico Acumulado
-datos["Rendimiento_Logaritmico_Acumulado"] = np.exp(datos["Rendimiento_Logaritmico"].cumsum()) - 1
+datos["Rendimiento_Logaritmico_Acumulado"] = rendimiento_acumulado(datos["Rendimiento_Logaritmico"], logaritmico=True)
 
 #Mostrar los primeros registros
 print("Datos con Rendimiento Simple y Logaritmico Acumulado:")
@@ -1,5 +1,6 @@
 # Importar librerías
-import yfinance as yf
+from algotrading.descargas import descargar
+from algotrading.reduccion import presupuesto_puntos, reducir_serie, reducir_velas
 import matplotlib.pyplot as plt
 import seaborn as sns  # pip install seaborn
 import mplfinance as mpf  # pip install mplfinance
@@ -13,13 +14,16 @@ fecha_inicial = "2023-01-01"
 fecha_final = "2024-01-01"
 
 # Descargar datos
-datos = yf.download(ticker, start=fecha_inicial, end=fecha_final, interval="1d")
-# Eliminar Nivel 1 de Columnas
-datos.columns = datos.columns.droplevel(1)
+datos = descargar(ticker, inicio=fecha_inicial, fin=fecha_final, intervalo="1d")
+
+# Reducir las series al ancho en pixeles de cada grafico (con datos intradia de varios meses hay cientos de miles de
+# barras): LTTB para las lineas y velas agregadas (OHLC por cubeta) para mplfinance y plotly
+velas = reducir_velas(datos, velas=presupuesto_puntos((22, 10), pixeles_por_punto=3))
 
 # Gráfico 1: Precio de Cierre usando matplotlib
 plt.figure(figsize=(12, 6))
-plt.plot(datos.index, datos["Close"], label="Precio de Cierre", color="blue")
+cierre = reducir_serie(datos["Close"], puntos=presupuesto_puntos((12, 6)))
+plt.plot(cierre.index, cierre, label="Precio de Cierre", color="blue")
 plt.xlabel("Fecha")
 plt.ylabel("Precio de Cierre")
 plt.title("Precio de Cierre:" + ticker)
@@ -31,25 +35,29 @@ plt.show()
 fig, axes = plt.subplots(nrows=2, ncols=2, figsize=(22, 12))
 
 # Precio de Cierre
-axes[0, 0].plot(datos.index, datos["Close"], color="blue")
+serie = reducir_serie(datos["Close"], puntos=presupuesto_puntos((11, 6)))
+axes[0, 0].plot(serie.index, serie, color="blue")
 axes[0, 0].set_title("Precio de Cierre")
 axes[0, 0].set_ylabel("Precio")
 axes[0, 0].grid()
 
 # Precio Bajo
-axes[0, 1].plot(datos.index, datos["Low"], color="red")
+serie = reducir_serie(datos["Low"], puntos=presupuesto_puntos((11, 6)))
+axes[0, 1].plot(serie.index, serie, color="red")
 axes[0, 1].set_title("Precio Bajo")
 axes[0, 1].set_ylabel("Precio")
 axes[0, 1].grid()
 
 # Precio Alto
-axes[1, 0].plot(datos.index, datos["High"], color="green")
+serie = reducir_serie(datos["High"], puntos=presupuesto_puntos((11, 6)))
+axes[1, 0].plot(serie.index, serie, color="green")
 axes[1, 0].set_title("Precio Alto")
 axes[1, 0].set_ylabel("Precio")
 axes[1, 0].grid()
 
 # Precio de Apertura
-axes[1, 1].plot(datos.index, datos["Open"], color="purple")
+serie = reducir_serie(datos["Open"], puntos=presupuesto_puntos((11, 6)))
+axes[1, 1].plot(serie.index, serie, color="purple")
 axes[1, 1].set_title("Precio de Apertura")
 axes[1, 1].set_ylabel("Precio")
 axes[1, 1].grid()
@@ -62,7 +70,8 @@ datos["Rendimiento_Simple"] = datos["Close"].pct_change()
 datos.dropna(inplace=True)
 
 plt.figure(figsize=(12, 6))
-sns.lineplot(x=datos.index, y=datos["Rendimiento_Simple"], color="orange")
+rendimientos = reducir_serie(datos["Rendimiento_Simple"], puntos=presupuesto_puntos((12, 6)), metodo="minmax")
+sns.lineplot(x=rendimientos.index, y=rendimientos, color="orange")
 plt.xlabel("Fecha")
 plt.ylabel("Rendimiento Simple")
 plt.title("Rendimiento Simple Para el Activo")
@@ -70,17 +79,17 @@ plt.grid(True)
 plt.show()
 
 # Gráfico 4: Gráfico de velas usando mplfinance
-mpf.plot(datos, type="candle", style="yahoo", title="Gráfico de Velas", ylabel="Precio", volume=True, figsize=(22, 10),
-         figscale=3.0, mav=(9, 21))
+mpf.plot(velas, type="candle", style="yahoo", title="Gráfico de Velas", ylabel="Precio", volume=True, figsize=(22, 10),
+         figscale=3.0, mav=(9, 21), warn_too_much_data=len(velas) + 1)
 plt.show()
 
 #Grafico 5: Grafico de Velas usando Plotly
 fig = go.Figure(data=[
-    go.Candlestick(x=datos.index,
-                   open=datos["Open"],
-                   high=datos["High"],
-                   low=datos["Low"],
-                   close=datos["Close"])
+    go.Candlestick(x=velas.index,
+                   open=velas["Open"],
+                   high=velas["High"],
+                   low=velas["Low"],
+                   close=velas["Close"])
 ])
 
 fig.update_layout(
@@ -1,11 +1,11 @@
 # Importar librerías
-from cProfile import label
-
 import pandas as pd
 from datetime import timedelta
 import matplotlib.pyplot as plt
-import yfinance as yf
-import statsmodels.api as sm
+from algotrading.descargas import descargar
+from algotrading.drawdown import analizar_drawdowns, max_drawdown_movil
+from algotrading.metricas import max_drawdown, rendimiento_simple
+from algotrading.regresion import alpha_beta, alpha_beta_movil
 
 # Parámetros de descarga
 ticker = "TSLA"
@@ -14,39 +14,24 @@ fecha_inicial = "2020-01-01"
 fecha_final = "2024-01-01"
 
 # Descargar datos
-datos = yf.download(ticker, start=fecha_inicial, end=fecha_final, interval="1d")
-benchmark = yf.download(benchmark_ticker, start=fecha_inicial, end=fecha_final, interval="1d")
+datos = descargar(ticker, inicio=fecha_inicial, fin=fecha_final, intervalo="1d")
+benchmark = descargar(benchmark_ticker, inicio=fecha_inicial, fin=fecha_final, intervalo="1d")
 
 # Calcular los rendimientos diarios
-datos["Rendimiento"] = datos["Close"].pct_change()
-benchmark["Rendimiento"] = benchmark["Close"].pct_change()
+datos["Rendimiento"] = rendimiento_simple(datos["Close"])
+benchmark["Rendimiento"] = rendimiento_simple(benchmark["Close"])
 datos.dropna(inplace=True)
 benchmark.dropna(inplace=True)
 
 # ---- Máxima Pérdida (Max Drawdown)
-def max_drawdown(rendimientos):
-    """
-    Calcula la máxima pérdida, el capital acumulado, la serie de drawdown,
-    la fecha del pico previo y la fecha del valle (máximo drawdown).
-    """
-    capital_acumulado = (1 + rendimientos).cumprod()
-    maximo_acumulado = capital_acumulado.cummax()
-    drawdown = (maximo_acumulado - capital_acumulado) / maximo_acumulado
-
-    # Valor de máxima pérdida
-    maxima_perdida_valor = drawdown.max()
-
-    # Fecha del valle (día donde el drawdown es máximo)
-    fecha_valle = drawdown.idxmax()
-
-    # Fecha del pico previo (máximo acumulado anterior al valle)
-    fecha_pico = capital_acumulado.loc[:fecha_valle].idxmax()
-
-    return maxima_perdida_valor, capital_acumulado, drawdown, fecha_pico, fecha_valle
-
 maxima_perdida_accion, capital_acumulado, drawdown, fecha_maxima, fecha_final_dd = max_drawdown(datos["Rendimiento"])
 print(f"Maxima Pérdida de {ticker}: {maxima_perdida_accion:.2%}")
 
+# Todos los episodios de drawdown y maxima perdida movil de un año (252 barras)
+episodios = analizar_drawdowns(datos["Rendimiento"]).episodios
+print(episodios.nlargest(5, "profundidad"))
+print(f"Maxima Pérdida de los ultimos 252 dias: {max_drawdown_movil(datos['Rendimiento'], 252).iloc[-1]:.2%}")
+
 print(f"""
 La Máxima Pérdida es la mayor caída desde un punto alto hasta un punto bajo durante el periodo analizado.
 Para {ticker}, la Máxima Pérdida es {maxima_perdida_accion:.2%}.
@@ -105,19 +90,20 @@ plt.show()
 
 # Calcular Alpha y Beta
 
-x = sm.add_constant(benchmark["Rendimiento"])
-y = datos["Rendimiento"]
-
-# Ajustar el  modelo de regresión
-modelo = sm.OLS(y, x).fit()
+# Regresion de forma cerrada (equivalente a sm.OLS con constante): beta = cov(x, y) / var(x)
+regresion = alpha_beta(datos["Rendimiento"].rename(ticker), benchmark["Rendimiento"], periodos_anuales=252)
 
 #Extraer Alpha y beta
-alpha = modelo.params["const"] * 252 #Anualizar el Alpha
-beta = modelo.params["Rendimiento"]
+alpha = regresion.loc[ticker, "alpha"] #Alpha anualizado
+beta = regresion.loc[ticker, "beta"]
 
 print(f"Alpha de {ticker}: {alpha:.2%}")
 print(f"Beta de {ticker}: {beta:.2%}")
 
+# Deriva de la beta: regresion sobre una ventana movil de un año
+beta_movil = alpha_beta_movil(datos["Rendimiento"].rename(ticker), benchmark["Rendimiento"], ventana=252)["beta"]
+print(beta_movil.dropna().tail())
+
 
 #Comentario explicativo
 print(f"""
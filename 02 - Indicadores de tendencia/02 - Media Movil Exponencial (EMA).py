@@ -1,48 +1,14 @@
 # Import libraries
-from cProfile import label
-
-import pandas as pd
-import yfinance as yf
+from algotrading.descargas import descargar
+from algotrading.reduccion import reducir_indicador, reducir_velas
+from algotrading.indicadores import Media_Movil_Exponencial
 import mplfinance as mpf
 import matplotlib.pyplot as plt
-from matplotlib.pyplot import title
-
-
-# Function to calculate Exponential Moving Average (EMA)
-
-def Media_Movil_Exponencial(df: pd.DataFrame, longitud: int = 26, columna: str = "Close") -> pd.Series:
-    """
-    La Media Móvil Exponencial (ema) es un indicador técnico que rastrea el precio de un activo
-    (como una acción o una mercancía) a lo largo del tiempo. La ema es un tipo de media móvil ponderada (WMA)
-    que otorga mayor peso a los datos de precios más recientes.
-    ----------
-    Parámetros:
-    ----------
-    df : pd.DataFrame
-        Datos históricos del activo.
-
-    longitud : int, opcional (por defecto=26)
-        Ventana de tiempo utilizada para calcular la ema.
 
-    columna : str, opcional (por defecto='Close')
-        Columna del DataFrame sobre la cual se calculará la ema.
-
-    ----------
-    Retorna:
-    ----------
-    pd.Series
-        Serie con los valores de la Media Móvil Exponencial (ema).
-    """
-
-    df = df[columna]
-    EMA = df.ewm(span=longitud, min_periods=longitud, adjust=False).mean()
-    EMA.name = "EMA"
-
-    return EMA
 
 # Descargar los datos
 
-df = yf.download("MSFT", start="2023-01-01", end="2024-01-01", interval="1d", multi_level_index=False)
+df = descargar("MSFT", inicio="2023-01-01", fin="2024-01-01", intervalo="1d")
 
 
 # Calcular Indicador
@@ -50,14 +16,18 @@ df = yf.download("MSFT", start="2023-01-01", end="2024-01-01", interval="1d", mu
 ema_12 = Media_Movil_Exponencial(df, longitud=12, columna="Close")
 ema_26 = Media_Movil_Exponencial(df, longitud=26, columna="Close")
 
-# Graficar
+# Graficar (reducido a ~600 velas para series largas)
+
+velas = reducir_velas(df, velas=600)
+ema_12 = reducir_indicador(ema_12, velas=600)
+ema_26 = reducir_indicador(ema_26, velas=600)
 
 ema_plots = [
     mpf.make_addplot(ema_12, label="EMA 12 Días", color="green", type="line"),
     mpf.make_addplot(ema_26, label="EMA 26 Días", color="blue", type="line")
 ]
 
-mpf.plot(df, type="candle", style="yahoo", volume=True, figsize=(22,10), addplot=ema_plots, figscale=3.0,
+mpf.plot(velas, type="candle", style="yahoo", volume=True, figsize=(22,10), addplot=ema_plots, figscale=3.0,
          title="Medias Móviles Exponenciales")
 plt.show()
 
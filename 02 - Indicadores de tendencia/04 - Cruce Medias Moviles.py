@@ -1,64 +1,15 @@
-from cProfile import label
-
-import pandas as pd
-import yfinance as yf
+from algotrading.descargas import descargar
+from algotrading.eventos import cruces
+from algotrading.backtesting import backtest
+from algotrading.barrido import barrido_cruce_medias
+from algotrading.indicadores import Cruce_Medias_Moviles
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.lines import lineStyles
-from scipy.stats import alpha
-
-
-# Indicador/Estrategia: Cruce de Medias Moviles
-def Cruce_Medias_Moviles(df: pd.DataFrame, longitud_rapida: int = 9, longitud_lenta: int = 26, columna: str = "Close") -> pd.DataFrame:
-
-    """
-    El cruce de Medias Moviles es un indicador tecnico que utiliza dos medias moviles como estrategia. Es un buen ejemplo de las
-    denominadas estrategias tradicionales. Las estrategias tradicionales estan siempre en largo o en corto, lo que significa que
-    nunca estan fuera del mercado.
-
-    Como operarlo:
-
-    Operar con el cruce de Medias Moviles es bastante simple. Si la Media Movil Rapida cruza de abajo hacia arriba la Media Movil Lenta,
-    esto significa una oportunidad de compra. Si la Media Movil Rapida cruza de arriba hacia abajo a la Media Movil Lenta,
-    esto significa una oportunidad de venta. El cruce de Medias Moviles a menudo se utiliza junto con otros indicadores para evitar señales
-    falsas en mercados de baja volatilidad.
-
-    Parametros:
-    -----------
-    param: pd.DataFrame: df: Datos del intrumento financiero.
-    -----------
-    param: int : Longitud_rapida: Ventana rapida a utilizar en el calculo del CMM (por defecto, se establece en 9).
-    -----------
-    param: int: Longitud_Lenta: Ventana lenta a utilizar en el cálculo del CMM (por defecto, se establece 26).
-    -----------
-    param: str: columna : Columna a utilizar en el cálculo del CMM (por defecto, se establece 'Close').
-    ----------
-    Salida:
-    ----------
-    return : pd.DataFrame : Cálculo del cruce de Medias Moviles.
-
-    """
-
-    # Calcular
 
-    columna_precio = df[columna]
-    SMA_Rapida = columna_precio.rolling(window=longitud_rapida, min_periods=longitud_rapida).mean()
-    SMA_Rapida_S = SMA_Rapida.shift(periods=1)
-    SMA_Lenta = columna_precio.rolling(window=longitud_lenta, min_periods=longitud_lenta).mean()
-    SMA_Lenta_S = SMA_Lenta.shift(periods=1)
-
-    # Cruce
-    Cruce = np.where(((SMA_Rapida > SMA_Lenta) & (SMA_Lenta_S > SMA_Rapida_S)), 1,
-                     np.where(((SMA_Rapida < SMA_Lenta) & (SMA_Lenta_S < SMA_Rapida_S)), -1, 0))
-
-    MAC = pd.concat([SMA_Rapida, SMA_Lenta, pd.Series(Cruce, index=df.index)], axis=1)
-    MAC.columns = ["SMA_Rapida", "SMA_Lenta", "Cruce"]
-
-    return MAC
 
 # Obtener Datos
 
-df = yf.download("TSLA", start="2020-01-01", end="2024-01-01", interval="1d",multi_level_index=False)
+df = descargar("TSLA", inicio="2020-01-01", fin="2024-01-01", intervalo="1d")
 
 # Calcular indicador
 
@@ -97,16 +48,14 @@ axes.fill_between(
     label="Tendencia Bajista"
 )
 
-# Añadir triangulos solo en los cruces de las lineas
-
-for i in range(1, filas):
-    if mac["Cruce"].iloc[-i] == 1 and mac["Cruce"].iloc[-(i-1)] == -1:
-        axes.scatter(mac.index[-1], mac["SMA_Rapida"].iloc[-i], marker="^", color="green", s=120, edgecolor="black",
-            linewidth=1.5)
+# Añadir triangulos solo en los cruces de las lineas (tabla de eventos vectorizada, ver algotrading/eventos.py)
 
-    elif mac["Cruce"].iloc[-i] == -1 and mac["Cruce"].iloc[-(i-1)] == 1:
-        axes.scatter(mac.index[-1], mac["SMA_Rapida"].iloc[-i], marker="v", color="green", s=120, edgecolor="black",
-            linewidth=1.5)
+eventos = cruces(mac["SMA_Rapida"], mac["SMA_Lenta"], "cruce_medias")
+eventos = eventos[eventos["fecha"] >= mac.index[-filas]]
+for evento, marcador, color in (("cruce_alcista", "^", "green"), ("cruce_bajista", "v", "red")):
+    seleccion = eventos[eventos["evento"] == evento]
+    axes.scatter(seleccion["fecha"], seleccion["valor"], marker=marcador, color=color, s=120, edgecolor="black",
+                 linewidth=1.5)
 
 
 # Configurar leyendas y etiquetas
@@ -118,6 +67,20 @@ plt.suptitle("Señales de compra y venta basadas en el cruce de medias moviles",
 plt.grid(visible=True, linestyle="--", linewidth=0.75)
 plt.show()
 
+# Optimizar las ventanas: todas las combinaciones en una sola pasada (ver algotrading/barrido.py)
+
+barrido = barrido_cruce_medias(df, longitudes_rapidas=range(5, 55), longitudes_lentas=range(20, 220))
+rendimiento_total = barrido.rendimiento_total()
+print("Mejores combinaciones (rapida, lenta):")
+print(rendimiento_total.where(rendimiento_total.columns.values > rendimiento_total.index.values[:, None])
+      .stack().nlargest(5))
+
+# Backtest de la estrategia con comisiones y deslizamiento (ejecucion en la apertura siguiente)
+
+resultado = backtest(df, mac["Cruce"].fillna(0), tipo="eventos", comision=0.001, deslizamiento=0.0005)
+print(resultado.resumen())
+print(resultado.operaciones.tail())
+
 # Recordatorio:
 
 #   - Los Cruces de Promedios Móviles son útiles para identificar la dirección de una tendencia.
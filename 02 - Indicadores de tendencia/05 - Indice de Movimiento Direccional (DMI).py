@@ -1,90 +1,12 @@
 # Importar librerias
-import pandas as pd
-import yfinance as yf
+from algotrading.descargas import descargar
+from algotrading.indicadores import Indice_Movimiento_Direccional
 import matplotlib.pyplot as plt
-import numpy as np
 
 
-# Indicador: Indice de Movimiento Direccional
-
-def Indice_Movimiento_Direccional(df: pd.DataFrame, suavizado_ADX: int = 14, longitud_DI: int = 14) -> pd.DataFrame:
-    """
-    El Indice de Movimiento Direccional (DMI) es un indicador que indentifica en que direccion se esta moviendo el precio
-    de un activo. El indicador hace esto comparando los maximos y minimos previos y dibujando dos lineas: una linea de movimiento direccional positivo (+DI) y una linea
-    de movimiento direccional negativo (-DI). Se añade una tercera linea, llamada indice Direccional Promedio (ADX), para medir la fuerza de la tendencia alcista o bajista.
-
-    Como Operarlo:
-
-    Cuando +DI esta por encima de -DI, hay más presion alcista que bajista en el precio. Por el contrario, si -DI está por encima de +DI, entonces hay más presionbahista
-    sobre el precio. Este indicador puede ayudar a evaluar la dirección de la tendencia. Los cruces entre las Lineas tambien se utilizan a veces como señales de compra y venta.
-
-    ----------------
-    Parametros:
-    ----------------
-    param: pd.DataFrame: df: Datos historicos del intrumento financiero.
-    ----------------
-    param: int : suavizado_ADX : Ventana a utilizar en el cálculo de los Movimientos Direccionales (+DM y -DM) (por defecto, se establece en 14).
-    ----------------
-    param : int : Longitud_DI : Ventana a utilizar en el cálculo de los indicadores Direccionales (+DI y -DI) (por defecto, se establece en 14).
-    ---------------
-    Salida:
-    ---------------
-    return : pd.DataFrame: Cálculo del Indice de Movimiento Direccional.
-
-    """
-
-
-# Calcular el Rango Verdadero
-
-    High, Low = df["High"], df["Low"]
-    H_minus_L = High - Low
-    prev_clo = df["Close"].shift(periods=1)
-    H_minus_PC = abs(High - prev_clo)
-    L_minus_PC = abs(prev_clo - Low)
-    TR = pd.Series(np.max([H_minus_L, H_minus_PC, L_minus_PC], axis=0), index=df.index, name="TR")
-
-# Calcular los Movimientos Direccionales (+DM y -DM)
-
-    pre_PDM = df["High"].diff().dropna()
-    pre_MDM = df["Low"].diff(periods=-1).dropna()
-    plus_DM = pre_PDM.where((pre_PDM > pre_MDM.values) & (pre_PDM > 0), 0)
-    minus_DM = pre_MDM.where((pre_MDM > pre_PDM.values) & (pre_MDM > 0), 0)
-
-# Calcular los valores iniciales para las sumas suavizadas de TR, +DM, -DM
-
-    TRL = [np.nansum(TR[:suavizado_ADX + 1])]
-    PDML = [plus_DM[:suavizado_ADX].sum()]
-    MDML = [minus_DM[:suavizado_ADX].sum()]
-    factor = 1 - 1 / suavizado_ADX
-
-# Calcular las sumas suavizadas de TR, +DM y -DM utilizando el metodo Wilder
-
-    for i in range(0, int(df.shape[0] - suavizado_ADX - 1)):
-        TRL.append(TRL[i] * factor + TR[suavizado_ADX + i + 1])
-        PDML.append(PDML[i] * factor + plus_DM[suavizado_ADX + i])
-        MDML.append(MDML[i] * factor + minus_DM[suavizado_ADX + i])
-
-# Calcular los indicadores Direccionales (+DI y -DI)
-
-    PDI = np.array(PDML) / np.array(TRL) * 100
-    MDI = np.array(MDML) / np.array(TRL) * 100
-
-# Calcular el indice Direccional (DX)
-
-    DX = np.abs(PDI - MDI) / (PDI + MDI) * 100
-    ADX = [DX[:suavizado_ADX].mean()]
-
-# Calcular el indice Direccional Promedio (ADX) utilizando la longitud_DI
-    _ = [ADX.append((ADX[i] * (longitud_DI - 1) + DX[longitud_DI + i]) / longitud_DI) for i in range(int(len(DX) - longitud_DI))]
-    ADXI = pd.DataFrame(PDI, columns=["+DI"], index=df.index[-len(PDI):])
-    ADXI["-DI"] = MDI
-    ADX = pd.DataFrame(ADX, columns=["ADX"], index=df.index[-len(ADX):])
-
-    return ADX.merge(ADXI, how="outer", left_index=True, right_index=True)
-
 # Obtener Datos
 
-df = yf.download("XYZ", start="2020-01-01", end="2024-01-01", interval="1d", multi_level_index=False)
+df = descargar("XYZ", inicio="2020-01-01", fin="2024-01-01", intervalo="1d")
 
 # Calcular indicador
 
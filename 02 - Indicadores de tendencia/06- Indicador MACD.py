@@ -1,66 +1,18 @@
 # Importar librerias
-from cProfile import label
-
-import pandas as pd
 import numpy as np
-import yfinance as yf
+from algotrading.cache import memoizar
+from algotrading.descargas import descargar
+from algotrading.indicadores import MACD
 import matplotlib.pyplot as plt
-from IPython.core.pylabtools import figsize
-
-
-# Indicador: Convergencia-Divergencia de Promedios Moviles (MACD)
-
-def MACD(df: pd.DataFrame, longitud_rapida: int = 12, longitud_lenta: int = 26, longitud_señal: int = 9,
-         columna: str = "Close") -> pd.DataFrame:
-    """
-    La Convergencia-Divergencia de Promedios Moviles (MACD) es un indicador de seguimiento de tendencias que muestra la relacion entre
-    dos promedios moviles del precio de un activo. El MACD se calcula restando el promedio movil exponencial de largo plazo (usualmente 26 periodos)
-    del promedio movil exponencial de corto plazo (usualmente de 12 periodos).
-
-    Como Operarlo:
-
-        El resultado del calculo es la linea MACD. Un EMA de n-periodos de la MACD, llamada "Linea de señal", se traza sobre la linea MACD,
-        que puede funcionar como un desencadenante para señales de compra y venta. Los traders pueden comprar el activo cuando la MACD cruza por encima de su
-        linea de señal y vender en corto plazo cuando la MACD cruza por debajo de la linea de señal.
-
-        -------------
-        Parametros:
-
-        ------------
-        param : pd.Dataframe: df: Datos del intrumento o activo financiero.
-        ------------
-        param: int: Longitud:rapida: Ventana rapida a utilizar en el calculo del MACD (por defecto, se establece en 12).
-        ------------
-        param: int : Longitud_lenta: Ventana lenta a utilizar en el calculo del MACD (por defecto, se establece en 26).
-        -----------
-        param: int: longitud_señal: Ventana de la señal a utilizar en el calculo del MACD (por defecto, se establece en 9).
-        -----------
-        param : str: columna : Columna a utilizar en el calculo del MACD (por defecto, se establece en "close").
-        -----------
-        salida:
-        -----------
-        return: pd.DataFrame: Calculo de la convergencia-divergencia de Promedios Moviles.
-
-    """
-
-    # Calcular los promedios moviles exponenciales
-
-    MA_Rapida = df[columna].ewm(span=longitud_rapida, min_periods=longitud_rapida, adjust=False).mean()
-    MA_Lenta = df[columna].ewm(span=longitud_lenta, min_periods=longitud_lenta, adjust=False).mean()
-
-    #Determinar la linea MACD como la diferencia entre el EMA corto y el EMA largo
-    MACD_d = MA_Rapida - MA_Lenta
 
-    #Calcular la linea de señal como el EMA de la linea MACD
-    señal = MACD_d.ewm(span=longitud_señal, min_periods=longitud_señal, adjust=False).mean()
-    MACD = pd.concat([MACD_d, señal], axis=1)
-    MACD.columns = ["MACD", "Señal"]
 
-    return MACD
+# Cachear los resultados: repetir MACD(df) con los mismos datos no recalcula, y al añadir barras solo se calcula la cola
+# (con 500 barras de calentamiento el error de las EMA en la cola es despreciable)
+MACD = memoizar(MACD, calentamiento=500)
 
 #Obtener Datos Historicos del activo
 
-df = yf.download("NVDA",start="2020-01-01", interval="1d")
+df = descargar("NVDA", inicio="2020-01-01", intervalo="1d")
 
 #Calcular el Indicador
 macd = MACD (df, longitud_rapida=12, longitud_lenta=26, longitud_señal=9)
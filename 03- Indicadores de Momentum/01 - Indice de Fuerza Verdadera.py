@@ -1,80 +1,23 @@
 # Importar librerias
-
-import pandas as pd
-import yfinance as yf
+from algotrading.descargas import descargar
+from algotrading.reduccion import reducir_indicador, reducir_velas
+from algotrading.indicadores import Indicador_Fuerza_Verdadera
 import mplfinance as mpf
-import matplotlib.pyplot as plt
-from matplotlib.pyplot import ylabel
-
-
-# Indicador: Indicador de Fuerza Verdadera (TSI)
-
-def Indicador_Fuerza_Verdadera(df: pd.DataFrame, longitud_rapida: int = 13, longitud_lenta: int = 25, senal: int = 13,
-                               columna: str = "Close") -> pd.DataFrame:
-    """
-    El indicador de Fuerza Verdadera (TSI) es un oscilador de impulso tecnico utilizado para identificar tendencias y reversiones.
-    Es util para determinar condiciones de sobrecompra y sobreventa, indicando cambios de direccion de la tendencias a traves
-    de cruces de la linea central o de la linea de señal, advirtiendo sobre la tendencia mediante divergencias.
-
-    Como Operarlo:
-
-    El TSI fluctua entre los positivos y negativos. Territorio positivo significa que los alcistas tienen más control sobre el activo,
-    mientras que numeros negativos indican que los bajistas tienen más control. Cuando el indicador diverge con el precio, el TSI
-    podria estar señalando que la tendencia del precio se esta debilitando y podria revertirse.
-
-    Se puede aplicar una linea de señal al indicador TSI. Cuando el TSI cruza por encima de la linea de señal, puede ser utilizado como una
-    señal de compra; cuando cruza por debajo, como una señal de venta. Los niveles de sobrecompra y sobreventa variaran segun el activo que se esté operando.
-
-    ----------------
-    Parámetros:
-
-    -----------------
-
-    param: int: Longitud_rapida: Ventana rapida a usar en el calculo del TSI (por defecto, se establece en 13)
-
-    ------------------
-
-    param: int: Longitud_lenta: Ventana lenta a usar en el calculo del TSI (por defecto, se establece en 25)
-
-    param: int: señal: Ventana de señal a usar en el calculo del TSI (por defecto, se establece en 13)
-
-    param: str: columna: Columna a utilizar para el calculo del TSI (por defecto, se establece en 'Close')
-
-    Salida:
-    ----------------
-    return: pd.Dataframe: Calculo del Indicador de Fuerza Verdadera.
-    """
-
-    # Calcular
-    Momento = df[columna].diff(periods=1)
-    # EMA de Momento
-    EMA_lenta = Momento.ewm(span=longitud_lenta, min_periods=longitud_lenta, adjust=False).mean()
-    EMA_rapida = EMA_lenta.ewm(span=longitud_rapida, min_periods=longitud_rapida, adjust=False).mean()
-    # EMA del Momentum Abs
-    Momento_abs = abs(Momento)
-    EMA_lenta_abs = Momento_abs.ewm(span=longitud_lenta, min_periods=longitud_lenta, adjust=False).mean()
-    EMA_rapida_abs = EMA_lenta_abs.ewm(span=longitud_rapida, min_periods=longitud_rapida, adjust=False).mean()
-    # Calcular TSI
-    TSI_df = 100 * (EMA_rapida / EMA_rapida_abs)
-    Senal = TSI_df.ewm(span=senal, min_periods=senal, adjust=False).mean()
-    TSI = pd.concat([TSI_df, Senal], axis=1)
-    TSI.columns = ["TSI", "Senal"]
-
-    # Determinar tendencia alcista o bajista
-
-    TSI["Tendencia"] = TSI["TSI"] > TSI["Senal"]
-
-    return TSI
 
 
 # Descargar datos
 
 ticker = "BTC-USD"
-df = yf.download(ticker, start="2024-01-01", end="2025-10-15", interval="1d",multi_level_index=False)
+df = descargar(ticker, inicio="2024-01-01", fin="2025-10-15", intervalo="1d")
 
 # Calcular el TSI
 tsi_df = Indicador_Fuerza_Verdadera(df)
 
+# Reducir a ~600 velas para graficar (con datos de 1 minuto, mpf.plot tardaria decenas de segundos)
+
+velas = reducir_velas(df, velas=600)
+tsi_df = reducir_indicador(tsi_df, velas=600)
+
 # Colores de la tendencia
 
 tsi_colores = ["green" if tendencia else "red" for tendencia in tsi_df["Tendencia"]]
@@ -92,8 +35,8 @@ ap = [
          mpf.make_addplot(tsi_df["TSI"], panel=2, type="bar", color=tsi_colores, alpha=0.40)
      ] + sobrecomprayventa
 
-mpf.plot(df, type="candle", style="yahoo", volume=True, addplot=ap, title="Indicador Fuerza Verdadera (TSI)",
-         ylabel="Precio", ylabel_lower="Volumen",figsize=(22,10), figscale=3.0, warn_too_much_data=df.shape[0])
+mpf.plot(velas, type="candle", style="yahoo", volume=True, addplot=ap, title="Indicador Fuerza Verdadera (TSI)",
+         ylabel="Precio", ylabel_lower="Volumen",figsize=(22,10), figscale=3.0)
 
 
 #Recordatorio
@@ -0,0 +1,86 @@
+"""
+Utilidades compartidas por los scripts del curso de Algo Trading.
+
+    ajustes     : Ajuste de OHLCV por splits y dividendos con factores acumulados que se actualizan por prefijo.
+    almacen     : Almacen local de barras OHLCV en formato columnar binario (lecturas memory-mapped).
+    backtesting : Backtesting vectorizado de señales (posiciones, costos, curva de capital y operaciones).
+    barrido     : Barrido de ventanas del Cruce de Medias Moviles sobre una rejilla 3-D (rapida x lenta x barras).
+    benchmark   : Benchmark de los indicadores con OHLCV sintetico a varias escalas (python -m algotrading.benchmark).
+    bloques     : Indicadores por bloques (estado arrastrado o solape) sobre historias que no caben en memoria.
+    cache       : Cache de resultados de indicadores por contenido (LRU en memoria, nivel en disco, prefijos).
+    compacto    : Modo float32 de los indicadores con salidas preasignadas, cotas de error y reporte de memoria.
+    cubetas     : Primer y ultimo valor valido de cubetas de filas consecutivas (velas y remuestreo).
+    descargas   : Cache incremental delante de yf.download con proveedores de datos intercambiables.
+    drawdown    : Episodios de drawdown, tiempo bajo el agua y maxima perdida movil para muchas series a la vez.
+    eventos     : Tabla de eventos de señal (cruces, niveles, giros) de todos los indicadores en una llamada.
+    extremos    : Minimos y maximos moviles de varias ventanas con una sparse table (Ichimoku, Donchian, estocastico).
+    graficos    : Graficos de indicadores por lotes y sin ventana (PNG/HTML) en un grupo de procesos.
+    grafo       : Grafo de indicadores que evalua una sola vez los intermedios compartidos (EMA, rango verdadero, ...).
+    incremental : EMA, RSI, MACD y TSI actualizados barra a barra en tiempo constante.
+    indicadores : Indicadores de tendencia y momentum de los scripts, importables sin descargas ni graficos.
+    ingesta     : Ingesta masiva y concurrente de un universo de tickers (python -m algotrading.ingesta).
+    metricas    : Rendimientos simple, logaritmico y acumulado, y maxima perdida.
+    panel       : Entrada y salida de los indicadores en modo panel (tiempo x activos).
+    reduccion   : Reduccion de series al ancho del grafico (LTTB, min/max y velas agregadas por cubeta).
+    regresion   : Alpha y beta de forma cerrada, por lotes, moviles e incrementales.
+    remuestreo  : Barras de 15m, 1h, 1d, ... construidas localmente desde las de 1 minuto (sesion, zona, incremental).
+
+Importar el paquete no carga ningun modulo: cada nombre se importa la primera vez que se usa (PEP 562), asi que un
+proceso que solo necesita MACD no paga el arranque del resto. Las librerias de graficos (matplotlib, mplfinance,
+plotly), de datos (yfinance) y scipy se importan dentro de las funciones que las usan. El tiempo de importacion se
+mide con python -m algotrading.benchmark --importacion.
+"""
+
+import importlib
+from typing import Dict, List, Tuple
+
+# Modulo -> nombres que el paquete exporta de ese modulo
+_EXPORTACIONES: Dict[str, Tuple[str, ...]] = {
+    "ajustes": ("actualizar_ajustes", "ajustar_barras", "cargar_ajustadas", "deshacer_splits", "factores_ajuste",
+                "registrar_accion"),
+    "almacen": ("RUTA_ALMACEN", "anexar_barras", "archivo_columna", "cargar_arreglos", "cargar_barras",
+                "guardar_barras", "importar_csv", "indice_fechas", "leer_meta", "listar_particiones",
+                "primera_fila_cambiada"),
+    "backtesting": ("ResultadoBacktest", "backtest", "posicion_desde_eventos"),
+    "barrido": ("ResultadoBarrido", "barrido_cruce_medias", "medias_moviles_simples"),
+    "benchmark": ("generar_ohlcv",),
+    "bloques": ("FILAS_BLOQUE", "calcular_por_bloques", "guardar_indicadores", "indicadores_almacen",
+                "verificar_bloques"),
+    "cache": ("CacheIndicadores", "cache_indicadores", "huella", "memoizar"),
+    "compacto": ("barras_compactas", "cruce_medias_compacto", "ema_compacta", "ichimoku_compacto", "macd_compacto",
+                 "psar_compacto", "reporte_memoria", "rsi_compacto", "sma_compacta", "verificar_precision"),
+    "cubetas": ("primero_valido", "ultimo_valido"),
+    "descargas": ("ProveedorDatos", "ProveedorMemoria", "ProveedorYahoo", "descargar"),
+    "drawdown": ("ResultadoDrawdown", "analizar_drawdowns", "max_drawdown_movil"),
+    "eventos": ("cambios_tendencia", "cruces", "cruces_nivel", "extraer_eventos"),
+    "extremos": ("canal_donchian", "estocastico", "maximos_moviles", "minimos_moviles"),
+    "graficos": ("DISEÑOS", "Diseño", "renderizar_lote"),
+    "grafo": ("Grafo", "Nodo"),
+    "incremental": ("EMAIncremental", "EWMIncremental", "MACDIncremental", "RSIIncremental", "TSIIncremental"),
+    "indicadores": ("CCI", "Cruce_Medias_Moviles", "Ichimoku_Cloud", "Indicador_Fuerza_Relativa",
+                    "Indicador_Fuerza_Verdadera", "Indice_Movimiento_Direccional", "MACD", "Media_Movil_Exponencial",
+                    "Media_Movil_Ponderada", "Media_Movil_Simple", "Parabolic_SAR", "SAR_Parabolico_Multiactivo",
+                    "Suavizado_Wilder"),
+    "ingesta": ("LimitadorTasa", "ingerir"),
+    "metricas": ("max_drawdown", "rendimiento_acumulado", "rendimiento_logaritmico", "rendimiento_simple"),
+    "panel": ("como_entrada", "es_panel", "seleccionar_columna"),
+    "reduccion": ("lttb", "presupuesto_puntos", "reducir_indicador", "reducir_serie", "reducir_velas"),
+    "regresion": ("AlphaBetaIncremental", "alpha_beta", "alpha_beta_movil"),
+    "remuestreo": ("RemuestreoIncremental", "remuestrear", "remuestrear_almacen"),
+}
+
+_MODULO_DE: Dict[str, str] = {nombre: modulo for modulo, nombres in _EXPORTACIONES.items() for nombre in nombres}
+
+__all__ = sorted(_MODULO_DE)
+
+
+def __getattr__(nombre: str):
+    if nombre not in _MODULO_DE:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(f"{__name__}.{_MODULO_DE[nombre]}"), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_MODULO_DE))
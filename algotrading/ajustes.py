@@ -0,0 +1,271 @@
+"""
+Ajuste local de precios por acciones corporativas (splits y dividendos).
+
+El almacen guarda los precios negociados (sin ajustar) junto con las columnas Dividends y Stock Splits de Yahoo
+Finance, y los precios ajustados se calculan aqui. Cada accion en la fecha ex t multiplica todas las barras anteriores
+a t por un factor:
+
+    split de r acciones por 1        : precios * 1 / r, Volume * r
+    dividendo D                      : precios * (1 - D / Close[t - 1])     (metodo de Yahoo Finance y CRSP)
+
+El factor de cada barra es el producto de los factores de todas las acciones posteriores, es decir un producto
+acumulado en orden inverso (np.cumprod sobre el arreglo invertido), sin bucles por barra:
+
+    ajustadas = ajustar_barras(barras)                   # barras con columnas Dividends y Stock Splits
+
+Los factores de cada particion del almacen se guardan junto a las columnas (ajustes.npy). Cuando llega una accion
+nueva (en barras nuevas o con registrar_accion) solo cambia el prefijo de barras anteriores a su fecha ex, que se
+multiplica por el factor de la accion, sin volver a descargar ni recalcular la historia:
+
+    actualizar_ajustes("AAPL", "1d")                     # tras anexar barras nuevas
+    registrar_accion("AAPL", "1d", "2024-08-12", dividendo=0.25)
+    datos = cargar_ajustadas("AAPL", "1d", inicio="2023-01-01")
+
+Los rendimientos ("02-Rendimiento simple vs rendimiento logaritmico.py", "03-Rendimiento Acumulado.py") dependen del
+ajuste: sin el, un split aparece como una caida del precio y los dividendos pagados no cuentan en el rendimiento.
+"""
+
+# Importar librerias
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from algotrading.almacen import (RUTA_ALMACEN, Fecha, _a_nanosegundos, anexar_barras, cargar_arreglos, cargar_barras,
+                                 indice_fechas, leer_meta, primera_fila_cambiada)
+
+COLUMNAS_PRECIOS = ("Open", "High", "Low", "Close")
+
+
+def _factores_accion(Close: np.ndarray, Dividends: np.ndarray, Splits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Factor de split y de dividendo de la accion de cada barra (1 si no hay accion) para las barras anteriores. El
+    dividendo de la primera barra no tiene cierre previo y no se aplica.
+    """
+
+    Splits = np.nan_to_num(np.asarray(Splits, dtype=float))
+    split = np.where(Splits > 0, 1.0 / np.where(Splits > 0, Splits, 1.0), 1.0)
+
+    Dividends = np.nan_to_num(np.asarray(Dividends, dtype=float))
+    cierre_previo = np.concatenate([[np.nan], np.asarray(Close, dtype=float)[:-1]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dividendo = 1.0 - Dividends / cierre_previo
+    dividendo = np.where((Dividends > 0) & np.isfinite(dividendo), dividendo, 1.0)
+
+    return split, dividendo
+
+
+def _producto_posterior(factores: np.ndarray) -> np.ndarray:
+    """Producto de los factores de las filas posteriores a cada fila (1 en la ultima), por columnas."""
+
+    posterior = np.ones_like(factores)
+    posterior[:-1] = np.cumprod(factores[:0:-1], axis=0)[::-1]
+    return posterior
+
+
+def factores_ajuste(Close: np.ndarray, Dividends: Optional[np.ndarray] = None,
+                    Splits: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Factores de ajuste de cada barra por splits y por dividendos posteriores.
+
+    param : np.ndarray : Close : Cierres sin ajustar.
+    param : np.ndarray : Dividends : Dividendo por accion en su fecha ex (0 sin dividendo), en la escala de Close.
+    param : np.ndarray : Splits : Acciones nuevas por cada accion anterior en la fecha del split (0 sin split).
+
+    return : Tuple[np.ndarray, np.ndarray] : (factor_split, factor_dividendo). El precio ajustado es
+             precio * factor_split * factor_dividendo y el volumen ajustado volumen / factor_split.
+    """
+
+    Close = np.asarray(Close, dtype=float)
+    ceros = np.zeros(len(Close))
+    split, dividendo = _factores_accion(Close, ceros if Dividends is None else Dividends,
+                                        ceros if Splits is None else Splits)
+    factores = _producto_posterior(np.column_stack([split, dividendo]))
+    return factores[:, 0], factores[:, 1]
+
+
+def _aplicar(df: pd.DataFrame, factor_split: np.ndarray, factor_dividendo: np.ndarray,
+             dividendos: bool) -> pd.DataFrame:
+    ajustado = df.copy()
+    precio = factor_split * factor_dividendo if dividendos else factor_split
+    for columna in COLUMNAS_PRECIOS:
+        if columna in df.columns:
+            ajustado[columna] = df[columna].to_numpy(dtype=float) * precio
+    if "Volume" in df.columns:
+        ajustado["Volume"] = df["Volume"].to_numpy(dtype=float) / factor_split
+    if "Dividends" in df.columns:
+        # Como en Yahoo Finance, los dividendos se expresan en acciones de hoy
+        ajustado["Dividends"] = df["Dividends"].to_numpy(dtype=float) * factor_split
+    return ajustado
+
+
+def ajustar_barras(df: pd.DataFrame, dividendos: bool = True) -> pd.DataFrame:
+    """
+    Barras OHLCV ajustadas por splits y (opcionalmente) dividendos, a partir de barras sin ajustar con las columnas
+    Dividends y Stock Splits (por ejemplo, Ticker.history(auto_adjust=False) tras deshacer_splits).
+
+    param : pd.DataFrame : df : Barras de un activo sin ajustar.
+    param : bool : dividendos : Falso para ajustar solo por splits.
+
+    return : pd.DataFrame : Mismas columnas que df, con Open, High, Low y Close ajustados, Volume en acciones de hoy
+             y Dividends ajustados por splits. Adj Close, si existe, no se modifica.
+    """
+
+    factor_split, factor_dividendo = factores_ajuste(df["Close"].to_numpy(dtype=float), df.get("Dividends"),
+                                                     df.get("Stock Splits"))
+    return _aplicar(df, factor_split, factor_dividendo, dividendos)
+
+
+def deshacer_splits(df: pd.DataFrame, splits: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Vuelve a los precios negociados: Yahoo Finance entrega Open, High, Low, Close, Volume y Dividends ya
+    ajustados por todos los splits posteriores a cada barra (incluso con auto_adjust=False).
+
+    param : pd.DataFrame : df : Barras de Yahoo Finance.
+    param : pd.Series : splits : Historia completa de splits (Ticker.splits), para incluir los splits posteriores al
+            rango de df. Por defecto, la columna Stock Splits de df.
+
+    return : pd.DataFrame : Barras sin ajustar (sin la columna Adj Close, que ya no corresponde a los precios).
+    """
+
+    if splits is None:
+        splits = df["Stock Splits"] if "Stock Splits" in df.columns else pd.Series(dtype=float)
+    splits = splits[splits.fillna(0) > 0].sort_index()
+
+    # Producto de los splits con fecha posterior a cada barra: productos acumulados en orden inverso y una busqueda
+    # binaria de la fecha de cada barra
+    posterior = np.append(np.cumprod(splits.to_numpy(dtype=float)[::-1])[::-1], 1.0)
+    factor = posterior[np.searchsorted(splits.index, df.index, side="right")] if len(splits) else np.ones(len(df))
+
+    originales = df.drop(columns=["Adj Close"], errors="ignore").copy()
+    for columna in COLUMNAS_PRECIOS + ("Dividends",):
+        if columna in originales.columns:
+            originales[columna] = originales[columna].to_numpy(dtype=float) * factor
+    if "Volume" in originales.columns:
+        originales["Volume"] = originales["Volume"].to_numpy(dtype=float) / factor
+    return originales
+
+
+# Factores guardados en el almacen ---------------------------------------------------------------------------------
+
+def _rutas(ticker: str, intervalo: str, ruta: str) -> Tuple[str, str]:
+    carpeta = os.path.join(ruta, ticker, intervalo)
+    return os.path.join(carpeta, "ajustes.npy"), os.path.join(carpeta, "ajustes.json")
+
+
+def _acciones(arreglos: dict, desde: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    Close = np.asarray(arreglos["Close"][desde:], dtype=float)
+    ceros = np.zeros(len(Close))
+    return (Close, np.asarray(arreglos["Dividends"][desde:]) if "Dividends" in arreglos else ceros,
+            np.asarray(arreglos["Stock Splits"][desde:]) if "Stock Splits" in arreglos else ceros)
+
+
+def _guardar(factores: np.ndarray, fechas: np.ndarray, escritura: int, ticker: str, intervalo: str,
+             ruta: str) -> None:
+    archivo, archivo_meta = _rutas(ticker, intervalo, ruta)
+    temporal = archivo[:-4] + ".tmp.npy"
+    np.save(temporal, factores)
+    os.replace(temporal, archivo)
+    with open(archivo_meta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"filas": int(len(fechas)), "primera": int(fechas[0]), "ultima": int(fechas[-1]),
+                   "escritura": escritura}, f)
+    os.replace(archivo_meta + ".tmp", archivo_meta)
+
+
+def actualizar_ajustes(ticker: str, intervalo: str = "1d", ruta: str = RUTA_ALMACEN, recalcular: bool = False) -> int:
+    """
+    Pone al dia los factores de ajuste guardados de la particion. Los factores se recalculan desde la primera barra
+    que cambio desde la ultima actualizacion (primera_fila_cambiada: las barras anexadas, las que se volvieron a enviar
+    con otros valores o las que corrigio registrar_accion), y el prefijo anterior se multiplica por el cambio del
+    producto de las acciones posteriores. Si la particion se reemplazo (guardar_barras, barras anteriores a la
+    primera) o con recalcular=True se recalculan todos.
+
+    return : int : Barras ya guardadas cuyo factor cambio (0 si no hubo acciones nuevas).
+    """
+
+    escritura = leer_meta(ticker, intervalo, ruta).get("escritura", 0)
+    arreglos = cargar_arreglos(ticker, intervalo, ruta=ruta)
+    fechas = arreglos["fecha"]
+    n = len(fechas)
+    if n == 0:
+        return 0
+
+    archivo, archivo_meta = _rutas(ticker, intervalo, ruta)
+    r = 0
+    if not recalcular and os.path.exists(archivo_meta) and os.path.exists(archivo):
+        with open(archivo_meta, encoding="utf-8") as f:
+            estado = json.load(f)
+        m = estado["filas"]
+        if 0 < m <= n and fechas[0] == estado["primera"] and "escritura" in estado:
+            r = min(primera_fila_cambiada(ticker, intervalo, estado["escritura"], ruta), m)
+
+    if r == 0:
+        split, dividendo = factores_ajuste(*_acciones(arreglos))
+        _guardar(np.column_stack([split, dividendo]), fechas, escritura, ticker, intervalo, ruta)
+        return n
+    if r == n:
+        return 0
+
+    # Desde la fila r cambian las barras; la fila r - 1 aporta el cierre previo. El factor guardado de r - 1 es el
+    # producto de las acciones antiguas posteriores, que tambien lleva todo el prefijo
+    anteriores = np.load(archivo)
+    if np.any(anteriores[r - 1] == 0):
+        return actualizar_ajustes(ticker, intervalo, ruta, recalcular=True)
+    split, dividendo = factores_ajuste(*_acciones(arreglos, r - 1))
+    factores = np.empty((n, 2))
+    factores[:r] = anteriores[:r] * (np.array([split[0], dividendo[0]]) / anteriores[r - 1])
+    factores[r:, 0], factores[r:, 1] = split[1:], dividendo[1:]
+    _guardar(factores, fechas, escritura, ticker, intervalo, ruta)
+    return int(np.any(factores[:m] != anteriores[:m], axis=1).sum())
+
+
+def registrar_accion(ticker: str, intervalo: str, fecha: Fecha, dividendo: float = 0.0, split: float = 0.0,
+                     ruta: str = RUTA_ALMACEN) -> int:
+    """
+    Registra (o corrige) la accion corporativa de la barra `fecha`: escribe el dividendo y el split en las columnas
+    Dividends y Stock Splits con anexar_barras (una version nueva de la particion) y actualiza los factores, que
+    solo cambian en las barras anteriores.
+
+    param : str | pd.Timestamp : fecha : Fecha ex de la accion (debe ser una barra de la particion).
+    param : float : dividendo : Dividendo por accion en la escala de los precios guardados (0 sin dividendo).
+    param : float : split : Acciones nuevas por cada accion anterior (0 sin split).
+
+    return : int : Barras cuyo factor se actualizo (las anteriores a la fecha ex).
+    """
+
+    meta = leer_meta(ticker, intervalo, ruta)
+    if meta is None or "Dividends" not in meta["columnas"] or "Stock Splits" not in meta["columnas"]:
+        raise ValueError(f"La particion {ticker} ({intervalo}) no tiene las columnas Dividends y Stock Splits")
+
+    arreglos = cargar_arreglos(ticker, intervalo, ruta=ruta)
+    instante = _a_nanosegundos(fecha, meta["zona_horaria"])
+    t = int(np.searchsorted(arreglos["fecha"], instante))
+    if t == len(arreglos["fecha"]) or arreglos["fecha"][t] != instante:
+        raise ValueError(f"{fecha} no es una barra de {ticker} ({intervalo})")
+
+    barra = pd.DataFrame({c: np.array(arreglos[c][t:t + 1]) for c in meta["columnas"]},
+                         index=indice_fechas(arreglos["fecha"][t:t + 1], meta["zona_horaria"]))
+    barra["Dividends"], barra["Stock Splits"] = dividendo, split
+    del arreglos
+    anexar_barras(barra, ticker, intervalo, ruta)
+    actualizar_ajustes(ticker, intervalo, ruta)
+    return t
+
+
+def cargar_ajustadas(ticker: str, intervalo: str = "1d", inicio: Fecha = None, fin: Fecha = None,
+                     dividendos: bool = True, ruta: str = RUTA_ALMACEN) -> pd.DataFrame:
+    """
+    cargar_barras con los precios ajustados por las acciones corporativas de toda la historia guardada (tambien las
+    posteriores a `fin`). Solo se leen del disco las barras y los factores del rango pedido.
+
+    return : pd.DataFrame : Barras ajustadas del rango (ver ajustar_barras).
+    """
+
+    actualizar_ajustes(ticker, intervalo, ruta)
+    barras = cargar_barras(ticker, intervalo, inicio=inicio, fin=fin, ruta=ruta)
+    fechas = cargar_arreglos(ticker, intervalo, ruta=ruta)["fecha"]
+    desde = int(np.searchsorted(fechas, _a_nanosegundos(barras.index[0], None))) if len(barras) else 0
+    factores = np.load(_rutas(ticker, intervalo, ruta)[0], mmap_mode="r")[desde:desde + len(barras)]
+    return _aplicar(barras, factores[:, 0], factores[:, 1], dividendos)
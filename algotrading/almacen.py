@@ -0,0 +1,412 @@
+"""
+Almacen local de barras OHLCV en formato columnar binario.
+
+Cada serie se guarda particionada por ticker e intervalo, con un archivo .npy por columna:
+
+    datos/ohlcv/<ticker>/<intervalo>/fecha.v1.npy   (int64, nanosegundos desde 1970 en UTC)
+    datos/ohlcv/<ticker>/<intervalo>/Open.v1.npy    (float64, o float32 con guardar_barras(..., dtype=np.float32))
+    ...
+    datos/ohlcv/<ticker>/<intervalo>/meta.json      (columnas, filas, version, zona horaria y tipo de los precios)
+
+meta.json indica la version vigente de los archivos y cuantas filas son validas. Cada escritura que cambia filas ya
+guardadas usa archivos de una version nueva, y anexar_barras solo escribe en los archivos vigentes las filas
+posteriores a las validas. Reemplazar meta.json es siempre el ultimo paso, asi que una escritura interrumpida deja
+visible la version anterior completa. Las particiones anteriores a las versiones (archivos <columna>.npy) se siguen
+leyendo. meta.json tambien numera las escrituras y recuerda la primera fila que cambio cada una
+(primera_fila_cambiada), para que lo calculado sobre la particion (los factores de ajuste) se actualice desde ahi.
+
+Las lecturas usan np.load(mmap_mode="r"): solo se leen del disco las filas del rango pedido, por lo que cargar años de
+barras diarias o meses de barras de 1 minuto cuesta milisegundos, sin parsear un CSV ni volver a descargar los datos.
+"""
+
+# Importar librerias
+import io
+import json
+import os
+import re
+import shutil
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Ruta por defecto del almacen (carpeta datos/ohlcv en la raiz del proyecto)
+RUTA_ALMACEN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datos", "ohlcv")
+
+COLUMNAS_OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+COLUMNAS_EXTRA = ["Adj Close", "Dividends", "Stock Splits"]
+
+Fecha = Union[str, pd.Timestamp, None]
+
+# Escrituras recientes que meta.json recuerda (numero de escritura y primera fila que cambio)
+CAMBIOS_GUARDADOS = 64
+
+
+def _ruta_particion(ticker: str, intervalo: str, ruta: str) -> str:
+    return os.path.join(ruta, ticker, intervalo)
+
+
+def _archivo_columna(carpeta: str, columna: str, version: Optional[int]) -> str:
+    return os.path.join(carpeta, f"{columna}.npy" if version is None else f"{columna}.v{version}.npy")
+
+
+def _leer_meta(carpeta: str) -> Optional[dict]:
+    archivo = os.path.join(carpeta, "meta.json")
+    if not os.path.exists(archivo):
+        return None
+    with open(archivo, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _version_siguiente(anterior: Optional[dict]) -> int:
+    return 1 if anterior is None else anterior.get("version", 0) + 1
+
+
+def _confirmar_particion(carpeta: str, meta: dict, anterior: Optional[dict]) -> None:
+    """
+    Reemplaza meta.json, el unico paso que cambia la particion que ven los lectores, y borra despues los archivos de
+    las otras versiones (la anterior y los restos de escrituras interrumpidas).
+    """
+
+    temporal = os.path.join(carpeta, "meta.tmp.json")
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(meta, archivo, indent=2)
+    os.replace(temporal, os.path.join(carpeta, "meta.json"))
+
+    obsoletos = [n for n in os.listdir(carpeta) if re.fullmatch(r".+\.v(\d+)\.npy", n)
+                 and not n.endswith(f".v{meta['version']}.npy")]
+    if anterior is not None and anterior.get("version") is None:
+        obsoletos += [c + ".npy" for c in ["fecha"] + anterior["columnas"]]
+    for nombre in obsoletos:
+        try:
+            os.remove(os.path.join(carpeta, nombre))
+        except OSError:
+            # Archivo abierto por otro proceso (Windows) o ya borrado: se borra en la proxima escritura
+            pass
+
+
+def _con_cambio(meta: dict, anterior: Optional[dict], primera: int) -> dict:
+    """Numera la escritura y añade al registro de cambios de meta la primera fila que modifica."""
+
+    anterior = anterior or {}
+    escritura = anterior.get("escritura", 0) + 1
+    cambios = anterior.get("cambios", [])[-(CAMBIOS_GUARDADOS - 1):] + [[escritura, int(primera)]]
+    return dict(meta, escritura=escritura, cambios=cambios)
+
+
+def primera_fila_cambiada(ticker: str, intervalo: str, escritura: int, ruta: str = RUTA_ALMACEN) -> int:
+    """
+    Primera fila de la particion que cambio en las escrituras posteriores a `escritura` (el meta.json["escritura"]
+    de una lectura anterior), para actualizar solo desde ahi lo calculado sobre la particion.
+
+    return : int : meta["filas"] si no hubo escrituras posteriores, o 0 si el registro de cambios no llega tan atras.
+    """
+
+    meta = leer_meta(ticker, intervalo, ruta)
+    if meta is None:
+        raise FileNotFoundError(f"No hay datos de {ticker} ({intervalo}) en el almacen {ruta}")
+    actual = meta.get("escritura", 0)
+    if escritura == actual:
+        return meta["filas"]
+    posteriores = [primera for numero, primera in meta.get("cambios", []) if numero > escritura]
+    if escritura > actual or len(posteriores) < actual - escritura:
+        return 0
+    return min(posteriores)
+
+
+def archivo_columna(ticker: str, intervalo: str, columna: str, ruta: str = RUTA_ALMACEN) -> str:
+    """Ruta del .npy vigente de una columna ('fecha', 'Close', ...) de la particion."""
+
+    meta = leer_meta(ticker, intervalo, ruta)
+    if meta is None:
+        raise FileNotFoundError(f"No hay datos de {ticker} ({intervalo}) en el almacen {ruta}")
+    return _archivo_columna(_ruta_particion(ticker, intervalo, ruta), columna, meta.get("version"))
+
+
+def _normalizar(df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """Deja un DataFrame de yfinance (con o sin MultiIndex Price/Ticker) con columnas simples y ordenado por fecha."""
+
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.xs(ticker, axis=1, level=1) if ticker in df.columns.get_level_values(1) else df.droplevel(1, axis=1)
+    df = df[[c for c in df.columns if c in COLUMNAS_OHLCV or c in COLUMNAS_EXTRA]]
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+
+    return df
+
+
+def guardar_barras(df: pd.DataFrame, ticker: str, intervalo: str, ruta: str = RUTA_ALMACEN,
+                   dtype: Union[str, type] = np.float64) -> str:
+    """
+    Guarda (reemplazando) la particion ticker/intervalo del almacen.
+
+    param : pd.DataFrame : df : Barras con indice de fechas, tal como las devuelve yf.download.
+    param : str : ticker : Ticker del activo (por ejemplo, 'AAPL' o 'BTC-USD').
+    param : str : intervalo : Intervalo de las barras (por ejemplo, '1d' o '1m').
+    param : str : ruta : Carpeta raiz del almacen (por defecto, datos/ohlcv).
+    param : type : dtype : Tipo de las columnas: float64 (por defecto) o float32, que ocupa la mitad en disco y en
+            memoria y se puede pasar sin convertir a las funciones de algotrading.compacto (7 cifras significativas).
+
+    return : str : Carpeta de la particion escrita.
+    """
+
+    df = _normalizar(df, ticker)
+    indice = pd.DatetimeIndex(df.index)
+    zona = str(indice.tz) if indice.tz is not None else None
+    fechas = (indice.tz_convert("UTC").tz_localize(None) if zona else indice).as_unit("ns").asi8
+
+    carpeta = _ruta_particion(ticker, intervalo, ruta)
+    os.makedirs(carpeta, exist_ok=True)
+
+    columnas = {"fecha": fechas.astype(np.int64)}
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"Tipo de columnas no soportado: {dtype} (usar float64 o float32)")
+    columnas.update({c: df[c].to_numpy(dtype=dtype) for c in df.columns})
+
+    # Las columnas se escriben en archivos de una version nueva, que solo se hace visible al reemplazar meta.json
+    anterior = _leer_meta(carpeta)
+    version = _version_siguiente(anterior)
+    for nombre, valores in columnas.items():
+        np.save(_archivo_columna(carpeta, nombre, version), valores)
+    meta = {"ticker": ticker, "intervalo": intervalo, "columnas": list(df.columns), "zona_horaria": zona,
+            "filas": int(len(fechas)), "dtype": dtype.name, "version": version}
+    _confirmar_particion(carpeta, _con_cambio(meta, anterior, 0), anterior)
+
+    return carpeta
+
+
+def _cabecera_npy(archivo: str, filas: int) -> Optional[tuple]:
+    """
+    Lee la cabecera de un .npy de una dimension y prepara la cabecera con `filas` filas. Devuelve (tipo, posicion de
+    los datos, cabecera nueva), o None si la cabecera nueva no ocupa lo mismo (no se puede reescribir en su lugar).
+    """
+
+    from numpy.lib import format as formato
+
+    with open(archivo, "rb") as f:
+        version = formato.read_magic(f)
+        leer = formato.read_array_header_1_0 if version == (1, 0) else formato.read_array_header_2_0
+        forma, orden_fortran, tipo = leer(f)
+        inicio = f.tell()
+    if len(forma) != 1 or orden_fortran:
+        return None
+
+    # numpy deja espacio en la cabecera para que la forma crezca sin cambiar su longitud
+    cabecera = io.BytesIO()
+    escribir = formato.write_array_header_1_0 if version == (1, 0) else formato.write_array_header_2_0
+    escribir(cabecera, {"descr": formato.dtype_to_descr(tipo), "fortran_order": False, "shape": (filas,)})
+    if len(cabecera.getvalue()) != inicio:
+        return None
+    return tipo, inicio, cabecera.getvalue()
+
+
+def _anexar_en_archivos(carpeta: str, version: int, desde: int, cola: Dict[str, np.ndarray]) -> bool:
+    """
+    Escribe las filas de la cola desde la fila `desde` de cada columna de la version indicada y actualiza las
+    cabeceras, sin reescribir las filas anteriores. Devuelve False (sin escribir nada) si algun archivo no admite la
+    escritura en su lugar.
+    """
+
+    filas = desde + len(cola["fecha"])
+    archivos = {c: _archivo_columna(carpeta, c, version) for c in cola}
+    cabeceras = {c: _cabecera_npy(archivo, filas) for c, archivo in archivos.items()}
+    if any(cabecera is None for cabecera in cabeceras.values()):
+        return False
+
+    for c, (tipo, inicio, cabecera) in cabeceras.items():
+        with open(archivos[c], "r+b") as f:
+            f.seek(inicio + desde * tipo.itemsize)
+            f.write(np.ascontiguousarray(cola[c], dtype=tipo).tobytes())
+            f.truncate()
+            f.seek(0)
+            f.write(cabecera)
+    return True
+
+
+def anexar_barras(df: pd.DataFrame, ticker: str, intervalo: str, ruta: str = RUTA_ALMACEN) -> str:
+    """
+    Combina nuevas barras con las ya guardadas en la particion ticker/intervalo. Si una fecha ya existe se conserva la
+    barra nueva (por ejemplo, la ultima barra del dia que aun no habia cerrado). La particion conserva su tipo
+    (float64 o float32).
+
+    Si las barras nuevas no cambian ninguna fila guardada, se escriben en los archivos vigentes a partir de la ultima
+    fila valida (meta.json["filas"]), asi que anexar cuesta lo mismo con una historia de un mes que de diez años y los
+    lectores no ven cambiar ninguna fila. Si cambian filas guardadas (una barra que se vuelve a enviar con otros
+    valores), los archivos se copian a una version nueva y la cola combinada se escribe en la copia. En ambos casos
+    reemplazar meta.json es el ultimo paso: una escritura interrumpida deja visible la particion anterior completa. Las
+    barras anteriores a la primera guardada, las columnas nuevas y las particiones sin version reescriben la
+    particion completa con guardar_barras.
+
+    return : str : Carpeta de la particion escrita.
+    """
+
+    df = _normalizar(df, ticker)
+    meta = leer_meta(ticker, intervalo, ruta)
+    if meta is None:
+        return guardar_barras(df, ticker, intervalo, ruta)
+    carpeta = _ruta_particion(ticker, intervalo, ruta)
+    if df.empty:
+        return carpeta
+
+    zona = meta["zona_horaria"]
+    indice = pd.DatetimeIndex(df.index)
+    if zona is not None:
+        indice = indice.tz_localize(zona) if indice.tz is None else indice.tz_convert(zona)
+        df.index = indice
+        fechas_nuevas = indice.tz_convert("UTC").tz_localize(None).as_unit("ns").asi8
+    else:
+        fechas_nuevas = indice.as_unit("ns").asi8
+
+    arreglos = cargar_arreglos(ticker, intervalo, ruta=ruta)
+    desde = int(np.searchsorted(arreglos["fecha"], fechas_nuevas[0]))
+    en_su_lugar = (desde > 0 and meta.get("version") is not None and (zona is not None or indice.tz is None)
+                   and all(c in meta["columnas"] for c in df.columns))
+
+    if en_su_lugar:
+        # Cola: filas guardadas desde la primera fecha nueva, combinadas con las barras nuevas
+        existentes = pd.DataFrame({c: np.asarray(arreglos[c][desde:]) for c in meta["columnas"]},
+                                  index=np.asarray(arreglos["fecha"][desde:]))
+        nuevas = pd.DataFrame({c: df[c].to_numpy() for c in df.columns}, index=fechas_nuevas)
+        combinadas = pd.concat([existentes, nuevas]).reindex(columns=meta["columnas"])
+        combinadas = combinadas[~combinadas.index.duplicated(keep="last")].sort_index()
+        del existentes
+
+        dtype = np.dtype(meta.get("dtype", "float64"))
+        cola = {"fecha": combinadas.index.to_numpy(dtype=np.int64)}
+        cola.update({c: combinadas[c].to_numpy(dtype=dtype) for c in meta["columnas"]})
+
+        # Filas guardadas [desde, filas): si la cola las repite tal cual, solo se escribe a partir de `filas`; si no,
+        # `primera` es la primera fila que cambia
+        filas, solape = meta["filas"], meta["filas"] - desde
+        distintas = np.zeros(solape, dtype=bool)
+        for c in cola:
+            nuevas, guardadas = cola[c][:solape], np.asarray(arreglos[c][desde:filas])
+            iguales = nuevas == guardadas
+            if c != "fecha":
+                iguales |= np.isnan(nuevas) & np.isnan(guardadas)
+            distintas |= ~iguales
+        del arreglos
+        version = meta["version"]
+        primera = desde + int(np.argmax(distintas)) if distintas.any() else filas
+        if primera == filas:
+            cola = {c: valores[solape:] for c, valores in cola.items()}
+            desde = filas
+            if len(cola["fecha"]) == 0:
+                return carpeta
+        else:
+            version += 1
+            for c in cola:
+                shutil.copyfile(_archivo_columna(carpeta, c, meta["version"]), _archivo_columna(carpeta, c, version))
+        if _anexar_en_archivos(carpeta, version, desde, cola):
+            meta_nueva = dict(meta, filas=desde + len(cola["fecha"]), version=version)
+            _confirmar_particion(carpeta, _con_cambio(meta_nueva, meta, primera), meta)
+            return carpeta
+
+    existentes = cargar_barras(ticker, intervalo, ruta=ruta)
+    if existentes.index.tz is None and df.index.tz is not None:
+        existentes.index = existentes.index.tz_localize(df.index.tz)
+
+    return guardar_barras(pd.concat([existentes, df]), ticker, intervalo, ruta, meta.get("dtype", "float64"))
+
+
+def leer_meta(ticker: str, intervalo: str, ruta: str = RUTA_ALMACEN) -> Optional[dict]:
+    """Devuelve los metadatos de la particion, o None si no existe."""
+
+    return _leer_meta(_ruta_particion(ticker, intervalo, ruta))
+
+
+def cargar_arreglos(ticker: str, intervalo: str, inicio: Fecha = None, fin: Fecha = None,
+                    ruta: str = RUTA_ALMACEN) -> Dict[str, np.ndarray]:
+    """
+    Devuelve las columnas de la particion como arreglos memory-mapped (sin copiar), recortadas al rango [inicio, fin).
+    La clave 'fecha' contiene los instantes en nanosegundos UTC.
+    """
+
+    meta = leer_meta(ticker, intervalo, ruta)
+    if meta is None:
+        raise FileNotFoundError(f"No hay datos de {ticker} ({intervalo}) en el almacen {ruta}")
+
+    # Solo las primeras meta["filas"] filas son validas: los archivos pueden tener filas de una escritura posterior
+    carpeta = _ruta_particion(ticker, intervalo, ruta)
+    version = meta.get("version")
+    fechas = np.load(_archivo_columna(carpeta, "fecha", version), mmap_mode="r")[:meta["filas"]]
+    desde, hasta = _rango_filas(fechas, inicio, fin, meta["zona_horaria"])
+
+    arreglos = {"fecha": fechas[desde:hasta]}
+    for c in meta["columnas"]:
+        arreglos[c] = np.load(_archivo_columna(carpeta, c, version), mmap_mode="r")[desde:hasta]
+
+    return arreglos
+
+
+def _a_nanosegundos(fecha: Fecha, zona: Optional[str]) -> int:
+    fecha = pd.Timestamp(fecha)
+    if zona is not None:
+        fecha = fecha.tz_localize(zona) if fecha.tzinfo is None else fecha
+        fecha = fecha.tz_convert("UTC").tz_localize(None)
+    elif fecha.tzinfo is not None:
+        fecha = fecha.tz_convert("UTC").tz_localize(None)
+    return fecha.as_unit("ns").value
+
+
+def _rango_filas(fechas: np.ndarray, inicio: Fecha, fin: Fecha, zona: Optional[str]):
+    desde = 0 if inicio is None else int(np.searchsorted(fechas, _a_nanosegundos(inicio, zona), side="left"))
+    hasta = len(fechas) if fin is None else int(np.searchsorted(fechas, _a_nanosegundos(fin, zona), side="left"))
+    return desde, hasta
+
+
+def indice_fechas(fechas: np.ndarray, zona: Optional[str]) -> pd.DatetimeIndex:
+    """Indice de fechas de las barras (Date, o Datetime en la zona horaria de la particion) desde 'fecha'."""
+
+    indice = pd.DatetimeIndex(np.asarray(fechas).astype("datetime64[ns]"), name="Date")
+    if zona is not None:
+        indice = indice.tz_localize("UTC").tz_convert(zona).rename("Datetime")
+    return indice
+
+
+def cargar_barras(ticker: str, intervalo: str = "1d", inicio: Fecha = None, fin: Fecha = None,
+                  ruta: str = RUTA_ALMACEN) -> pd.DataFrame:
+    """
+    Carga las barras de un ticker desde el almacen con el mismo formato que
+    yf.download(..., multi_level_index=False): indice de fechas y columnas Open, High, Low, Close y Volume.
+
+    param : str : ticker : Ticker del activo.
+    param : str : intervalo : Intervalo de las barras (por defecto, '1d').
+    param : str | pd.Timestamp : inicio : Primera fecha incluida (opcional).
+    param : str | pd.Timestamp : fin : Fecha final, excluida como en yf.download (opcional).
+    param : str : ruta : Carpeta raiz del almacen (por defecto, datos/ohlcv).
+
+    return : pd.DataFrame : Barras OHLCV del rango pedido.
+    """
+
+    arreglos = cargar_arreglos(ticker, intervalo, inicio, fin, ruta)
+    indice = indice_fechas(arreglos.pop("fecha"), leer_meta(ticker, intervalo, ruta)["zona_horaria"])
+
+    return pd.DataFrame({c: np.asarray(v) for c, v in arreglos.items()}, index=indice)
+
+
+def listar_particiones(ruta: str = RUTA_ALMACEN) -> List[tuple]:
+    """Lista las particiones (ticker, intervalo) presentes en el almacen."""
+
+    if not os.path.isdir(ruta):
+        return []
+    return sorted((ticker, intervalo) for ticker in os.listdir(ruta) if os.path.isdir(os.path.join(ruta, ticker))
+                  for intervalo in os.listdir(os.path.join(ruta, ticker))
+                  if os.path.exists(os.path.join(ruta, ticker, intervalo, "meta.json")))
+
+
+def importar_csv(ruta_csv: str, intervalo: str = "1d", ruta: str = RUTA_ALMACEN) -> List[str]:
+    """
+    Importa al almacen un CSV guardado con datos.to_csv() de una descarga de yf.download, con la cabecera de tres
+    filas de yfinance (Price / Ticker / Date). Si el CSV contiene varios tickers se crea una particion por ticker.
+
+    return : List[str] : Tickers importados.
+    """
+
+    datos = pd.read_csv(ruta_csv, header=[0, 1], index_col=0, skiprows=[2], parse_dates=True)
+    datos.index.name = "Date"
+    tickers = list(dict.fromkeys(datos.columns.get_level_values(1)))
+    for ticker in tickers:
+        guardar_barras(datos.xs(ticker, axis=1, level=1), ticker, intervalo, ruta)
+
+    return tickers
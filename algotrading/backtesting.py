@@ -0,0 +1,195 @@
+"""
+Backtesting vectorizado de las señales de los indicadores.
+
+Convierte una señal (una columna de un indicador o miles de variantes a la vez) en posiciones, rendimientos netos de
+comisiones y deslizamiento, curva de capital y lista de operaciones, todo con operaciones sobre arreglos (sin recorrer
+las barras en Python). Ejemplos con las señales de los scripts:
+
+    backtest(df, mac["Cruce"], tipo="eventos")                                   # Cruce de Medias Moviles
+    backtest(df, np.sign(macd["MACD"] - macd["Señal"]))                          # MACD sobre su linea de señal
+    backtest(df, tsi["Tendencia"])                                               # TSI: largo o fuera del mercado
+    backtest(df, psar["UpTrend"].notna() * 1 - psar["DownTrend"].notna() * 1)    # PSAR: siempre en el mercado
+
+    barrido = barrido_cruce_medias(df, range(5, 55), range(20, 220))
+    backtest(df, np.moveaxis(barrido.señales, -1, 0), tipo="eventos")           # 10.000 variantes en una llamada
+"""
+
+# Importar librerias
+from typing import NamedTuple, Union
+
+import numpy as np
+import pandas as pd
+
+from algotrading.panel import seleccionar_columna
+
+Costo = Union[float, np.ndarray]
+
+EJECUCIONES = ("cierre", "siguiente_cierre", "siguiente_apertura")
+
+
+class ResultadoBacktest(NamedTuple):
+    """
+    Resultado de backtest. Los arreglos tienen forma (barras, *variantes), con la misma forma que la señal.
+
+    indice : pd.Index : Fechas de las barras.
+    posiciones : np.ndarray : Posicion mantenida tras la ejecucion de cada barra.
+    rendimientos : np.ndarray : Rendimiento simple neto de costos de cada barra.
+    capital : np.ndarray : Curva de capital, partiendo de capital_inicial.
+    operaciones : pd.DataFrame : Una fila por operacion (variante, direccion, tamaño, fechas y precios de entrada y
+                  salida ya con deslizamiento, barras, rendimiento neto y si sigue abierta). La variante es el indice
+                  plano; np.unravel_index(variante, forma) recupera la posicion en las dimensiones de la señal.
+    """
+
+    indice: pd.Index
+    posiciones: np.ndarray
+    rendimientos: np.ndarray
+    capital: np.ndarray
+    operaciones: pd.DataFrame
+
+    def resumen(self) -> pd.DataFrame:
+        """Metricas por variante: rendimiento total, numero de operaciones, tasa de acierto y exposicion."""
+
+        barras = self.rendimientos.shape[0]
+        rendimientos = self.rendimientos.reshape(barras, -1)
+        posiciones = self.posiciones.reshape(barras, -1)
+        variantes = rendimientos.shape[1]
+
+        operaciones = self.operaciones
+        numero = np.bincount(operaciones["variante"], minlength=variantes)
+        ganadoras = np.bincount(operaciones["variante"], weights=operaciones["rendimiento"] > 0, minlength=variantes)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.DataFrame({"rendimiento_total": np.prod(1 + rendimientos, axis=0) - 1,
+                                 "operaciones": numero,
+                                 "tasa_acierto": ganadoras / numero,
+                                 "exposicion": (posiciones != 0).mean(axis=0)},
+                                index=pd.RangeIndex(variantes, name="variante"))
+
+
+def posicion_desde_eventos(señales: np.ndarray) -> np.ndarray:
+    """
+    Convierte señales de evento (1 entrar en largo, -1 entrar en corto, 0 o NaN sin cambio) en la posicion mantenida,
+    repitiendo la ultima señal hacia adelante a lo largo del primer eje. Antes del primer evento la posicion es 0.
+    """
+
+    señales = np.nan_to_num(np.asarray(señales, dtype=float), nan=0.0)
+    barras = np.arange(señales.shape[0]).reshape((-1,) + (1,) * (señales.ndim - 1))
+    ultima = np.maximum.accumulate(np.where(señales != 0, barras, 0), axis=0)
+    return np.take_along_axis(señales, ultima, axis=0)
+
+
+def _operaciones(posiciones: np.ndarray, precio_ejecucion: np.ndarray, ultimo_precio: np.ndarray, indice: pd.Index,
+                 comision: np.ndarray, deslizamiento: np.ndarray) -> pd.DataFrame:
+    """Extrae las operaciones (tramos de posicion constante distinta de 0) de todas las variantes a la vez."""
+
+    barras, variantes = posiciones.shape
+
+    # Una fila por variante con un 0 a cada lado: las operaciones nunca cruzan de una variante a otra
+    relleno = np.zeros((variantes, barras + 2))
+    relleno[:, 1:-1] = posiciones.T
+    plano = relleno.ravel()
+    cambios = np.flatnonzero(plano[1:] != plano[:-1]) + 1
+    entradas = np.flatnonzero(plano[cambios] != 0)
+    inicio, fin = cambios[entradas], cambios[entradas + 1]
+
+    variante = inicio // (barras + 2)
+    barra_entrada = inicio % (barras + 2) - 1
+    barra_salida = fin % (barras + 2) - 1
+    abierta = barra_salida == barras
+    tamaño = plano[inicio]
+    direccion = np.sign(tamaño)
+
+    columna = variante if precio_ejecucion.shape[1] > 1 else np.zeros_like(variante)
+    deslizamiento = deslizamiento[variante]
+    comision = comision[variante]
+    precio_entrada = precio_ejecucion[barra_entrada, columna] * (1 + direccion * deslizamiento)
+    precio_salida = np.where(abierta, ultimo_precio[columna],
+                             precio_ejecucion[np.minimum(barra_salida, barras - 1), columna]
+                             * (1 - direccion * np.where(abierta, 0.0, deslizamiento)))
+    rendimiento = (np.abs(tamaño) * (direccion * (precio_salida / precio_entrada - 1))
+                   - np.abs(tamaño) * comision * np.where(abierta, 1, 2))
+
+    return pd.DataFrame({"variante": variante, "direccion": direccion.astype(np.int8), "tamaño": np.abs(tamaño),
+                         "entrada": indice[barra_entrada], "salida": indice[np.minimum(barra_salida, barras - 1)],
+                         "precio_entrada": precio_entrada, "precio_salida": precio_salida,
+                         "barras": barra_salida - barra_entrada, "rendimiento": rendimiento, "abierta": abierta})
+
+
+def backtest(df: Union[pd.DataFrame, pd.Series, np.ndarray], señales, tipo: str = "posicion",
+             ejecucion: str = "siguiente_apertura", comision: Costo = 0.0, deslizamiento: Costo = 0.0,
+             capital_inicial: float = 1.0, columna: str = "Close") -> ResultadoBacktest:
+    """
+    Backtest vectorizado de una o varias señales sobre los precios de un activo (o de un panel de activos).
+
+    param : pd.DataFrame | pd.Series | np.ndarray : df : Barras del activo (Open es necesario con ejecucion
+            'siguiente_apertura'), o un panel con una columna por variante.
+    param : array : señales : Señal con el tiempo en el primer eje: (barras,) o (barras, *variantes). Tambien acepta
+            una Serie o un DataFrame del mismo indice que df.
+    param : str : tipo : 'posicion' si la señal es la posicion deseada (1 largo, -1 corto, 0 fuera, True/False o
+            fracciones) o 'eventos' si solo marca los cambios (por ejemplo, la columna Cruce).
+    param : str : ejecucion : Cuando se ejecuta la orden generada al cierre de la barra t: 'cierre' (al mismo cierre,
+            optimista), 'siguiente_cierre' o 'siguiente_apertura' (por defecto).
+    param : float | np.ndarray : comision : Comision proporcional al valor negociado (0.001 = 0.1%). Puede ser un arreglo
+            con un valor por variante.
+    param : float | np.ndarray : deslizamiento : Deslizamiento proporcional al precio de ejecucion, siempre en contra.
+    param : float : capital_inicial : Capital al inicio de la curva (por defecto, 1).
+    param : str : columna : Columna de precios de cierre (por defecto, 'Close').
+
+    return : ResultadoBacktest : Posiciones, rendimientos netos, curva de capital y operaciones.
+    """
+
+    if ejecucion not in EJECUCIONES:
+        raise ValueError(f"ejecucion debe ser una de {EJECUCIONES}")
+    if tipo not in ("posicion", "eventos"):
+        raise ValueError("tipo debe ser 'posicion' o 'eventos'")
+
+    cierre = seleccionar_columna(df, columna)
+    indice = cierre.index
+    C = cierre.to_numpy(dtype=float).reshape(len(indice), -1)
+
+    señales = np.asarray(señales, dtype=float)
+    if señales.shape[0] != C.shape[0]:
+        raise ValueError(f"La señal tiene {señales.shape[0]} barras y los precios {C.shape[0]}")
+    forma = señales.shape
+    señales = señales.reshape(forma[0], -1)
+    barras, variantes = señales.shape
+    if C.shape[1] not in (1, variantes):
+        raise ValueError("El panel de precios debe tener una columna o una por variante")
+
+    objetivo = posicion_desde_eventos(señales) if tipo == "eventos" else np.nan_to_num(señales, nan=0.0)
+    comision = np.broadcast_to(np.asarray(comision, dtype=float).reshape(-1), (variantes,))
+    deslizamiento = np.broadcast_to(np.asarray(deslizamiento, dtype=float).reshape(-1), (variantes,))
+
+    # Posicion mantenida tras la ejecucion de cada barra
+    posiciones = np.zeros_like(objetivo)
+    retraso = 0 if ejecucion == "cierre" else 1
+    posiciones[retraso:] = objetivo[:barras - retraso]
+    anterior = np.zeros_like(posiciones)
+    anterior[1:] = posiciones[:-1]
+
+    # Rendimiento de la barra: la posicion anterior gana hasta el punto de ejecucion (apertura o cierre) y la nueva
+    # desde ahi hasta el cierre. Los costos se cobran sobre el cambio de posicion
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if ejecucion == "siguiente_apertura":
+            A = seleccionar_columna(df, "Open").to_numpy(dtype=float).reshape(C.shape)
+            precio_ejecucion = A
+            hasta_ejecucion = np.zeros_like(C)
+            hasta_ejecucion[1:] = A[1:] / C[:-1] - 1
+            desde_ejecucion = C / A - 1
+        else:
+            precio_ejecucion = C
+            hasta_ejecucion = np.zeros_like(C)
+            hasta_ejecucion[1:] = C[1:] / C[:-1] - 1
+            desde_ejecucion = np.zeros_like(C)
+    hasta_ejecucion = np.nan_to_num(hasta_ejecucion, nan=0.0, posinf=0.0, neginf=0.0)
+    desde_ejecucion = np.nan_to_num(desde_ejecucion, nan=0.0, posinf=0.0, neginf=0.0)
+
+    rendimientos = ((1 + anterior * hasta_ejecucion) * (1 + posiciones * desde_ejecucion) - 1
+                    - np.abs(posiciones - anterior) * (comision + deslizamiento))
+    capital = capital_inicial * np.cumprod(1 + rendimientos, axis=0)
+
+    ultimo_precio = C[-1] if barras else np.zeros(C.shape[1])
+    operaciones = _operaciones(posiciones, precio_ejecucion, ultimo_precio, indice, comision, deslizamiento)
+
+    return ResultadoBacktest(indice, posiciones.reshape(forma), rendimientos.reshape(forma), capital.reshape(forma),
+                             operaciones)
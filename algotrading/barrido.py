@@ -0,0 +1,139 @@
+"""
+Barrido de parametros del Cruce de Medias Moviles.
+
+Optimizar las ventanas de Cruce_Medias_Moviles llamando a la funcion una vez por combinacion recalcula las mismas medias
+moviles cientos de veces. Aqui todas las SMA se obtienen de una unica suma acumulada del precio (una resta y una division
+por ventana) y las señales y rendimientos de toda la rejilla se calculan con operaciones vectorizadas sobre arreglos 3-D
+(ventana rapida x ventana lenta x barras), sin construir un DataFrame por combinacion:
+
+    resultado = barrido_cruce_medias(df, range(5, 55), range(20, 220))
+    resultado.rendimiento_total()        # DataFrame rapidas x lentas
+"""
+
+# Importar librerias
+from typing import Iterable, NamedTuple, Union
+
+import numpy as np
+import pandas as pd
+
+from algotrading.panel import es_panel, seleccionar_columna
+
+
+class ResultadoBarrido(NamedTuple):
+    """
+    Resultado de barrido_cruce_medias.
+
+    longitudes_rapidas : np.ndarray : Ventanas rapidas (primer eje).
+    longitudes_lentas : np.ndarray : Ventanas lentas (segundo eje).
+    indice : pd.Index : Fechas de las barras (tercer eje).
+    señales : np.ndarray : Columna "Cruce" de cada combinacion (1 cruce alcista, -1 cruce bajista, 0 sin cruce), int8.
+    posiciones : np.ndarray : Posicion mantenida tras cada barra (la ultima señal, 0 antes del primer cruce), int8.
+    rendimientos : np.ndarray : Rendimiento simple de la estrategia en cada barra (posicion de la barra anterior por
+                   el rendimiento del precio).
+    """
+
+    longitudes_rapidas: np.ndarray
+    longitudes_lentas: np.ndarray
+    indice: pd.Index
+    señales: np.ndarray
+    posiciones: np.ndarray
+    rendimientos: np.ndarray
+
+    def rendimiento_total(self) -> pd.DataFrame:
+        """Rendimiento acumulado de cada combinacion (filas: ventana rapida, columnas: ventana lenta)."""
+
+        total = np.prod(1 + self.rendimientos, axis=-1) - 1
+        return pd.DataFrame(total, index=pd.Index(self.longitudes_rapidas, name="longitud_rapida"),
+                            columns=pd.Index(self.longitudes_lentas, name="longitud_lenta"))
+
+
+def medias_moviles_simples(valores: np.ndarray, longitudes: Iterable[int]) -> np.ndarray:
+    """
+    Calcula la SMA de un precio para varias ventanas a partir de una sola suma acumulada.
+
+    param : np.ndarray : valores : Precios (1-D).
+    param : Iterable[int] : longitudes : Ventanas a calcular.
+
+    return : np.ndarray : Arreglo (ventanas x barras). Las ventanas incompletas o con NaN valen NaN, como en
+             rolling(window=longitud, min_periods=longitud).mean().
+    """
+
+    valores = np.asarray(valores, dtype=float)
+    longitudes = np.asarray(list(longitudes), dtype=np.int64)
+    n = valores.shape[0]
+
+    # Sumas acumuladas con un cero inicial; se centran en el primer precio valido para no perder precision en series
+    # largas. Los NaN cuentan como 0 en la suma y se descartan despues con el conteo acumulado de NaN
+    nulos = np.isnan(valores)
+    referencia = valores[~nulos][0] if (~nulos).any() else 0.0
+    suma = np.concatenate([[0.0], np.cumsum(np.where(nulos, 0.0, valores - referencia))])
+    conteo_nulos = np.concatenate([[0], np.cumsum(nulos)])
+
+    medias = np.full((longitudes.shape[0], n), np.nan)
+    for i, longitud in enumerate(longitudes):
+        if longitud > n:
+            continue
+        fin = np.arange(longitud, n + 1)
+        media = (suma[fin] - suma[fin - longitud]) / longitud + referencia
+        completa = conteo_nulos[fin] == conteo_nulos[fin - longitud]
+        medias[i, longitud - 1:] = np.where(completa, media, np.nan)
+
+    return medias
+
+
+def barrido_cruce_medias(df: Union[pd.DataFrame, pd.Series, np.ndarray], longitudes_rapidas: Iterable[int],
+                         longitudes_lentas: Iterable[int], columna: str = "Close") -> ResultadoBarrido:
+    """
+    Calcula el Cruce de Medias Moviles para todas las combinaciones de ventanas rapidas y lentas.
+
+    Las señales coinciden con la columna "Cruce" de Cruce_Medias_Moviles para cada par de ventanas. La estrategia es la
+    tradicional (siempre en largo o en corto): tras un cruce alcista se mantiene la posicion larga hasta el siguiente
+    cruce bajista y viceversa.
+
+    param : pd.DataFrame | pd.Series | np.ndarray : df : Datos de un activo.
+    param : Iterable[int] : longitudes_rapidas : Ventanas de la media rapida (por ejemplo, range(5, 55)).
+    param : Iterable[int] : longitudes_lentas : Ventanas de la media lenta (por ejemplo, range(20, 220)).
+    param : str : columna : Columna de precios (por defecto, 'Close').
+
+    return : ResultadoBarrido : Señales, posiciones y rendimientos con forma (rapidas, lentas, barras).
+    """
+
+    precios = seleccionar_columna(df, columna)
+    if es_panel(precios):
+        raise ValueError("El barrido se calcula sobre un solo activo; recorre los tickers del panel por separado")
+
+    rapidas = np.asarray(list(longitudes_rapidas), dtype=np.int64)
+    lentas = np.asarray(list(longitudes_lentas), dtype=np.int64)
+    valores = precios.to_numpy(dtype=float)
+    n = valores.shape[0]
+
+    # Cada ventana distinta se calcula una sola vez aunque aparezca en los dos ejes
+    ventanas, posicion = np.unique(np.concatenate([rapidas, lentas]), return_inverse=True)
+    medias = medias_moviles_simples(valores, ventanas)
+    SMA_Rapidas, SMA_Lentas = medias[posicion[:len(rapidas)]], medias[posicion[len(rapidas):]]
+
+    # Rendimiento simple del precio (0 en la primera barra y en barras sin dato)
+    rendimiento_precio = np.zeros(n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rendimiento_precio[1:] = np.nan_to_num(valores[1:] / valores[:-1] - 1, nan=0.0, posinf=0.0, neginf=0.0)
+
+    señales = np.zeros((len(rapidas), len(lentas), n), dtype=np.int8)
+    posiciones = np.zeros((len(rapidas), len(lentas), n), dtype=np.int8)
+    rendimientos = np.zeros((len(rapidas), len(lentas), n))
+    barras = np.arange(n)
+
+    # Un plano (lentas x barras) por ventana rapida: la memoria temporal no crece con el tamaño de la rejilla
+    for i in range(len(rapidas)):
+        diferencia = SMA_Rapidas[i][None, :] - SMA_Lentas
+        anterior = diferencia[:, :-1]
+        actual = diferencia[:, 1:]
+        señal = señales[i]
+        señal[:, 1:] = (actual > 0) & (anterior < 0)
+        señal[:, 1:] -= ((actual < 0) & (anterior > 0)).astype(np.int8)
+
+        # Mantener la ultima señal (forward fill vectorizado con el indice de la ultima barra con cruce)
+        ultima = np.maximum.accumulate(np.where(señal != 0, barras, 0), axis=1)
+        posiciones[i] = np.take_along_axis(señal, ultima, axis=1)
+        rendimientos[i, :, 1:] = posiciones[i, :, :-1] * rendimiento_precio[1:]
+
+    return ResultadoBarrido(rapidas, lentas, precios.index, señales, posiciones, rendimientos)
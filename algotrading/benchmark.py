@@ -0,0 +1,343 @@
+"""
+Benchmark de rendimiento de los indicadores con datos sinteticos.
+
+Mide cada indicador sobre barras OHLCV generadas con semilla (sin red, resultados reproducibles) a varias escalas de
+barras (1e3 a 1e7) y de paneles (1 a 5.000 tickers), y reporta filas por segundo (barras x tickers / segundos), memoria
+pico (tracemalloc, en una ejecucion aparte para no inflar los tiempos) y el exponente de escalamiento de cada
+indicador (pendiente de log(segundos) frente a log(filas): 1 es lineal). Los resultados se guardan en JSON para
+compararlos entre versiones:
+
+    python -m algotrading.benchmark --salida benchmark.json
+    python -m algotrading.benchmark --indicadores SMA CCI PSAR --barras 1e3 1e5 1e6 --tickers 1 --salida hoy.json
+    python -m algotrading.benchmark --comparar ayer.json hoy.json
+
+Tambien mide el arranque en frio de cada modulo del paquete (en un interprete nuevo, descontando numpy y pandas, y
+su costo absoluto), comprueba que ninguno cargue librerias de graficos, de datos o de estadistica al importarse y que
+`import algotrading` no cargue ningun submodulo, numpy ni pandas:
+
+    python -m algotrading.benchmark --importacion
+"""
+
+# Importar librerias
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from algotrading.indicadores import (CCI, MACD, Cruce_Medias_Moviles, Ichimoku_Cloud, Indicador_Fuerza_Relativa,
+                                     Indicador_Fuerza_Verdadera, Indice_Movimiento_Direccional, Media_Movil_Exponencial,
+                                     Media_Movil_Ponderada, Media_Movil_Simple, Parabolic_SAR)
+
+# Escalas por defecto: barras de un solo ticker y tickers de un panel de BARRAS_PANEL barras
+BARRAS = (1_000, 100_000, 1_000_000, 10_000_000)
+TICKERS = (1, 10, 100, 1_000, 5_000)
+BARRAS_PANEL = 1_000
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def generar_ohlcv(barras: int, tickers: int = 1, semilla: int = 0, inicio: str = "2000-01-01",
+                  frecuencia: str = "min") -> pd.DataFrame:
+    """
+    Barras OHLCV sinteticas y reproducibles: paseo aleatorio geometrico para el Close, Open igual al Close anterior,
+    High y Low alrededor del cuerpo de la vela y Volume aleatorio.
+
+    param : int : barras : Numero de barras.
+    param : int : tickers : Numero de tickers; con mas de uno las columnas son un MultiIndex (campo, ticker), como en
+            una descarga de varios tickers.
+    param : int : semilla : Semilla del generador.
+
+    return : pd.DataFrame : Datos OHLCV con indice de fechas.
+    """
+
+    generador = np.random.default_rng(semilla)
+    forma = (barras, tickers)
+    Close = 100 * np.exp(np.cumsum(generador.normal(0, 0.01, forma), axis=0))
+    Open = np.vstack([Close[:1], Close[:-1]])
+    cuerpo_alto, cuerpo_bajo = np.maximum(Open, Close), np.minimum(Open, Close)
+    High = cuerpo_alto * (1 + np.abs(generador.normal(0, 0.005, forma)))
+    Low = cuerpo_bajo * (1 - np.abs(generador.normal(0, 0.005, forma)))
+    Volume = generador.integers(100, 10_000, forma).astype(float)
+
+    indice = pd.date_range(inicio, periods=barras, freq=frecuencia, name="Date")
+    campos = {"Open": Open, "High": High, "Low": Low, "Close": Close, "Volume": Volume}
+    if tickers == 1:
+        return pd.DataFrame({campo: valores[:, 0] for campo, valores in campos.items()}, index=indice)
+    nombres = [f"T{i:04d}" for i in range(tickers)]
+    return pd.concat({campo: pd.DataFrame(valores, index=indice, columns=nombres) for campo, valores in campos.items()},
+                     axis=1)
+
+
+# Indicadores ------------------------------------------------------------------------------------------------------
+
+# Nombre corto -> funcion del indicador
+INDICADORES: Dict[str, Callable] = {
+    "SMA": Media_Movil_Simple,
+    "EMA": Media_Movil_Exponencial,
+    "WMA": Media_Movil_Ponderada,
+    "Cruce_Medias": Cruce_Medias_Moviles,
+    "DMI": Indice_Movimiento_Direccional,
+    "MACD": MACD,
+    "CCI": CCI,
+    "Ichimoku": Ichimoku_Cloud,
+    "PSAR": Parabolic_SAR,
+    "TSI": Indicador_Fuerza_Verdadera,
+    "RSI": Indicador_Fuerza_Relativa,
+}
+
+
+# Medicion ---------------------------------------------------------------------------------------------------------
+
+def _medir(funcion: Callable, df: pd.DataFrame, repeticiones: int) -> dict:
+    """Mejor tiempo de `repeticiones` llamadas tras una sin medir, y memoria pico de otra bajo tracemalloc."""
+
+    # Llamada previa sin medir: la primera carga los imports perezosos (scipy en DMI) y calienta las caches
+    funcion(df)
+    mejor = np.inf
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(df)
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        funcion(df)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"segundos": mejor, "memoria_pico_mb": pico / 2 ** 20}
+
+
+def _exponente(filas: List[int], segundos: List[float]) -> float:
+    """Pendiente de log(segundos) frente a log(filas), ignorando las medidas demasiado cortas para ser fiables."""
+
+    puntos = [(f, s) for f, s in zip(filas, segundos) if s == s and s > 1e-4]
+    if len({f for f, _ in puntos}) < 2:
+        return float("nan")
+    x, y = np.log([f for f, _ in puntos]), np.log([s for _, s in puntos])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def ejecutar(indicadores: Optional[Iterable[str]] = None, barras: Iterable[int] = BARRAS,
+             tickers: Iterable[int] = TICKERS, barras_panel: int = BARRAS_PANEL, repeticiones: int = 3,
+             max_segundos: float = 60.0, max_celdas: int = 50_000_000, semilla: int = 0,
+             verbose: bool = True) -> dict:
+    """
+    Ejecuta el benchmark: cada indicador con un ticker y `barras` barras, y con paneles de `tickers` tickers y
+    `barras_panel` barras.
+
+    param : Iterable[str] : indicadores : Claves de INDICADORES (por defecto, todos).
+    param : Iterable[int] : barras : Escalas de barras para un solo ticker.
+    param : Iterable[int] : tickers : Tamaños de panel (el panel de 1 ticker es el caso de un solo activo).
+    param : int : barras_panel : Barras de cada panel.
+    param : int : repeticiones : Repeticiones por medida (se toma el mejor tiempo).
+    param : float : max_segundos : Si una medida supera este tiempo, se omiten las escalas mayores de ese indicador.
+    param : int : max_celdas : Barras x tickers maximas (las escalas mayores se omiten para acotar la memoria).
+    param : int : semilla : Semilla de los datos sinteticos.
+    param : bool : verbose : Imprimir cada medida.
+
+    return : dict : Entorno, resultados (una entrada por indicador y escala con barras, tickers, filas, segundos,
+             filas_por_segundo, memoria_pico_mb u omitido/error) y exponente de escalamiento por indicador y serie.
+    """
+
+    indicadores = list(INDICADORES) if indicadores is None else list(indicadores)
+    desconocidos = [i for i in indicadores if i not in INDICADORES]
+    if desconocidos:
+        raise ValueError(f"Indicadores desconocidos: {desconocidos} (disponibles: {list(INDICADORES)})")
+
+    escalas = [("barras", int(b), 1) for b in sorted(barras)]
+    escalas += [("panel", int(barras_panel), int(t)) for t in sorted(tickers) if t > 1]
+    datos: Dict[tuple, pd.DataFrame] = {}
+    resultados = []
+
+    for nombre in indicadores:
+        funcion = INDICADORES[nombre]
+        excedido = set()
+        for serie, n, k in escalas:
+            registro = {"indicador": nombre, "serie": serie, "barras": n, "tickers": k, "filas": n * k}
+            if n * k > max_celdas:
+                registro["omitido"] = "max_celdas"
+            elif serie in excedido:
+                registro["omitido"] = "max_segundos"
+            else:
+                if (n, k) not in datos:
+                    datos.clear()
+                    datos[(n, k)] = generar_ohlcv(n, k, semilla)
+                try:
+                    registro.update(_medir(funcion, datos[(n, k)], repeticiones))
+                    registro["filas_por_segundo"] = n * k / registro["segundos"]
+                    if registro["segundos"] > max_segundos:
+                        excedido.add(serie)
+                except Exception as error:
+                    registro["error"] = repr(error)
+            resultados.append(registro)
+            if verbose:
+                estado = (f"{registro['filas_por_segundo']:>14,.0f} filas/s  {registro['memoria_pico_mb']:>9.1f} MB"
+                          if "segundos" in registro else registro.get("omitido") or registro.get("error"))
+                print(f"{nombre:<13} {serie:<7} {n:>10,} x {k:>5,}  {estado}")
+
+    escalamiento = {}
+    for nombre in indicadores:
+        for serie in ("barras", "panel"):
+            medidos = [r for r in resultados if r["indicador"] == nombre and r["serie"] == serie and "segundos" in r]
+            escalamiento.setdefault(nombre, {})[serie] = _exponente([r["filas"] for r in medidos],
+                                                                     [r["segundos"] for r in medidos])
+
+    return {"fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+            "entorno": {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+                        "plataforma": platform.platform(), "procesador": platform.processor()},
+            "parametros": {"repeticiones": repeticiones, "semilla": semilla, "barras_panel": barras_panel},
+            "resultados": resultados, "escalamiento": escalamiento}
+
+
+# Importacion -------------------------------------------------------------------------------------------------------
+
+# Milisegundos que la importacion de cada modulo puede sumar a la de numpy y pandas (para el paquete, su costo absoluto)
+PRESUPUESTO_IMPORTACION_MS = 100.0
+
+# Librerias que importar el paquete no debe cargar: se importan dentro de las funciones que las usan
+MODULOS_PESADOS = ("matplotlib", "mplfinance", "plotly", "yfinance", "seaborn", "statsmodels", "scipy", "IPython",
+                   "turtledemo")
+
+_PROGRAMA_IMPORTACION = """
+import json, sys, time
+inicio = time.perf_counter()
+{previo}
+base = time.perf_counter()
+import {modulo}
+fin = time.perf_counter()
+print(json.dumps({{"base_ms": (base - inicio) * 1e3, "ms": (fin - base) * 1e3, "modulos": sorted(sys.modules)}}))
+"""
+
+
+def _importar_en_frio(modulo: str, previo: str = "import numpy, pandas") -> dict:
+    """
+    Importa `modulo` en un interprete nuevo, despues de ejecutar `previo`, y devuelve los milisegundos y los modulos
+    cargados. Con previo="" el tiempo es el costo absoluto de la importacion (incluidos numpy y pandas si los carga).
+    """
+
+    entorno = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [_RAIZ, os.environ.get("PYTHONPATH")])))
+    programa = _PROGRAMA_IMPORTACION.format(modulo=modulo, previo=previo)
+    proceso = subprocess.run([sys.executable, "-c", programa], env=entorno, capture_output=True, text=True,
+                             check=True)
+    return json.loads(proceso.stdout.splitlines()[-1])
+
+
+def medir_importacion(modulos: Optional[Iterable[str]] = None, repeticiones: int = 3,
+                      presupuesto_ms: float = PRESUPUESTO_IMPORTACION_MS) -> pd.DataFrame:
+    """
+    Tiempo de importacion en frio de los modulos del paquete.
+
+    param : Iterable[str] : modulos : Modulos a importar (por defecto, el paquete y cada uno de sus modulos).
+    param : int : repeticiones : Interpretes nuevos por modulo (se toma el mejor tiempo).
+    param : float : presupuesto_ms : Milisegundos maximos sobre la importacion de numpy y pandas. El paquete
+            (import algotrading) no debe cargar ningun modulo y se mide por su costo absoluto.
+
+    return : pd.DataFrame : Por modulo: ms (costo propio, con numpy y pandas ya importados), total_ms (costo
+             absoluto en un interprete nuevo), base_ms (numpy y pandas), cargados (submodulos, numpy y pandas que
+             carga import algotrading), pesados (librerias de MODULOS_PESADOS que se cargaron) y
+             dentro_presupuesto.
+    """
+
+    if modulos is None:
+        from algotrading import _EXPORTACIONES
+        modulos = ["algotrading"] + [f"algotrading.{modulo}" for modulo in _EXPORTACIONES]
+
+    filas = []
+    for modulo in modulos:
+        medidas = [_importar_en_frio(modulo) for _ in range(repeticiones)]
+        absolutas = [_importar_en_frio(modulo, previo="") for _ in range(repeticiones)]
+        nombres = set(absolutas[0]["modulos"])
+        raices = {nombre.split(".")[0] for nombre in nombres}
+        pesados = [nombre for nombre in MODULOS_PESADOS if nombre in raices]
+        ms, total_ms = min(m["ms"] for m in medidas), min(m["ms"] for m in absolutas)
+        cargados = []
+        if modulo == "algotrading":
+            cargados = sorted(nombre for nombre in nombres
+                              if nombre in ("numpy", "pandas") or nombre.startswith("algotrading."))
+            dentro = total_ms <= presupuesto_ms and not cargados
+        else:
+            dentro = ms <= presupuesto_ms and not pesados
+        filas.append({"modulo": modulo, "ms": ms, "total_ms": total_ms, "base_ms": min(m["base_ms"] for m in medidas),
+                      "cargados": ", ".join(cargados), "pesados": ", ".join(pesados), "dentro_presupuesto": dentro})
+    return pd.DataFrame(filas).set_index("modulo")
+
+
+def guardar(resultado: dict, archivo: str) -> None:
+    with open(archivo, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=2)
+
+
+def comparar(anterior: str, actual: str, tolerancia: float = 0.10) -> pd.DataFrame:
+    """
+    Compara dos ejecuciones guardadas en JSON.
+
+    param : str : anterior, actual : Archivos JSON de ejecutar() / guardar().
+    param : float : tolerancia : Caida relativa de filas por segundo a partir de la cual se marca una regresion.
+
+    return : pd.DataFrame : Filas por segundo de ambas ejecuciones, su cociente y la marca de regresion, por
+             indicador y escala.
+    """
+
+    def cargar(archivo: str) -> pd.DataFrame:
+        with open(archivo, encoding="utf-8") as f:
+            resultados = pd.DataFrame(json.load(f)["resultados"])
+        if "filas_por_segundo" not in resultados:
+            resultados["filas_por_segundo"] = np.nan
+        return resultados.set_index(["indicador", "serie", "barras", "tickers"])["filas_por_segundo"]
+
+    tabla = pd.concat({"anterior": cargar(anterior), "actual": cargar(actual)}, axis=1, join="inner")
+    tabla["cociente"] = tabla["actual"] / tabla["anterior"]
+    tabla["regresion"] = tabla["cociente"] < 1 - tolerancia
+    return tabla
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de indicadores con datos OHLCV sinteticos.")
+    parser.add_argument("--indicadores", nargs="+", default=None, choices=list(INDICADORES), help="Indicadores.")
+    parser.add_argument("--barras", nargs="+", type=float, default=list(BARRAS), help="Barras (un ticker).")
+    parser.add_argument("--tickers", nargs="+", type=int, default=list(TICKERS), help="Tickers de los paneles.")
+    parser.add_argument("--barras-panel", type=int, default=BARRAS_PANEL, help="Barras de cada panel.")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones por medida.")
+    parser.add_argument("--max-segundos", type=float, default=60.0, help="Tiempo maximo antes de omitir escalas.")
+    parser.add_argument("--max-celdas", type=int, default=50_000_000, help="Barras x tickers maximas.")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de los datos sinteticos.")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTERIOR", "ACTUAL"), help="Compara dos archivos JSON.")
+    parser.add_argument("--importacion", action="store_true",
+                        help="Mide la importacion en frio de cada modulo frente a PRESUPUESTO_IMPORTACION_MS.")
+    args = parser.parse_args(argumentos)
+
+    if args.importacion:
+        tabla = medir_importacion()
+        print(tabla.round(1).to_string())
+        if not tabla["dentro_presupuesto"].all():
+            raise SystemExit(f"Fuera de presupuesto ({PRESUPUESTO_IMPORTACION_MS:.0f} ms o librerias pesadas): "
+                             f"{list(tabla.index[~tabla['dentro_presupuesto']])}")
+        return
+
+    if args.comparar:
+        tabla = comparar(*args.comparar)
+        print(tabla.to_string())
+        print(f"Regresiones: {int(tabla['regresion'].sum())}")
+        return
+
+    resultado = ejecutar(args.indicadores, [int(b) for b in args.barras], args.tickers, args.barras_panel,
+                         args.repeticiones, args.max_segundos, args.max_celdas, args.semilla)
+    print(pd.DataFrame(resultado["escalamiento"]).T.round(2).to_string())
+    if args.salida:
+        guardar(resultado, args.salida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,476 @@
+"""
+Calculo de indicadores por bloques (fuera de memoria) sobre historias largas de barras de 1 minuto.
+
+Años de barras de 1 minuto de BTC-USD o de un futuro como CL=F no caben en memoria junto con una docena de columnas de
+indicadores. Aqui la historia se recorre en bloques de `filas` barras leidos del almacen (lecturas memory-mapped) y
+cada bloque se calcula y se entrega, o se escribe en disco, antes de leer el siguiente:
+
+    for bloque in indicadores_almacen("BTC-USD", "1m", ["SMA", "RSI", "Ichimoku"]):
+        ...                                              # DataFrame con las barras del bloque y una columna por salida
+
+    guardar_indicadores("BTC-USD", "1m")                 # particion BTC-USD/1m_indicadores del almacen
+
+La memoria pico depende de `filas` y no de la longitud de la historia. Para que el resultado sea el mismo que el de la
+funcion de algotrading.indicadores sobre toda la historia, cada indicador continua entre bloques de una de dos formas:
+
+    Estado arrastrado  : EMA, RSI y MACD (valor de cada media de pandas, observaciones y barras sin dato pendientes),
+                         DMI (sumas de Wilder, ADX y la ultima barra) y PSAR (la maquina de estados y las dos ultimas
+                         barras). Son recursivos: no hay ventana de calentamiento que alcance para reproducirlos.
+    Solape de ventanas : SMA, CCI e Ichimoku dependen solo de una ventana de barras, asi que cada bloque se calcula con
+                         las barras anteriores que necesita (y las `periodo_kijun` posteriores para el Chikou Span).
+
+Todas las salidas coinciden bit a bit con la ejecucion completa, salvo la SMA: rolling().mean() de pandas arrastra una
+suma compensada desde la primera barra y el bloque la empieza de nuevo, asi que puede diferir en el ultimo bit (error
+relativo del orden de 1e-16). verificar_bloques compara ambas ejecuciones sobre un DataFrame en memoria.
+"""
+
+# Importar librerias
+import argparse
+import os
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from algotrading.almacen import (RUTA_ALMACEN, _archivo_columna, _confirmar_particion, _leer_meta, _version_siguiente,
+                                 cargar_arreglos, indice_fechas, leer_meta)
+from algotrading.indicadores import (CCI, MACD, Ichimoku_Cloud, Indicador_Fuerza_Relativa,
+                                     Indice_Movimiento_Direccional, Media_Movil_Exponencial, Media_Movil_Simple,
+                                     Parabolic_SAR, Suavizado_Wilder)
+from algotrading.indicadores.momentum import _ganancias_perdidas, _rsi_desde_medias
+from algotrading.indicadores.tendencia import _psar_activo
+
+# Barras por bloque: unos tres meses de barras de 1 minuto de un activo que cotiza 24 horas
+FILAS_BLOQUE = 1 << 17
+
+COLUMNAS_PRECIOS = ("Open", "High", "Low", "Close")
+
+Indicadores = Union[Iterable[str], Mapping[str, dict], None]
+
+
+# Medias exponenciales con estado ----------------------------------------------------------------------------------
+
+class _EWMBloques:
+    """
+    serie.ewm(span=longitud, min_periods=longitud, adjust=False).mean() calculada bloque a bloque con pandas, para una
+    serie (activos=None) o un panel tiempo x activos.
+
+    El estado de pandas entre barras es la media, el peso de la media anterior (1 tras cada observacion y multiplicado
+    por 1 - alpha en cada barra sin dato) y el numero de observaciones. Cada bloque se calcula anteponiendo la media
+    anterior y tantos NaN como barras sin dato pendientes: pandas reconstruye asi exactamente el mismo peso y el
+    resultado es identico al de la serie completa. En un panel cada activo tiene su propio prefijo, alineado al final
+    (los NaN anteriores a la media no cuentan porque pandas empieza en la primera observacion).
+    """
+
+    def __init__(self, longitud: int, activos: Optional[int] = None):
+        self.longitud = longitud
+        self.forma = () if activos is None else (activos,)
+        self.media = np.full(self.forma, np.nan)
+        self.observaciones = np.zeros(self.forma, dtype=np.int64)
+        self.pendientes = np.zeros(self.forma, dtype=np.int64)
+
+        # Barras sin dato tras las que el peso anterior deja de cambiar (llega a 0 o al menor subnormal): a partir de
+        # ahi mas NaN no cambian el estado y el prefijo queda acotado
+        factor = 1.0 - 1.0 / (1.0 + (longitud - 1) / 2.0)
+        peso, self.tope = 1.0, 0
+        while peso * factor != peso:
+            peso *= factor
+            self.tope += 1
+
+    def calcular(self, x: np.ndarray) -> np.ndarray:
+        X = np.asarray(x, dtype=np.float64).reshape(len(x), -1)
+        media, pendientes = self.media.reshape(-1), self.pendientes.reshape(-1)
+        iniciado = ~np.isnan(media)
+
+        # Prefijo de cada activo: su media seguida de sus NaN pendientes, alineado con el inicio del bloque
+        atras = np.where(iniciado, np.minimum(pendientes, self.tope), -1)
+        largo = int(atras.max()) + 1
+        prefijo = np.full((largo, X.shape[1]), np.nan)
+        activos = np.flatnonzero(iniciado)
+        prefijo[largo - 1 - atras[activos], activos] = media[activos]
+        completo = pd.DataFrame(np.concatenate([prefijo, X]))
+        y = completo.ewm(span=self.longitud, min_periods=1, adjust=False).mean().to_numpy()[largo:].copy()
+
+        observado = ~np.isnan(X)
+        conteo = self.observaciones.reshape(-1) + np.cumsum(observado, axis=0)
+        if len(X):
+            hay = observado.any(axis=0)
+            pendientes = np.where(hay, np.argmax(observado[::-1], axis=0),
+                                  np.where(iniciado, pendientes + len(X), pendientes))
+            self.pendientes = pendientes.reshape(self.forma)
+            self.observaciones = conteo[-1].reshape(self.forma)
+            self.media = y[-1].copy().reshape(self.forma)
+
+        y[conteo < self.longitud] = np.nan
+        return y.reshape(np.shape(x))
+
+
+# Indicadores por bloques ------------------------------------------------------------------------------------------
+
+class _Indicador:
+    """
+    Base de los indicadores por bloques. `calcular` recibe un tramo de barras (DataFrame) y devuelve las salidas de
+    las `filas` barras del bloque, que empiezan en la fila `desde` del tramo. El tramo incluye `calentamiento` barras
+    anteriores al bloque y `adelanto` posteriores (menos al principio y al final de la historia).
+    """
+
+    funcion = None
+    calentamiento = 0
+    adelanto = 0
+    minimo_filas = 1
+
+    def __init__(self, **parametros):
+        self.parametros = parametros
+
+    def referencia(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Resultado de la funcion de algotrading.indicadores sobre toda la historia, con el indice de df."""
+
+        resultado = type(self).funcion(df, **self.parametros)
+        return (resultado.to_frame() if isinstance(resultado, pd.Series) else resultado).reindex(df.index)
+
+    def calcular(self, tramo: pd.DataFrame, desde: int, filas: int) -> pd.DataFrame:
+        raise NotImplementedError
+
+
+class _Ventana(_Indicador):
+    """Indicadores de ventana: la funcion del paquete sobre el tramo, que ya trae las barras de calentamiento."""
+
+    def calcular(self, tramo: pd.DataFrame, desde: int, filas: int) -> pd.DataFrame:
+        resultado = type(self).funcion(tramo, **self.parametros).iloc[desde:desde + filas]
+        return resultado.to_frame() if isinstance(resultado, pd.Series) else resultado
+
+
+class _SMA(_Ventana):
+    funcion = Media_Movil_Simple
+
+    def __init__(self, longitud: int = 21, columna: str = "Close"):
+        super().__init__(longitud=longitud, columna=columna)
+        self.calentamiento = longitud - 1
+
+
+class _CCI(_Ventana):
+    funcion = CCI
+
+    def __init__(self, longitud: int = 20, constante: float = 0.015):
+        super().__init__(longitud=longitud, constante=constante)
+        self.calentamiento = max(np.atleast_1d(longitud)) - 1
+
+
+class _Ichimoku(_Ventana):
+    funcion = Ichimoku_Cloud
+
+    def __init__(self, periodo_tenkan: int = 9, periodo_kijun: int = 26, offset: bool = False):
+        super().__init__(periodo_tenkan=periodo_tenkan, periodo_kijun=periodo_kijun, offset=offset)
+        # Senkou B usa 2 * kijun barras y se desplaza kijun hacia adelante; el Chikou toma el Close kijun barras despues
+        self.calentamiento = max(periodo_tenkan, 2 * periodo_kijun) - 1 + (0 if offset else periodo_kijun)
+        self.adelanto = periodo_kijun
+
+
+class _EMA(_Indicador):
+    funcion = Media_Movil_Exponencial
+
+    def __init__(self, longitud: int = 26, columna: str = "Close"):
+        super().__init__(longitud=longitud, columna=columna)
+        self.media = _EWMBloques(longitud)
+
+    def calcular(self, tramo: pd.DataFrame, desde: int, filas: int) -> pd.DataFrame:
+        precios = tramo[self.parametros["columna"]].to_numpy()[desde:desde + filas]
+        return pd.DataFrame({"EMA": self.media.calcular(precios)}, index=tramo.index[desde:desde + filas])
+
+
+class _RSI(_Indicador):
+    funcion = Indicador_Fuerza_Relativa
+
+    def __init__(self, longitud: int = 14, columna: str = "Close"):
+        super().__init__(longitud=longitud, columna=columna)
+        self.media_ganancia = _EWMBloques(longitud)
+        self.media_perdida = _EWMBloques(longitud)
+        self.anterior = np.nan
+
+    def calcular(self, tramo: pd.DataFrame, desde: int, filas: int) -> pd.DataFrame:
+        precios = tramo[self.parametros["columna"]].to_numpy()[desde:desde + filas]
+        Delta = np.diff(precios, prepend=self.anterior)
+        if filas:
+            self.anterior = precios[-1]
+
+        Ganancia, Perdida = _ganancias_perdidas(Delta)
+        RSI = _rsi_desde_medias(self.media_ganancia.calcular(Ganancia), self.media_perdida.calcular(Perdida))
+
+        return pd.DataFrame({"RSI": RSI}, index=tramo.index[desde:desde + filas])
+
+
+class _MACD(_Indicador):
+    funcion = MACD
+
+    def __init__(self, longitud_rapida: int = 12, longitud_lenta: int = 26, longitud_señal: int = 9,
+                 columna: str = "Close"):
+        super().__init__(longitud_rapida=longitud_rapida, longitud_lenta=longitud_lenta,
+                         longitud_señal=longitud_señal, columna=columna)
+        self.rapida = _EWMBloques(longitud_rapida)
+        self.lenta = _EWMBloques(longitud_lenta)
+        self.señal = _EWMBloques(longitud_señal)
+
+    def calcular(self, tramo: pd.DataFrame, desde: int, filas: int) -> pd.DataFrame:
+        precios = tramo[self.parametros["columna"]].to_numpy()[desde:desde + filas]
+        MACD_d = self.rapida.calcular(precios) - self.lenta.calcular(precios)
+        return pd.DataFrame({"MACD": MACD_d, "Señal": self.señal.calcular(MACD_d)},
+                            index=tramo.index[desde:desde + filas])
+
+
+def _continuar_wilder(valores: np.ndarray, longitud: int, anterior: float, suma: bool) -> np.ndarray:
+    """Suavizado_Wilder de un bloque a partir del ultimo valor suavizado del bloque anterior."""
+
+    relleno = np.concatenate([np.zeros(longitud), valores])
+    return Suavizado_Wilder(relleno, longitud, suma=suma, semilla=anterior)[longitud:]
+
+
+class _DMI(_Indicador):
+    funcion = Indice_Movimiento_Direccional
+
+    def __init__(self, suavizado_ADX: int = 14, longitud_DI: int = 14):
+        super().__init__(suavizado_ADX=suavizado_ADX, longitud_DI=longitud_DI)
+        # El primer bloque debe contener la semilla del ADX (media de las primeras suavizado_ADX barras del DX)
+        self.minimo_filas = suavizado_ADX + max(suavizado_ADX, longitud_DI)
+        self.ultima = None
+        self.suavizados = None
+
+    def calcular(self, tramo: pd.DataFrame, desde: int, filas: int) -> pd.DataFrame:
+        s, longitud_DI = self.parametros["suavizado_ADX"], self.parametros["longitud_DI"]
+        High, Low, Close = (tramo[c].to_numpy()[desde:desde + filas] for c in ("High", "Low", "Close"))
+        indice = tramo.index[desde:desde + filas]
+
+        # Mismas operaciones que Indice_Movimiento_Direccional, con la ultima barra del bloque anterior como previa
+        inicial = self.ultima is None
+        High_ant, Low_ant, Close_ant = (np.nan, np.nan, np.nan) if inicial else self.ultima
+        prev_clo = np.concatenate([[Close_ant], Close[:-1]])
+        TR = np.maximum(High - Low, np.maximum(np.abs(High - prev_clo), np.abs(prev_clo - Low)))
+        pre_PDM = High - np.concatenate([[High_ant], High[:-1]])
+        pre_MDM = np.concatenate([[Low_ant], Low[:-1]]) - Low
+        plus_DM = np.where((pre_PDM > pre_MDM) & (pre_PDM > 0), pre_PDM, 0.0)
+        minus_DM = np.where((pre_MDM > pre_PDM) & (pre_MDM > 0), pre_MDM, 0.0)
+        self.ultima = (High[-1], Low[-1], Close[-1])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if inicial:
+                # Como en la funcion, la primera barra no tiene movimientos y las sumas empiezan en la barra s
+                TRL, PDML, MDML = (Suavizado_Wilder(x[1:], s, suma=True)[s - 1:] for x in (TR, plus_DM, minus_DM))
+            else:
+                TRL, PDML, MDML = (_continuar_wilder(x, s, anterior, suma=True)
+                                   for x, anterior in zip((TR, plus_DM, minus_DM), self.suavizados[:3]))
+            PDI = PDML / TRL * 100
+            MDI = MDML / TRL * 100
+            DX = np.abs(PDI - MDI) / (PDI + MDI) * 100
+            if inicial:
+                ADX = Suavizado_Wilder(DX, longitud_DI, semilla=DX[:s].mean(axis=0))
+            else:
+                ADX = _continuar_wilder(DX, longitud_DI, self.suavizados[3], suma=False)
+        # Con menos de suavizado_ADX + 1 barras en toda la historia no hay sumas (la funcion devuelve un DataFrame vacio)
+        if len(ADX):
+            self.suavizados = (TRL[-1], PDML[-1], MDML[-1], ADX[-1])
+
+        faltantes = filas - len(ADX)
+        return pd.DataFrame({nombre: np.concatenate([np.full(faltantes, np.nan), valores])
+                             for nombre, valores in (("ADX", ADX), ("+DI", PDI), ("-DI", MDI))}, index=indice)
+
+
+class _PSAR(_Indicador):
+    funcion = Parabolic_SAR
+    minimo_filas = 3
+
+    def __init__(self, incremento: float = 0.02, max_paso: float = 0.20):
+        super().__init__(incremento=incremento, max_paso=max_paso)
+        self.estado = None
+        self.ultimas = None
+
+    def calcular(self, tramo: pd.DataFrame, desde: int, filas: int) -> pd.DataFrame:
+        High, Low, Close = (tramo[c].to_numpy()[desde:desde + filas] for c in ("High", "Low", "Close"))
+        inicial = self.estado is None
+
+        # Las dos ultimas barras del bloque anterior (con su PSAR en lugar del Close) preceden al bloque
+        if not inicial:
+            High_ant, Low_ant, psar_ant = self.ultimas
+            High, Low, Close = (np.concatenate([a, b]) for a, b in ((High_ant, High), (Low_ant, Low),
+                                                                      (psar_ant, Close)))
+        psar = np.empty(len(High))
+        alcista = np.zeros(len(High), dtype=bool)
+        reversion = np.zeros(len(High), dtype=bool)
+        alcista[:2] = True if inicial else False
+        self.estado = _psar_activo(High, Low, Close, self.parametros["incremento"], self.parametros["max_paso"],
+                                   psar, alcista, reversion, self.estado)
+        self.ultimas = (High[-2:], Low[-2:], psar[-2:])
+
+        calculado = np.arange(len(psar)) >= 2
+        if not inicial:
+            psar, alcista, reversion, calculado = psar[2:], alcista[2:], reversion[2:], calculado[2:]
+        return pd.DataFrame({"PSAR": psar, "UpTrend": np.where(alcista & calculado, psar, np.nan),
+                             "DownTrend": np.where(~alcista & calculado, psar, np.nan), "Reversion": reversion},
+                            index=tramo.index[desde:desde + filas])
+
+
+INDICADORES = {"SMA": _SMA, "EMA": _EMA, "RSI": _RSI, "MACD": _MACD, "DMI": _DMI, "CCI": _CCI,
+               "Ichimoku": _Ichimoku, "PSAR": _PSAR}
+
+
+def _crear(indicadores: Indicadores) -> List[_Indicador]:
+    if indicadores is None:
+        indicadores = list(INDICADORES)
+    if not isinstance(indicadores, Mapping):
+        indicadores = {nombre: {} for nombre in indicadores}
+    desconocidos = set(indicadores) - set(INDICADORES)
+    if desconocidos:
+        raise ValueError(f"Indicadores sin modo por bloques: {sorted(desconocidos)} (disponibles: {list(INDICADORES)})")
+    return [INDICADORES[nombre](**parametros) for nombre, parametros in indicadores.items()]
+
+
+# Ejecucion --------------------------------------------------------------------------------------------------------
+
+def calcular_por_bloques(barras: Union[pd.DataFrame, Mapping[str, np.ndarray]], indicadores: Indicadores = None,
+                         filas: int = FILAS_BLOQUE, zona_horaria: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Calcula los indicadores bloque a bloque y entrega un DataFrame por bloque.
+
+    param : pd.DataFrame | dict : barras : Barras de un activo: un DataFrame OHLC o las columnas como arreglos (por
+            ejemplo, los arreglos memory-mapped de cargar_arreglos, con la clave 'fecha' en nanosegundos UTC).
+    param : list | dict : indicadores : Nombres de INDICADORES, o nombre -> parametros de la funcion del paquete
+            (por ejemplo, {"SMA": {"longitud": 50}, "RSI": {}}). Por defecto, todos con sus parametros por defecto.
+    param : int : filas : Barras por bloque.
+    param : str : zona_horaria : Zona horaria de las fechas cuando `barras` son arreglos.
+
+    return : Iterator[pd.DataFrame] : Salidas de cada bloque (columnas con los nombres de las funciones del paquete:
+             MA, EMA, RSI, MACD, Señal, ADX, +DI, -DI, CCI, tenkan_sen, ..., PSAR, UpTrend, DownTrend, Reversion).
+             Concatenados, son el resultado de cada funcion sobre toda la historia.
+    """
+
+    calculadores = _crear(indicadores)
+    minimo = max(c.minimo_filas for c in calculadores)
+    if filas < minimo:
+        raise ValueError(f"Los bloques deben tener al menos {minimo} barras para estos indicadores")
+    calentamiento = max(c.calentamiento for c in calculadores)
+    adelanto = max(c.adelanto for c in calculadores)
+
+    if isinstance(barras, pd.DataFrame):
+        n = len(barras)
+        columnas = [c for c in COLUMNAS_PRECIOS if c in barras.columns]
+        arreglos = {c: barras[c].to_numpy() for c in columnas}
+    else:
+        n = len(barras["fecha"])
+        columnas = [c for c in COLUMNAS_PRECIOS if c in barras]
+        arreglos = barras
+
+    for inicio in range(0, n, filas):
+        fin = min(inicio + filas, n)
+        desde, hasta = max(inicio - calentamiento, 0), min(fin + adelanto, n)
+        indice = (barras.index[desde:hasta] if isinstance(barras, pd.DataFrame)
+                  else indice_fechas(barras["fecha"][desde:hasta], zona_horaria))
+        tramo = pd.DataFrame({c: np.asarray(arreglos[c][desde:hasta], dtype=float) for c in columnas}, index=indice)
+        yield pd.concat([c.calcular(tramo, inicio - desde, fin - inicio) for c in calculadores], axis=1)
+
+
+def indicadores_almacen(ticker: str, intervalo: str = "1m", indicadores: Indicadores = None,
+                        filas: int = FILAS_BLOQUE, inicio=None, fin=None,
+                        ruta: str = RUTA_ALMACEN) -> Iterator[pd.DataFrame]:
+    """
+    calcular_por_bloques sobre una particion del almacen: solo las barras de cada bloque (y su calentamiento) se leen
+    del disco, asi que la historia puede ser mayor que la memoria.
+    """
+
+    meta = leer_meta(ticker, intervalo, ruta)
+    if meta is None:
+        raise FileNotFoundError(f"No hay datos de {ticker} ({intervalo}) en el almacen {ruta}")
+    arreglos = cargar_arreglos(ticker, intervalo, inicio, fin, ruta)
+    return calcular_por_bloques(arreglos, indicadores, filas, meta["zona_horaria"])
+
+
+def guardar_indicadores(ticker: str, intervalo: str = "1m", indicadores: Indicadores = None,
+                        filas: int = FILAS_BLOQUE, ruta: str = RUTA_ALMACEN, destino: Optional[str] = None) -> str:
+    """
+    Calcula los indicadores por bloques y los escribe como una particion mas del almacen (un .npy por salida), que se
+    lee despues con cargar_barras(ticker, destino) o cargar_arreglos. Cada bloque se escribe en archivos
+    memory-mapped, sin reunir la historia completa en memoria.
+
+    param : str : destino : Intervalo de la particion de salida (por defecto, '<intervalo>_indicadores').
+
+    return : str : Carpeta de la particion escrita.
+    """
+
+    from numpy.lib.format import open_memmap
+
+    destino = destino or f"{intervalo}_indicadores"
+    meta = leer_meta(ticker, intervalo, ruta)
+    arreglos = indicadores_almacen(ticker, intervalo, indicadores, filas, ruta=ruta)
+    fechas = cargar_arreglos(ticker, intervalo, ruta=ruta)["fecha"]
+    n = len(fechas)
+
+    # Como en guardar_barras, se escribe una version nueva de los archivos que solo se hace visible con meta.json
+    carpeta = os.path.join(ruta, ticker, destino)
+    os.makedirs(carpeta, exist_ok=True)
+    anterior = _leer_meta(carpeta)
+    version = _version_siguiente(anterior)
+    salidas: Dict[str, np.ndarray] = {"fecha": open_memmap(_archivo_columna(carpeta, "fecha", version), mode="w+",
+                                                           dtype=np.int64, shape=(n,))}
+    salidas["fecha"][:] = fechas
+
+    escritas = 0
+    for bloque in arreglos:
+        if not escritas:
+            for columna in bloque.columns:
+                salidas[columna] = open_memmap(_archivo_columna(carpeta, columna, version), mode="w+",
+                                               dtype=bloque[columna].dtype, shape=(n,))
+        for columna in bloque.columns:
+            salidas[columna][escritas:escritas + len(bloque)] = bloque[columna].to_numpy()
+        escritas += len(bloque)
+
+    columnas = [c for c in salidas if c != "fecha"]
+    for nombre in list(salidas):
+        valores = salidas.pop(nombre)
+        valores.flush()
+        del valores
+
+    _confirmar_particion(carpeta, {"ticker": ticker, "intervalo": destino, "columnas": columnas,
+                                   "zona_horaria": meta["zona_horaria"], "filas": int(n), "dtype": "float64",
+                                   "version": version}, anterior)
+
+    return carpeta
+
+
+def verificar_bloques(df: pd.DataFrame, indicadores: Indicadores = None, filas: int = 10_000) -> pd.DataFrame:
+    """
+    Compara el calculo por bloques con la funcion de cada indicador sobre toda la historia en memoria.
+
+    param : pd.DataFrame : df : Barras OHLC de un activo.
+    param : int : filas : Barras por bloque (pequeño, para que haya muchas fronteras entre bloques).
+
+    return : pd.DataFrame : Por indicador y salida: barras_distintas (valores que no son identicos bit a bit, con NaN
+             igual a NaN) y error_relativo_max.
+    """
+
+    por_bloques = pd.concat(list(calcular_por_bloques(df, indicadores, filas)))
+    filas_reporte = []
+    for nombre, calculador in zip(INDICADORES if indicadores is None else indicadores, _crear(indicadores)):
+        referencia = calculador.referencia(df)
+        for salida in referencia.columns:
+            esperado = referencia[salida].to_numpy(dtype=float)
+            obtenido = por_bloques[salida].to_numpy(dtype=float)
+            distintas = ~((esperado == obtenido) | (np.isnan(esperado) & np.isnan(obtenido)))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                relativo = np.abs(obtenido - esperado) / np.abs(esperado)
+            filas_reporte.append({"indicador": nombre, "salida": salida, "barras_distintas": int(distintas.sum()),
+                                  "error_relativo_max": float(np.nanmax(np.where(distintas, relativo, 0.0),
+                                                                        initial=0.0))})
+    return pd.DataFrame(filas_reporte).set_index(["indicador", "salida"])
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Calcula indicadores por bloques sobre una particion del almacen.")
+    parser.add_argument("ticker", help="Ticker de la particion (por ejemplo, BTC-USD).")
+    parser.add_argument("--intervalo", default="1m", help="Intervalo de las barras.")
+    parser.add_argument("--indicadores", nargs="+", choices=list(INDICADORES), help="Indicadores (por defecto, todos).")
+    parser.add_argument("--filas", type=int, default=FILAS_BLOQUE, help="Barras por bloque.")
+    parser.add_argument("--ruta", default=RUTA_ALMACEN, help="Carpeta raiz del almacen.")
+    args = parser.parse_args(argumentos)
+
+    print(guardar_indicadores(args.ticker, args.intervalo, args.indicadores, args.filas, args.ruta))
+
+
+if __name__ == "__main__":
+    main()
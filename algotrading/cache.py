@@ -0,0 +1,379 @@
+"""
+Cache de resultados de indicadores direccionada por contenido.
+
+La clave de cada resultado es un hash (blake2b) de los datos de entrada (indice, columnas y valores) mas el nombre de
+la funcion y sus parametros normalizados (los arreglos y DataFrames entre ellos, tambien por contenido), asi que llamar
+dos veces a MACD(df) con los mismos datos, desde un dashboard o desde un backtest, calcula una sola vez. Los
+resultados viven en un LRU en memoria acotado en bytes; al desalojarse pasan, si se indica una carpeta, a un nivel en
+disco con un .npy por columna que se vuelve a leer con mmap.
+
+Cuando los datos nuevos solo añaden barras al final de unos datos ya cacheados, se reutiliza el prefijo guardado y
+solo se calcula la cola (con `calentamiento` barras previas para que las ventanas y medias arranquen bien):
+
+    cache = CacheIndicadores(capacidad_memoria=512 * 2**20, ruta_disco="datos/cache")
+    MACD = cache.memoizar(MACD, calentamiento=500)
+    Ichimoku_Cloud = cache.memoizar(Ichimoku_Cloud, calentamiento=78, revision=26)
+    cache.estadisticas()
+"""
+
+# Importar librerias
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+Resultado = Union[pd.DataFrame, pd.Series, np.ndarray]
+
+
+def _actualizar_hash(h: "hashlib.blake2b", datos) -> None:
+    """Añade al hash el contenido de un DataFrame, Serie, arreglo o valor simple."""
+
+    if isinstance(datos, pd.DataFrame):
+        h.update(b"DataFrame")
+        _actualizar_hash(h, datos.index)
+        h.update(repr(list(datos.columns)).encode())
+        for i in range(datos.shape[1]):
+            _actualizar_hash(h, datos.iloc[:, i].to_numpy())
+    elif isinstance(datos, pd.Series):
+        h.update(b"Series" + repr(datos.name).encode())
+        _actualizar_hash(h, datos.index)
+        _actualizar_hash(h, datos.to_numpy())
+    elif isinstance(datos, pd.Index):
+        h.update(str(datos.dtype).encode())
+        _actualizar_hash(h, datos.asi8 if isinstance(datos, pd.DatetimeIndex) else datos.to_numpy())
+    elif isinstance(datos, np.ndarray):
+        if datos.dtype == object:
+            h.update(pickle.dumps(datos.tolist()))
+        else:
+            h.update(str(datos.dtype).encode() + repr(datos.shape).encode())
+            h.update(np.ascontiguousarray(datos).view(np.uint8).ravel())
+    elif isinstance(datos, (list, tuple)):
+        # Los elementos se hashean por contenido: el repr de numpy resume los arreglos grandes con "..."
+        h.update(f"{type(datos).__name__}{len(datos)}".encode())
+        for valor in datos:
+            _actualizar_hash(h, valor)
+    elif isinstance(datos, dict):
+        h.update(f"dict{len(datos)}".encode())
+        for clave, valor in datos.items():
+            h.update(repr(clave).encode() + b"=")
+            _actualizar_hash(h, valor)
+    else:
+        h.update(repr(datos).encode() + b"|")
+
+
+def huella(datos) -> str:
+    """Hash hexadecimal del contenido de los datos (se usa como parte de la clave de la cache)."""
+
+    h = hashlib.blake2b(digest_size=16)
+    _actualizar_hash(h, datos)
+    return h.hexdigest()
+
+
+def _filas(datos) -> int:
+    return len(datos) if datos is not None else 0
+
+
+def _prefijo(datos, filas: int):
+    return datos.iloc[:filas] if isinstance(datos, (pd.DataFrame, pd.Series)) else datos[:filas]
+
+
+def _tamaño(resultado: Resultado) -> int:
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        return int(np.sum(resultado.memory_usage(index=True, deep=False)))
+    return int(getattr(resultado, "nbytes", 0))
+
+
+def _copiar(resultado: Resultado) -> Resultado:
+    """Los resultados se entregan como copia: un script que modifique su DataFrame no altera la cache."""
+
+    return resultado.copy() if hasattr(resultado, "copy") else resultado
+
+
+def _unir(prefijo: Resultado, cola: Resultado, filas_nuevas: int, revision: int) -> Resultado:
+    """Concatena el resultado cacheado, sin sus ultimas `revision` filas, con la parte nueva de la cola."""
+
+    prefijo = prefijo[:max(len(prefijo) - revision, 0)]
+    if isinstance(prefijo, (pd.DataFrame, pd.Series)):
+        if len(prefijo):
+            cola = cola[cola.index > prefijo.index[-1]]
+        return pd.concat([prefijo, cola])
+    return np.concatenate([prefijo, cola[max(len(cola) - filas_nuevas - revision, 0):]])
+
+
+class _Entrada:
+    __slots__ = ("resultado", "firma", "filas", "huella_entrada", "tamaño")
+
+    def __init__(self, resultado: Resultado, firma: str, filas: int, huella_entrada: str):
+        self.resultado = resultado
+        self.firma = firma
+        self.filas = filas
+        self.huella_entrada = huella_entrada
+        self.tamaño = _tamaño(resultado)
+
+
+class CacheIndicadores:
+    """
+    Cache LRU de resultados de indicadores con nivel opcional en disco.
+
+    param : int : capacidad_memoria : Bytes maximos de resultados en memoria (por defecto, 256 MiB).
+    param : str : ruta_disco : Carpeta del nivel en disco (opcional). Los resultados desalojados de memoria se guardan
+            ahi y se leen con mmap.
+    param : int : capacidad_disco : Bytes maximos en disco (por defecto, 4 GiB); se borran los menos usados.
+    """
+
+    def __init__(self, capacidad_memoria: int = 256 * 2 ** 20, ruta_disco: Optional[str] = None,
+                 capacidad_disco: int = 4 * 2 ** 30):
+        self.capacidad_memoria = capacidad_memoria
+        self.ruta_disco = ruta_disco
+        self.capacidad_disco = capacidad_disco
+        self._memoria: "OrderedDict[str, _Entrada]" = OrderedDict()
+        self._bytes_memoria = 0
+        # firma (funcion + parametros) -> claves de las entradas, para buscar prefijos cuando se añaden barras
+        self._por_firma: Dict[str, Dict[str, tuple]] = {}
+        self._lock = threading.RLock()
+        self._contadores = dict(aciertos=0, aciertos_disco=0, aciertos_prefijo=0, fallos=0, desalojos=0)
+        if ruta_disco:
+            os.makedirs(ruta_disco, exist_ok=True)
+            self._cargar_indice_disco()
+
+    # Estadisticas ---------------------------------------------------------------------------------------------------
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Aciertos (memoria, disco y por prefijo), fallos, desalojos, tasa de acierto y ocupacion."""
+
+        with self._lock:
+            datos = dict(self._contadores)
+            consultas = datos["aciertos"] + datos["aciertos_disco"] + datos["aciertos_prefijo"] + datos["fallos"]
+            datos["tasa_acierto"] = (consultas - datos["fallos"]) / consultas if consultas else float("nan")
+            datos["entradas_memoria"] = len(self._memoria)
+            datos["bytes_memoria"] = self._bytes_memoria
+            return datos
+
+    def limpiar(self, disco: bool = False) -> None:
+        """Vacia la memoria (y el nivel en disco si disco=True)."""
+
+        with self._lock:
+            self._memoria.clear()
+            self._bytes_memoria = 0
+            self._por_firma.clear()
+            if disco and self.ruta_disco and os.path.isdir(self.ruta_disco):
+                shutil.rmtree(self.ruta_disco)
+                os.makedirs(self.ruta_disco, exist_ok=True)
+            elif self.ruta_disco:
+                self._cargar_indice_disco()
+
+    def volcar_disco(self) -> None:
+        """Escribe en el nivel en disco las entradas que solo estan en memoria, para reutilizarlas en otra sesion."""
+
+        if not self.ruta_disco:
+            raise ValueError("La cache no tiene nivel en disco (ruta_disco)")
+        with self._lock:
+            for clave, entrada in self._memoria.items():
+                self._escribir_disco(clave, entrada)
+
+    # Nivel en memoria -----------------------------------------------------------------------------------------------
+
+    def _guardar(self, clave: str, entrada: _Entrada) -> None:
+        if clave in self._memoria:
+            self._bytes_memoria -= self._memoria.pop(clave).tamaño
+        self._memoria[clave] = entrada
+        self._bytes_memoria += entrada.tamaño
+        self._por_firma.setdefault(entrada.firma, {})[clave] = (entrada.filas, entrada.huella_entrada)
+
+        while self._bytes_memoria > self.capacidad_memoria and len(self._memoria) > 1:
+            antigua, desalojada = self._memoria.popitem(last=False)
+            self._bytes_memoria -= desalojada.tamaño
+            self._contadores["desalojos"] += 1
+            if self.ruta_disco:
+                self._escribir_disco(antigua, desalojada)
+            else:
+                self._por_firma.get(desalojada.firma, {}).pop(antigua, None)
+
+    def _obtener(self, clave: str, contar: bool = True) -> Optional[_Entrada]:
+        if clave in self._memoria:
+            self._memoria.move_to_end(clave)
+            self._contadores["aciertos"] += contar
+            return self._memoria[clave]
+        entrada = self._leer_disco(clave)
+        if entrada is not None:
+            self._contadores["aciertos_disco"] += contar
+            self._guardar(clave, entrada)
+        return entrada
+
+    # Nivel en disco -------------------------------------------------------------------------------------------------
+
+    def _carpeta(self, clave: str) -> str:
+        return os.path.join(self.ruta_disco, clave)
+
+    def _cargar_indice_disco(self) -> None:
+        for clave in os.listdir(self.ruta_disco):
+            meta = os.path.join(self._carpeta(clave), "meta.pkl")
+            if os.path.exists(meta):
+                with open(meta, "rb") as f:
+                    datos = pickle.load(f)
+                self._por_firma.setdefault(datos["firma"], {})[clave] = (datos["filas"], datos["huella_entrada"])
+
+    def _escribir_disco(self, clave: str, entrada: _Entrada) -> None:
+        carpeta = self._carpeta(clave)
+        if os.path.exists(os.path.join(carpeta, "meta.pkl")):
+            return
+        temporal = carpeta + ".tmp"
+        os.makedirs(temporal, exist_ok=True)
+
+        resultado = entrada.resultado
+        meta = {"firma": entrada.firma, "filas": entrada.filas, "huella_entrada": entrada.huella_entrada}
+        if isinstance(resultado, pd.DataFrame):
+            meta.update(tipo="DataFrame", indice=resultado.index, columnas=resultado.columns)
+            columnas = [resultado.iloc[:, i].to_numpy() for i in range(resultado.shape[1])]
+        elif isinstance(resultado, pd.Series):
+            meta.update(tipo="Series", indice=resultado.index, nombre=resultado.name)
+            columnas = [resultado.to_numpy()]
+        else:
+            meta.update(tipo="ndarray")
+            columnas = [np.asarray(resultado)]
+        for i, valores in enumerate(columnas):
+            np.save(os.path.join(temporal, f"{i}.npy"), valores, allow_pickle=False)
+        meta["numero_columnas"] = len(columnas)
+        with open(os.path.join(temporal, "meta.pkl"), "wb") as f:
+            pickle.dump(meta, f)
+        if os.path.exists(carpeta):
+            shutil.rmtree(carpeta)
+        os.replace(temporal, carpeta)
+
+        self._recortar_disco()
+
+    def _leer_disco(self, clave: str) -> Optional[_Entrada]:
+        if not self.ruta_disco:
+            return None
+        carpeta = self._carpeta(clave)
+        meta_archivo = os.path.join(carpeta, "meta.pkl")
+        if not os.path.exists(meta_archivo):
+            return None
+        with open(meta_archivo, "rb") as f:
+            meta = pickle.load(f)
+        os.utime(meta_archivo)
+        columnas = [np.load(os.path.join(carpeta, f"{i}.npy"), mmap_mode="r") for i in range(meta["numero_columnas"])]
+
+        if meta["tipo"] == "DataFrame":
+            resultado = pd.DataFrame({i: c for i, c in enumerate(columnas)}, index=meta["indice"])
+            resultado.columns = meta["columnas"]
+        elif meta["tipo"] == "Series":
+            resultado = pd.Series(columnas[0], index=meta["indice"], name=meta["nombre"])
+        else:
+            resultado = columnas[0]
+        return _Entrada(resultado, meta["firma"], meta["filas"], meta["huella_entrada"])
+
+    def _recortar_disco(self) -> None:
+        """Borra las entradas de disco usadas hace mas tiempo hasta quedar por debajo de capacidad_disco."""
+
+        entradas = []
+        for clave in os.listdir(self.ruta_disco):
+            carpeta = self._carpeta(clave)
+            meta = os.path.join(carpeta, "meta.pkl")
+            if os.path.exists(meta):
+                tamaño = sum(os.path.getsize(os.path.join(carpeta, a)) for a in os.listdir(carpeta))
+                entradas.append((os.path.getmtime(meta), tamaño, clave))
+        total = sum(t for _, t, _ in entradas)
+        for _, tamaño, clave in sorted(entradas):
+            if total <= self.capacidad_disco:
+                break
+            if clave not in self._memoria:
+                shutil.rmtree(self._carpeta(clave), ignore_errors=True)
+                for claves in self._por_firma.values():
+                    claves.pop(clave, None)
+                total -= tamaño
+
+    # Memoizacion ----------------------------------------------------------------------------------------------------
+
+    def _buscar_prefijo(self, firma: str, datos, filas: int) -> Optional[tuple]:
+        """Entrada cacheada mas larga cuyos datos de entrada son un prefijo de los datos actuales."""
+
+        candidatos = sorted(((f, h, clave) for clave, (f, h) in self._por_firma.get(firma, {}).items() if f < filas),
+                            reverse=True)
+        for filas_prefijo, huella_prefijo, clave in candidatos:
+            if filas_prefijo > 0 and huella(_prefijo(datos, filas_prefijo)) == huella_prefijo:
+                entrada = self._obtener(clave, contar=False)
+                if entrada is not None:
+                    return filas_prefijo, entrada
+        return None
+
+    def memoizar(self, funcion: Callable, calentamiento: Optional[int] = None, revision: int = 0) -> Callable:
+        """
+        Envuelve un indicador cuyo primer argumento son los datos (DataFrame, Serie o arreglo) para cachear sus
+        resultados.
+
+        param : Callable : funcion : Indicador a envolver (por ejemplo, MACD o Ichimoku_Cloud).
+        param : int : calentamiento : Barras previas con las que recalcular la cola cuando solo se añaden barras.
+                Con None no se reutilizan prefijos. Para indicadores de ventana fija basta la ventana mas larga; para
+                medias exponenciales el error relativo de la cola es del orden de (1 - alpha)^calentamiento.
+        param : int : revision : Ultimas filas del resultado cacheado que cambian al llegar barras nuevas y se
+                recalculan (por ejemplo, periodo_kijun en Ichimoku_Cloud, cuya chikou_span mira hacia adelante).
+
+        return : Callable : Funcion con la misma firma que consulta la cache antes de calcular.
+        """
+
+        firma_funcion = inspect.signature(funcion)
+        nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            argumentos = firma_funcion.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            valores = list(argumentos.arguments.items())
+            datos = valores[0][1]
+            firma = huella((nombre, valores[1:]))
+            huella_datos = huella(datos)
+            clave = hashlib.blake2b(f"{firma}|{huella_datos}".encode(), digest_size=16).hexdigest()
+            filas = _filas(datos)
+
+            with self._lock:
+                entrada = self._obtener(clave)
+                if entrada is not None:
+                    return _copiar(entrada.resultado)
+                prefijo = self._buscar_prefijo(firma, datos, filas) if calentamiento is not None else None
+
+            if prefijo is not None:
+                filas_prefijo, entrada = prefijo
+                inicio = max(0, filas_prefijo - revision - calentamiento)
+                argumentos.arguments[valores[0][0]] = datos.iloc[inicio:] if hasattr(datos, "iloc") else datos[inicio:]
+                cola = funcion(*argumentos.args, **argumentos.kwargs)
+                resultado = _unir(entrada.resultado, cola, filas - filas_prefijo, revision)
+                contador = "aciertos_prefijo"
+            else:
+                resultado = funcion(*args, **kwargs)
+                contador = "fallos"
+
+            with self._lock:
+                self._contadores[contador] += 1
+                self._guardar(clave, _Entrada(resultado, firma, filas, huella_datos))
+            return _copiar(resultado)
+
+        envoltura.cache = self
+        return envoltura
+
+
+# Cache compartida por defecto
+cache_indicadores = CacheIndicadores()
+
+
+def memoizar(funcion: Optional[Callable] = None, calentamiento: Optional[int] = None, revision: int = 0,
+             cache: Optional[CacheIndicadores] = None) -> Callable:
+    """
+    Decorador que cachea un indicador en `cache` (por defecto, la cache compartida cache_indicadores):
+
+        @memoizar(calentamiento=300)
+        def MACD(df, ...): ...
+    """
+
+    def decorador(f: Callable) -> Callable:
+        return (cache or cache_indicadores).memoizar(f, calentamiento, revision)
+
+    return decorador(funcion) if funcion is not None else decorador
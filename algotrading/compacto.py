@@ -0,0 +1,437 @@
+"""
+Modo compacto (float32) de los indicadores, para universos grandes de barras de 1 minuto donde el limite es la memoria.
+
+Los indicadores de algotrading.indicadores trabajan con Series de pandas en float64 y construyen DataFrames
+intermedios (pd.concat en Cruce_Medias_Moviles, MACD e Ichimoku_Cloud). Aqui los mismos calculos trabajan sobre
+arreglos float32 (tiempo x activos) y escriben en arreglos de salida que se pueden pasar ya asignados (`out`), sin
+copias de los precios ni tablas intermedias:
+
+    barras = barras_compactas(df)                       # OHLCV en float32, la mitad de memoria que el DataFrame
+    macd, señal = macd_compacto(barras["Close"])
+    sma = np.empty_like(barras["Close"])
+    sma_compacta(barras["Close"], 21, out=sma)
+
+Los calculos se hacen por bloques de filas: cada bloque se pasa a float64, se calcula y se escribe en la salida
+float32, y el estado (la suma y los NaN de la ventana de la SMA, las medias exponenciales) pasa de un bloque al
+siguiente. La memoria temporal queda acotada por CELDAS_BLOQUE celdas, sea cual sea la longitud de la historia. Las
+barras del almacen se pueden guardar directamente en float32 (guardar_barras(..., dtype=np.float32)) y pasarse a estas
+funciones sin convertirlas.
+
+Cota de error frente a los indicadores float64. Con u = 2^-24 (EPSILON32, el error relativo de redondear a float32) y
+P el mayor precio de la columna, el error absoluto de cada barra es como maximo:
+
+    SMA, EMA y lineas del Cruce de Medias Moviles : 2 u P    (precios redondeados a float32 y salida redondeada)
+    MACD y Señal                                  : 3 u P
+    Tenkan, Kijun, Senkou A y B de Ichimoku       : 2 u P    (Chikou: u P)
+    RSI (en puntos)                               : 200 u P / (G + L) + 100 u, con G + L la suma de las medias de
+                                                    ganancias y perdidas (el movimiento medio por barra). En barras
+                                                    diarias es del orden de 1e-4 puntos; en barras de 1 minuto de un
+                                                    activo poco volatil puede acercarse a 0.1 puntos.
+
+Las señales discretas pueden diferir donde el calculo float64 queda dentro de esa cota: el Cruce de Medias solo cuando
+|SMA_Rapida - SMA_Lenta| <= 4 u P en la barra o en la anterior, y el SAR Parabolico (una maquina de estados sin cota
+general) cuando una reversion se decide por menos que el error de redondeo; desde ahi ambas trayectorias siguen
+caminos distintos hasta volver a coincidir. verificar_precision mide los errores reales frente a estas cotas y
+reporte_memoria compara la memoria pico de cada indicador en ambos modos.
+"""
+
+# Importar librerias
+import tracemalloc
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from algotrading.bloques import _EWMBloques
+from algotrading.indicadores import (MACD, Cruce_Medias_Moviles, Ichimoku_Cloud, Indicador_Fuerza_Relativa,
+                                     Media_Movil_Exponencial, Media_Movil_Simple, Parabolic_SAR,
+                                     SAR_Parabolico_Multiactivo)
+from algotrading.indicadores.momentum import _ganancias_perdidas, _rsi_desde_medias
+
+# Error relativo de redondear un float64 a float32
+EPSILON32 = 2.0 ** -24
+
+# Celdas (filas x activos) de cada bloque de calculo: acota la memoria temporal en float64 (512 KiB por arreglo)
+CELDAS_BLOQUE = 1 << 16
+
+COLUMNAS_OHLCV = ("Open", "High", "Low", "Close", "Volume")
+
+
+def barras_compactas(df: pd.DataFrame, columnas: Iterable[str] = COLUMNAS_OHLCV) -> Dict[str, np.ndarray]:
+    """
+    Convierte barras OHLCV (un activo o una descarga de varios tickers) a arreglos float32 contiguos.
+
+    param : pd.DataFrame : df : Barras con columnas Open, High, ... (MultiIndex (campo, ticker) con varios tickers).
+    param : Iterable[str] : columnas : Campos a convertir (los que no esten en df se omiten).
+
+    return : dict : Campo -> arreglo float32 (barras x activos). Volume en float32 es exacto hasta 2^24 (unos 16,7
+             millones) por barra; por encima conserva 7 cifras significativas.
+    """
+
+    presentes = set(df.columns.get_level_values(0)) if isinstance(df.columns, pd.MultiIndex) else set(df.columns)
+    return {c: np.ascontiguousarray(df[c].to_numpy(dtype=np.float32)).reshape(len(df), -1)
+            for c in columnas if c in presentes}
+
+
+# Utilidades de bloques --------------------------------------------------------------------------------------------
+
+def _matriz(valores: np.ndarray) -> np.ndarray:
+    """Vista 2-D (tiempo x activos) de un arreglo 1-D o 2-D, sin copiarlo."""
+
+    valores = np.asarray(valores)
+    return valores[:, None] if valores.ndim == 1 else valores
+
+
+def _salida(out: Optional[np.ndarray], forma: tuple, dtype=np.float32) -> np.ndarray:
+    if out is None:
+        return np.empty(forma, dtype=dtype)
+    if out.shape != forma:
+        raise ValueError(f"El arreglo de salida tiene forma {out.shape} y se esperaba {forma}")
+    return out
+
+
+def _bloques(barras: int, activos: int):
+    """Rangos [inicio, fin) de filas de cada bloque de calculo."""
+
+    filas = max(CELDAS_BLOQUE // max(activos, 1), 1)
+    for inicio in range(0, barras, filas):
+        yield inicio, min(inicio + filas, barras)
+
+
+# Indicadores ------------------------------------------------------------------------------------------------------
+
+def sma_compacta(valores: np.ndarray, longitud: int = 21, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Media Movil Simple en float32, equivalente a Media_Movil_Simple (rolling(longitud, min_periods=longitud)).
+
+    param : np.ndarray : valores : Precios (barras o barras x activos), idealmente float32.
+    param : int : longitud : Ventana de la media.
+    param : np.ndarray : out : Arreglo de salida con la forma de valores (opcional; por defecto, uno nuevo float32).
+
+    return : np.ndarray : out con la media (NaN en las ventanas incompletas o con NaN).
+    """
+
+    X = _matriz(valores)
+    out = _salida(out, np.shape(valores))
+    Y = _matriz(out)
+    barras, activos = X.shape
+
+    # Estado entre bloques: suma y cantidad de NaN de la ventana que termina en la fila anterior al bloque
+    suma = np.zeros(activos)
+    faltantes = np.zeros(activos, dtype=np.int32)
+    for inicio, fin in _bloques(barras, activos):
+        # Cada fila suma el valor que entra en la ventana y resta el que sale (el de `longitud` filas antes)
+        ventana = X[inicio:fin].astype(np.float64)
+        nulos = np.isnan(ventana)
+        ventana[nulos] = 0.0
+        conteo = nulos.astype(np.int32)
+        salida = max(inicio, longitud)
+        if salida < fin:
+            salientes = X[salida - longitud:fin - longitud].astype(np.float64)
+            nulos = np.isnan(salientes)
+            salientes[nulos] = 0.0
+            ventana[salida - inicio:] -= salientes
+            conteo[salida - inicio:] -= nulos
+        np.cumsum(ventana, axis=0, out=ventana)
+        ventana += suma
+        np.cumsum(conteo, axis=0, out=conteo)
+        conteo += faltantes
+        suma, faltantes = ventana[-1].copy(), conteo[-1].copy()
+
+        ventana /= longitud
+        ventana[conteo > 0] = np.nan
+        ventana[:max(longitud - 1 - inicio, 0)] = np.nan
+        Y[inicio:fin] = ventana
+
+    return out
+
+
+def ema_compacta(valores: np.ndarray, longitud: int = 26, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Media Movil Exponencial en float32, equivalente a Media_Movil_Exponencial (ewm(span, adjust=False)), con la
+    media exponencial por bloques de algotrading.bloques.
+
+    return : np.ndarray : out con la media (NaN durante las primeras `longitud` - 1 observaciones).
+    """
+
+    X = _matriz(valores)
+    out = _salida(out, np.shape(valores))
+    Y = _matriz(out)
+    media = _EWMBloques(longitud, X.shape[1])
+    for inicio, fin in _bloques(*X.shape):
+        Y[inicio:fin] = media.calcular(X[inicio:fin])
+    return out
+
+
+def cruce_medias_compacto(valores: np.ndarray, longitud_rapida: int = 9, longitud_lenta: int = 26,
+                          out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+                          ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cruce de Medias Moviles en float32, equivalente a Cruce_Medias_Moviles.
+
+    param : np.ndarray : valores : Precios (barras o barras x activos).
+    param : tuple : out : (SMA_Rapida, SMA_Lenta, Cruce) ya asignados (opcional; Cruce puede ser int8).
+
+    return : Tuple[np.ndarray, np.ndarray, np.ndarray] : SMA_Rapida y SMA_Lenta (float32) y Cruce (int8: 1 cruce
+             alcista, -1 cruce bajista, 0 sin cruce).
+    """
+
+    forma = np.shape(valores)
+    rapida, lenta, cruce = out if out is not None else (None, None, None)
+    rapida = sma_compacta(valores, longitud_rapida, out=rapida)
+    lenta = sma_compacta(valores, longitud_lenta, out=lenta)
+    cruce = _salida(cruce, forma, dtype=np.int8)
+
+    R, L, C = _matriz(rapida), _matriz(lenta), _matriz(cruce)
+    C[:1] = 0
+    for inicio, fin in _bloques(*R.shape):
+        desde = max(inicio, 1)
+        r, l = R[desde:fin], L[desde:fin]
+        r_previa, l_previa = R[desde - 1:fin - 1], L[desde - 1:fin - 1]
+        C[desde:fin] = ((r > l) & (l_previa > r_previa)).astype(np.int8) - ((r < l) & (l_previa < r_previa))
+
+    return rapida, lenta, cruce
+
+
+def macd_compacto(valores: np.ndarray, longitud_rapida: int = 12, longitud_lenta: int = 26, longitud_señal: int = 9,
+                  out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    MACD en float32, equivalente a MACD: las dos EMA, la linea MACD y la Señal se calculan en una sola pasada por
+    bloques, sin guardar las EMA completas.
+
+    param : tuple : out : (MACD, Señal) ya asignados (opcional).
+
+    return : Tuple[np.ndarray, np.ndarray] : Linea MACD y linea de Señal.
+    """
+
+    X = _matriz(valores)
+    forma = np.shape(valores)
+    linea, señal = out if out is not None else (None, None)
+    linea, señal = _salida(linea, forma), _salida(señal, forma)
+    M, S = _matriz(linea), _matriz(señal)
+
+    activos = X.shape[1]
+    rapida, lenta = _EWMBloques(longitud_rapida, activos), _EWMBloques(longitud_lenta, activos)
+    media_señal = _EWMBloques(longitud_señal, activos)
+    for inicio, fin in _bloques(*X.shape):
+        bloque = X[inicio:fin].astype(np.float64)
+        diferencia = rapida.calcular(bloque) - lenta.calcular(bloque)
+        M[inicio:fin] = diferencia
+        S[inicio:fin] = media_señal.calcular(diferencia)
+
+    return linea, señal
+
+
+def rsi_compacto(valores: np.ndarray, longitud: int = 14, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Indice de Fuerza Relativa en float32, equivalente a Indicador_Fuerza_Relativa.
+
+    return : np.ndarray : out con el RSI (NaN durante el calentamiento).
+    """
+
+    X = _matriz(valores)
+    out = _salida(out, np.shape(valores))
+    Y = _matriz(out)
+    activos = X.shape[1]
+    ganancias, perdidas = _EWMBloques(longitud, activos), _EWMBloques(longitud, activos)
+
+    for inicio, fin in _bloques(*X.shape):
+        desde = max(inicio - 1, 0)
+        bloque = X[desde:fin].astype(np.float64)
+        delta = np.diff(bloque, axis=0) if inicio else np.vstack([np.full((1, activos), np.nan),
+                                                                  np.diff(bloque, axis=0)])
+        Ganancia, Perdida = _ganancias_perdidas(delta)
+        Y[inicio:fin] = _rsi_desde_medias(ganancias.calcular(Ganancia), perdidas.calcular(Perdida))
+
+    return out
+
+
+def _extremo_movil(X: np.ndarray, inicio: int, fin: int, longitud: int, operacion: Callable) -> np.ndarray:
+    """Maximo o minimo de las ventanas de `longitud` barras que terminan en las filas [inicio, fin) (NaN si faltan)."""
+
+    salida = np.full((fin - inicio, X.shape[1]), np.nan, dtype=X.dtype)
+    primera = max(inicio, longitud - 1)
+    if primera < fin:
+        ventanas = sliding_window_view(X[primera - longitud + 1:fin], longitud, axis=0)
+        salida[primera - inicio:] = operacion(ventanas, axis=-1)
+    return salida
+
+
+def ichimoku_compacto(High: np.ndarray, Low: np.ndarray, Close: np.ndarray, periodo_tenkan: int = 9,
+                      periodo_kijun: int = 26, out: Optional[Tuple[np.ndarray, ...]] = None) -> Tuple[np.ndarray, ...]:
+    """
+    Nube Ichimoku en float32, equivalente a Ichimoku_Cloud(df, periodo_tenkan, periodo_kijun) (Senkou desplazados).
+    Los minimos y maximos de cada bloque se toman de ventanas sobre los precios float32, sin copiarlos.
+
+    param : tuple : out : (tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chinkou_span) ya asignados (opcional).
+
+    return : tuple : Las cinco lineas, en ese orden.
+    """
+
+    H, L, C = _matriz(High), _matriz(Low), _matriz(Close)
+    forma = np.shape(High)
+    salidas = tuple(_salida(o, forma) for o in (out if out is not None else (None,) * 5))
+    tenkan, kijun, span_a, span_b, chikou = (_matriz(s) for s in salidas)
+    barras = H.shape[0]
+    senkou = periodo_kijun * 2
+
+    # Los Senkou se escriben desplazados periodo_kijun barras hacia adelante
+    span_a[:periodo_kijun] = np.nan
+    span_b[:periodo_kijun] = np.nan
+    for inicio, fin in _bloques(*H.shape):
+        lineas = []
+        for longitud in (periodo_tenkan, periodo_kijun, senkou):
+            maximo = _extremo_movil(H, inicio, fin, longitud, np.max).astype(np.float64)
+            lineas.append((maximo + _extremo_movil(L, inicio, fin, longitud, np.min)) / 2)
+        tenkan[inicio:fin], kijun[inicio:fin] = lineas[0], lineas[1]
+        destino = slice(inicio + periodo_kijun, min(fin + periodo_kijun, barras))
+        filas = destino.stop - destino.start
+        if filas > 0:
+            span_a[destino] = ((lineas[0] + lineas[1]) / 2)[:filas]
+            span_b[destino] = lineas[2][:filas]
+
+    # Chikou: el cierre de periodo_kijun barras despues
+    chikou[:barras - periodo_kijun] = C[periodo_kijun:]
+    chikou[max(barras - periodo_kijun, 0):] = np.nan
+    return salidas
+
+
+def psar_compacto(High: np.ndarray, Low: np.ndarray, Close: np.ndarray, incremento: float = 0.02,
+                  max_paso: float = 0.20, out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    SAR Parabolico en float32: SAR_Parabolico_Multiactivo sobre los precios float32 (sin convertirlos a float64) con
+    el PSAR en un buffer float32.
+
+    param : tuple : out : (psar float32, alcista bool, reversion bool) ya asignados (opcional).
+
+    return : Tuple[np.ndarray, np.ndarray, np.ndarray] : psar, alcista y reversion.
+    """
+
+    psar, alcista, reversion = out if out is not None else (None, None, None)
+    psar = _salida(psar, np.shape(High))
+    return SAR_Parabolico_Multiactivo(High, Low, Close, incremento, max_paso, psar, alcista, reversion)
+
+
+# Precision y memoria ----------------------------------------------------------------------------------------------
+
+def _columnas(resultado, nombre: Optional[str], barras: int) -> np.ndarray:
+    """Salida de un indicador float64 (Serie, DataFrame o panel) como matriz barras x activos."""
+
+    datos = resultado if nombre is None else resultado[nombre]
+    return np.asarray(datos, dtype=np.float64).reshape(barras, -1)
+
+
+def _rsi_movimiento(Close: pd.DataFrame, longitud: int) -> np.ndarray:
+    """G + L del RSI float64: suma de las medias de ganancias y perdidas (para la cota de error del RSI)."""
+
+    ganancia, perdida = _ganancias_perdidas(Close.diff().to_numpy(dtype=float).reshape(len(Close), -1))
+    ganancia, perdida = (pd.DataFrame(x).ewm(span=longitud, min_periods=longitud, adjust=False).mean().to_numpy()
+                         for x in (ganancia, perdida))
+    return ganancia + perdida
+
+
+# Indicador -> (calculo float64 sobre df, calculo compacto sobre barras_compactas(df), nombres de las salidas)
+_COMPARACIONES: Dict[str, Tuple[Callable, Callable, Tuple[str, ...]]] = {
+    "SMA": (lambda df: Media_Movil_Simple(df, 21), lambda b: (sma_compacta(b["Close"], 21),), ("SMA",)),
+    "EMA": (lambda df: Media_Movil_Exponencial(df, 26), lambda b: (ema_compacta(b["Close"], 26),), ("EMA",)),
+    "Cruce_Medias": (Cruce_Medias_Moviles, lambda b: cruce_medias_compacto(b["Close"]),
+                     ("SMA_Rapida", "SMA_Lenta", "Cruce")),
+    "MACD": (MACD, lambda b: macd_compacto(b["Close"]), ("MACD", "Señal")),
+    "RSI": (Indicador_Fuerza_Relativa, lambda b: (rsi_compacto(b["Close"]),), ("RSI",)),
+    "Ichimoku": (Ichimoku_Cloud, lambda b: ichimoku_compacto(b["High"], b["Low"], b["Close"]),
+                 ("tenkan_sen", "kijun_sen", "senkou_span_a", "senkou_span_b", "chinkou_span")),
+    "PSAR": (Parabolic_SAR, lambda b: psar_compacto(b["High"], b["Low"], b["Close"]), ("PSAR", "alcista")),
+}
+
+# Cota de error de cada salida en multiplos de u P (None: sin cota general, ver el docstring del modulo)
+_COTAS = {"SMA": 2, "EMA": 2, "SMA_Rapida": 2, "SMA_Lenta": 2, "MACD": 3, "Señal": 3, "tenkan_sen": 2,
+          "kijun_sen": 2, "senkou_span_a": 2, "senkou_span_b": 2, "chinkou_span": 1}
+
+
+def verificar_precision(df: pd.DataFrame, indicadores: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Compara cada indicador compacto con su version float64 sobre los mismos datos.
+
+    param : pd.DataFrame : df : Barras OHLCV (un activo o varios tickers), sin NaN despues del inicio de cada activo.
+    param : Iterable[str] : indicadores : SMA, EMA, Cruce_Medias, MACD, RSI, Ichimoku y PSAR (por defecto, todos).
+
+    return : pd.DataFrame : Por indicador y salida: error_max (absoluto), error_relativo_max (error / P),
+             cota_relativa (la cota del docstring en multiplos de P), dentro_cota y barras_distintas (señales
+             discretas que no coinciden: Cruce y tendencia del PSAR).
+    """
+
+    barras = barras_compactas(df)
+    n = len(df)
+    precio = np.nanmax(np.abs(barras["High"] if "High" in barras else barras["Close"]), axis=0).astype(np.float64)
+    filas = []
+    for nombre in (list(_COMPARACIONES) if indicadores is None else list(indicadores)):
+        completo, compacto, salidas = _COMPARACIONES[nombre]
+        referencia, resultado = completo(df), compacto(barras)
+        for salida, valores in zip(salidas, resultado):
+            if salida == "alcista":
+                calculado = ~np.isnan(_columnas(referencia, "PSAR", n))
+                esperado = ~np.isnan(_columnas(referencia, "UpTrend", n))
+                distintas = int(((esperado != _matriz(valores)) & calculado)[2:].sum())
+                filas.append({"indicador": nombre, "salida": salida, "barras_distintas": distintas})
+                continue
+            esperado = _columnas(referencia, salida if len(salidas) > 1 or nombre == "PSAR" else None, n)
+            obtenido = _matriz(valores).astype(np.float64)
+            if salida == "Cruce":
+                filas.append({"indicador": nombre, "salida": salida,
+                              "barras_distintas": int((esperado != obtenido).sum())})
+                continue
+            error = np.abs(obtenido - esperado)
+            if ((np.isnan(error)) != (np.isnan(obtenido) & np.isnan(esperado))).any():
+                raise AssertionError(f"{nombre} {salida}: los NaN del modo compacto no coinciden con los de float64")
+            relativo = np.nanmax(error / precio, initial=0.0)
+            if salida == "RSI":
+                with np.errstate(divide="ignore"):
+                    cota = 200 * EPSILON32 * precio / _rsi_movimiento(df["Close"], 14).reshape(n, -1) + 100 * EPSILON32
+                dentro = bool(np.all(np.nan_to_num(error) <= np.nan_to_num(cota, nan=np.inf)))
+                cota_relativa = np.nan
+            elif salida in _COTAS:
+                cota_relativa = _COTAS[salida] * EPSILON32
+                dentro = bool(relativo <= cota_relativa)
+            else:
+                cota_relativa, dentro = np.nan, np.nan
+            filas.append({"indicador": nombre, "salida": salida, "error_max": np.nanmax(error, initial=0.0),
+                          "error_relativo_max": relativo, "cota_relativa": cota_relativa, "dentro_cota": dentro})
+    return pd.DataFrame(filas).set_index(["indicador", "salida"])
+
+
+def _memoria_pico(funcion: Callable, *argumentos) -> float:
+    """Memoria pico (MiB) asignada durante una llamada, incluido el resultado."""
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        resultado = funcion(*argumentos)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return pico / 2 ** 20
+
+
+def reporte_memoria(df: pd.DataFrame, indicadores: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Memoria de las barras y memoria pico de cada indicador en float64 (algotrading.indicadores sobre df) y en modo
+    compacto (sobre barras_compactas(df)), medida con tracemalloc.
+
+    return : pd.DataFrame : Por indicador: float64_mb, compacto_mb y ahorro (fraccion de memoria ahorrada). La fila
+             "barras" compara el DataFrame de entrada con sus arreglos float32.
+    """
+
+    barras = barras_compactas(df)
+    filas = [{"indicador": "barras", "float64_mb": df.memory_usage(deep=True).sum() / 2 ** 20,
+              "compacto_mb": sum(a.nbytes for a in barras.values()) / 2 ** 20}]
+    for nombre in (list(_COMPARACIONES) if indicadores is None else list(indicadores)):
+        completo, compacto, _ = _COMPARACIONES[nombre]
+        filas.append({"indicador": nombre, "float64_mb": _memoria_pico(completo, df),
+                      "compacto_mb": _memoria_pico(compacto, barras)})
+
+    reporte = pd.DataFrame(filas).set_index("indicador")
+    reporte["ahorro"] = 1 - reporte["compacto_mb"] / reporte["float64_mb"]
+    return reporte
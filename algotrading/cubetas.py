@@ -0,0 +1,49 @@
+"""
+Valores extremos validos de cubetas de filas consecutivas.
+
+reduccion (velas para graficar) y remuestreo (barras de 15m, 1h, 1d, ...) agrupan las filas de un arreglo tiempo x
+columnas en cubetas que empiezan en `inicios` y toman de cada una el primer o el ultimo valor no NaN (Open y Close de la
+vela, o el ultimo valor de un indicador). Ambos se calculan sin bucles por cubeta: la posicion del ultimo valor valido
+hasta cada fila es un maximo acumulado de los indices de fila (el primero, un minimo acumulado desde el final).
+"""
+
+# Importar librerias
+import numpy as np
+
+
+def primero_valido(valores: np.ndarray, inicios: np.ndarray) -> np.ndarray:
+    """
+    Primer valor no NaN de cada cubeta.
+
+    param : np.ndarray : valores : Arreglo 2-D (filas x columnas).
+    param : np.ndarray : inicios : Fila donde empieza cada cubeta (creciente, el primero 0).
+
+    return : np.ndarray : Arreglo cubetas x columnas (NaN si la cubeta no tiene ningun valor en esa columna).
+    """
+
+    barras = valores.shape[0]
+    filas = np.arange(barras)[:, None]
+    primero = np.minimum.accumulate(np.where(np.isnan(valores), barras, filas)[::-1], axis=0)[::-1]
+    posicion = primero[inicios]
+    fines = np.append(inicios[1:], barras)
+    columnas = np.arange(valores.shape[1])
+    return np.where(posicion < fines[:, None], valores[np.minimum(posicion, barras - 1), columnas], np.nan)
+
+
+def ultimo_valido(valores: np.ndarray, inicios: np.ndarray) -> np.ndarray:
+    """
+    Ultimo valor no NaN de cada cubeta.
+
+    param : np.ndarray : valores : Arreglo 2-D (filas x columnas).
+    param : np.ndarray : inicios : Fila donde empieza cada cubeta (creciente, el primero 0).
+
+    return : np.ndarray : Arreglo cubetas x columnas (NaN si la cubeta no tiene ningun valor en esa columna).
+    """
+
+    barras = valores.shape[0]
+    filas = np.arange(barras)[:, None]
+    ultimo = np.maximum.accumulate(np.where(np.isnan(valores), -1, filas), axis=0)
+    fines = np.append(inicios[1:], barras) - 1
+    posicion = ultimo[fines]
+    columnas = np.arange(valores.shape[1])
+    return np.where(posicion >= inicios[:, None], valores[np.maximum(posicion, 0), columnas], np.nan)
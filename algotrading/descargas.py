@@ -0,0 +1,191 @@
+"""
+Capa de acceso a datos con cache incremental delante de yf.download.
+
+Para cada particion (ticker, intervalo) del almacen se registran los tramos [inicio, fin) que ya se descargaron
+(archivo tramos.json junto a las columnas). Al pedir un rango solo se descargan los huecos que faltan (normalmente la
+cabeza o la cola), de modo que repetir la ejecucion de un script no hace ninguna peticion de red.
+
+El origen de los datos es intercambiable: cualquier objeto con la interfaz ProveedorDatos sirve, por ejemplo
+ProveedorMemoria para trabajar sin conexion con datos locales.
+
+El almacen guarda los precios negociados con las columnas Dividends y Stock Splits; descargar devuelve por defecto los
+precios ajustados por splits y dividendos (algotrading.ajustes), de modo que una accion corporativa nueva solo
+actualiza los factores de las barras anteriores y no obliga a volver a descargar la historia.
+"""
+
+# Importar librerias
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from algotrading.ajustes import cargar_ajustadas, deshacer_splits
+from algotrading.almacen import RUTA_ALMACEN, Fecha, anexar_barras, cargar_barras, leer_meta
+
+Tramo = Tuple[int, int]
+
+
+class ProveedorDatos(ABC):
+    """Interfaz de un proveedor de barras OHLCV."""
+
+    @abstractmethod
+    def descargar(self, ticker: str, inicio: pd.Timestamp, fin: pd.Timestamp, intervalo: str) -> pd.DataFrame:
+        """Devuelve las barras de ticker en [inicio, fin) con columnas Open, High, Low, Close y Volume."""
+
+
+class ProveedorYahoo(ProveedorDatos):
+    """
+    Proveedor basado en Yahoo Finance (yfinance se importa solo al descargar). Usa Ticker.history en lugar de
+    yf.download porque este ultimo comparte estado global entre llamadas y no es seguro con varios hilos.
+
+    Devuelve los precios negociados (sin ajustar) con las columnas Dividends y Stock Splits: Yahoo Finance entrega
+    los precios ajustados por los splits conocidos al momento de la descarga, asi que se deshacen con la historia
+    completa de splits para que los tramos descargados en distintos momentos sean coherentes.
+    """
+
+    def descargar(self, ticker: str, inicio: pd.Timestamp, fin: pd.Timestamp, intervalo: str) -> pd.DataFrame:
+        import yfinance as yf
+
+        accion = yf.Ticker(ticker)
+        df = accion.history(start=inicio, end=fin, interval=intervalo, auto_adjust=False)
+        return deshacer_splits(df, accion.splits)
+
+
+class ProveedorMemoria(ProveedorDatos):
+    """
+    Proveedor local que sirve barras desde DataFrames en memoria, sin red. Cuenta las peticiones recibidas para poder
+    comprobar el comportamiento de la cache.
+    """
+
+    def __init__(self, datos: Dict[str, pd.DataFrame]):
+        self.datos = datos
+        self.peticiones: List[Tuple[str, pd.Timestamp, pd.Timestamp, str]] = []
+
+    def descargar(self, ticker: str, inicio: pd.Timestamp, fin: pd.Timestamp, intervalo: str) -> pd.DataFrame:
+        self.peticiones.append((ticker, inicio, fin, intervalo))
+        df = self.datos[ticker]
+        indice = df.index if df.index.tz is not None else df.index.tz_localize("UTC")
+        return df[(indice >= inicio) & (indice < fin)]
+
+
+# Proveedor usado cuando no se indica otro
+proveedor_por_defecto: ProveedorDatos = ProveedorYahoo()
+
+
+def _archivo_tramos(ticker: str, intervalo: str, ruta: str) -> str:
+    return os.path.join(ruta, ticker, intervalo, "tramos.json")
+
+
+def leer_tramos(ticker: str, intervalo: str, ruta: str = RUTA_ALMACEN) -> List[Tramo]:
+    """Tramos [inicio, fin) ya descargados para la particion, en nanosegundos UTC."""
+
+    archivo = _archivo_tramos(ticker, intervalo, ruta)
+    if not os.path.exists(archivo) or leer_meta(ticker, intervalo, ruta) is None:
+        return []
+    with open(archivo, encoding="utf-8") as f:
+        return [tuple(t) for t in json.load(f)]
+
+
+def _guardar_tramos(tramos: List[Tramo], ticker: str, intervalo: str, ruta: str) -> None:
+    archivo = _archivo_tramos(ticker, intervalo, ruta)
+    temporal = archivo + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump([list(t) for t in tramos], f)
+    os.replace(temporal, archivo)
+
+
+def unir_tramos(tramos: List[Tramo]) -> List[Tramo]:
+    """Une tramos solapados o contiguos."""
+
+    unidos: List[List[int]] = []
+    for inicio, fin in sorted(tramos):
+        if unidos and inicio <= unidos[-1][1]:
+            unidos[-1][1] = max(unidos[-1][1], fin)
+        else:
+            unidos.append([inicio, fin])
+    return [tuple(t) for t in unidos]
+
+
+def tramos_faltantes(inicio: int, fin: int, tramos: List[Tramo]) -> List[Tramo]:
+    """Partes de [inicio, fin) que no estan cubiertas por los tramos guardados."""
+
+    faltantes = []
+    cursor = inicio
+    for t_inicio, t_fin in unir_tramos(tramos):
+        if t_fin <= cursor:
+            continue
+        if t_inicio >= fin:
+            break
+        if t_inicio > cursor:
+            faltantes.append((cursor, t_inicio))
+        cursor = max(cursor, t_fin)
+    if cursor < fin:
+        faltantes.append((cursor, fin))
+    return faltantes
+
+
+def duracion_intervalo(intervalo: str) -> pd.Timedelta:
+    """Duracion de una barra para los intervalos de yfinance ('1m', '15m', '1h', '1d', '1wk', '1mo', ...)."""
+
+    if intervalo.endswith("wk"):
+        return pd.Timedelta(weeks=int(intervalo[:-2]))
+    if intervalo.endswith("mo"):
+        return pd.Timedelta(days=31 * int(intervalo[:-2]))
+    return pd.Timedelta(intervalo.replace("m", "min") if intervalo.endswith("m") else intervalo)
+
+
+def _instante_utc(fecha: Fecha) -> pd.Timestamp:
+    fecha = pd.Timestamp(fecha)
+    return fecha.tz_localize("UTC") if fecha.tzinfo is None else fecha.tz_convert("UTC")
+
+
+def descargar(ticker: str, inicio: Fecha = None, fin: Fecha = None, intervalo: str = "1d",
+              proveedor: Optional[ProveedorDatos] = None, ruta: str = RUTA_ALMACEN,
+              ajustar: bool = True) -> pd.DataFrame:
+    """
+    Devuelve las barras de un ticker como yf.download(..., multi_level_index=False), pero leyendo del almacen local y
+    descargando del proveedor solo los tramos del rango que aun no se tienen.
+
+    param : str : ticker : Ticker del activo.
+    param : str | pd.Timestamp : inicio : Primera fecha (por defecto, un mes antes de fin). Las fechas sin zona
+            horaria se interpretan en UTC.
+    param : str | pd.Timestamp : fin : Fecha final, excluida (por defecto, ahora).
+    param : str : intervalo : Intervalo de las barras (por defecto, '1d').
+    param : ProveedorDatos : proveedor : Origen de los datos (por defecto, Yahoo Finance).
+    param : str : ruta : Carpeta raiz del almacen (por defecto, datos/ohlcv).
+    param : bool : ajustar : Ajustar los precios por splits y dividendos si la particion tiene las columnas
+            Dividends y Stock Splits (por defecto). Falso para los precios negociados.
+
+    return : pd.DataFrame : Barras OHLCV del rango pedido.
+    """
+
+    proveedor = proveedor_por_defecto if proveedor is None else proveedor
+    ahora = pd.Timestamp.now(tz="UTC")
+    fin = ahora if fin is None else _instante_utc(fin)
+    inicio = fin - pd.DateOffset(months=1) if inicio is None else _instante_utc(inicio)
+
+    # La ultima barra puede no haber cerrado: lo posterior a este instante no se marca como descargado y se vuelve a
+    # pedir en la proxima ejecucion
+    cerrado = (ahora - duracion_intervalo(intervalo)).value
+
+    tramos = leer_tramos(ticker, intervalo, ruta)
+    for hueco_inicio, hueco_fin in tramos_faltantes(inicio.value, fin.value, tramos):
+        if hueco_inicio >= ahora.value:
+            continue
+        desde = pd.Timestamp(hueco_inicio, tz="UTC")
+        hasta = pd.Timestamp(hueco_fin, tz="UTC")
+        anexar_barras(proveedor.descargar(ticker, desde, hasta, intervalo), ticker, intervalo, ruta)
+
+        if min(hueco_fin, cerrado) > hueco_inicio:
+            tramos.append((hueco_inicio, min(hueco_fin, cerrado)))
+            _guardar_tramos(unir_tramos(tramos), ticker, intervalo, ruta)
+
+    meta = leer_meta(ticker, intervalo, ruta)
+    if meta is None:
+        return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+
+    if ajustar and ("Dividends" in meta["columnas"] or "Stock Splits" in meta["columnas"]):
+        return cargar_ajustadas(ticker, intervalo, inicio=inicio, fin=fin, ruta=ruta)
+    return cargar_barras(ticker, intervalo, inicio=inicio, fin=fin, ruta=ruta)
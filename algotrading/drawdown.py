@@ -0,0 +1,214 @@
+"""
+Analisis de drawdowns (maximas perdidas) para una o muchas series de rendimientos a la vez.
+
+Generaliza max_drawdown de "05- Metricas de Rendimiento.py": en lugar de una Serie y solo el peor episodio, procesa una
+matriz (barras x series), por ejemplo las estrategias de un backtest o los tickers de un universo, y devuelve todos los
+episodios de drawdown (pico, valle, recuperacion y duraciones), el tiempo bajo el agua y la maxima perdida movil sobre
+una ventana. Todo se calcula con acumulados de NumPy a lo largo del tiempo, en O(n) por serie.
+"""
+
+# Importar librerias
+from typing import NamedTuple, Union
+
+import numpy as np
+import pandas as pd
+
+Rendimientos = Union[pd.Series, pd.DataFrame, np.ndarray]
+
+
+class ResultadoDrawdown(NamedTuple):
+    """
+    Resultado de analizar_drawdowns. Las matrices tienen la forma de los rendimientos (barras x series).
+
+    capital : Capital acumulado (1 + rendimientos).cumprod().
+    drawdown : Caida relativa desde el maximo acumulado (0 en los maximos, positiva bajo el agua).
+    bajo_agua : Barras transcurridas desde el ultimo maximo (0 en los maximos).
+    episodios : pd.DataFrame : Un episodio por fila: serie, pico, valle, recuperacion (NaT si no se recupero),
+                profundidad, barras_hasta_valle, duracion (barras bajo el agua) y recuperado.
+    """
+
+    capital: Rendimientos
+    drawdown: Rendimientos
+    bajo_agua: Rendimientos
+    episodios: pd.DataFrame
+
+    def resumen(self) -> pd.DataFrame:
+        """
+        Metricas por serie para ordenar por riesgo: maxima_perdida, fecha_pico y fecha_valle del peor episodio,
+        numero de episodios, duracion_maxima (barras bajo el agua), fraccion_bajo_agua y bajo_agua_actual.
+        """
+
+        drawdown = np.asarray(self.drawdown, dtype=float)
+        bajo_agua = np.asarray(self.bajo_agua)
+        drawdown = drawdown.reshape(drawdown.shape[0], -1)
+        bajo_agua = bajo_agua.reshape(bajo_agua.shape[0], -1)
+        series = _nombres(self.drawdown, drawdown.shape[1])
+
+        episodios = self.episodios
+        posicion = pd.Index(series).get_indexer(episodios["serie"])
+        peor = pd.DataFrame({"posicion": posicion, "profundidad": episodios["profundidad"].to_numpy()})
+        peor = peor.sort_values(["posicion", "profundidad"], ascending=[True, False], kind="stable")
+        peor = peor[~peor["posicion"].duplicated()]
+
+        fecha_pico = episodios["pico"].iloc[peor.index].set_axis(peor["posicion"]).reindex(range(len(series)))
+        fecha_valle = episodios["valle"].iloc[peor.index].set_axis(peor["posicion"]).reindex(range(len(series)))
+
+        return pd.DataFrame({"maxima_perdida": drawdown.max(axis=0, initial=0.0),
+                             "fecha_pico": fecha_pico.to_numpy(),
+                             "fecha_valle": fecha_valle.to_numpy(),
+                             "episodios": np.bincount(posicion, minlength=len(series)),
+                             "duracion_maxima": bajo_agua.max(axis=0, initial=0),
+                             "fraccion_bajo_agua": (drawdown > 0).mean(axis=0),
+                             "bajo_agua_actual": bajo_agua[-1] if bajo_agua.shape[0] else 0},
+                            index=pd.Index(series, name="serie"))
+
+
+def _nombres(datos: Rendimientos, columnas: int) -> list:
+    if isinstance(datos, pd.DataFrame):
+        return list(datos.columns)
+    if isinstance(datos, pd.Series):
+        return [datos.name if datos.name is not None else 0]
+    return list(range(columnas))
+
+
+def _como_entrada(valores: np.ndarray, rendimientos: Rendimientos) -> Rendimientos:
+    if isinstance(rendimientos, pd.DataFrame):
+        return pd.DataFrame(valores, index=rendimientos.index, columns=rendimientos.columns)
+    if isinstance(rendimientos, pd.Series):
+        return pd.Series(valores[:, 0], index=rendimientos.index, name=rendimientos.name)
+    return valores.reshape(np.shape(rendimientos))
+
+
+def _matriz(rendimientos: Rendimientos) -> np.ndarray:
+    """Rendimientos como matriz (barras x series); los NaN cuentan como rendimiento 0."""
+
+    valores = np.asarray(rendimientos, dtype=float)
+    return np.nan_to_num(valores.reshape(valores.shape[0], -1), nan=0.0)
+
+
+def _episodios(drawdown: np.ndarray, indice: pd.Index, series: list) -> pd.DataFrame:
+    """Extrae todos los episodios (tramos con drawdown > 0) de todas las series sin recorrerlas en Python."""
+
+    barras, columnas = drawdown.shape
+
+    # Una fila por serie con un 0 a cada lado, para que ningun episodio cruce de una serie a otra
+    relleno = np.zeros((columnas, barras + 2))
+    relleno[:, 1:-1] = drawdown.T
+    plano = relleno.ravel()
+    bajo = plano > 0
+    cambio = np.diff(bajo.astype(np.int8))
+    inicios = np.flatnonzero(cambio == 1) + 1
+    fines = np.flatnonzero(cambio == -1) + 1
+
+    serie = inicios // (barras + 2)
+    barra_inicio = inicios % (barras + 2) - 1
+    barra_fin = fines % (barras + 2) - 1
+    recuperado = barra_fin < barras
+
+    # Valle: primera barra con la caida maxima de cada episodio
+    if len(inicios):
+        profundidad = np.maximum.reduceat(plano, inicios)
+        posiciones = np.flatnonzero(bajo)
+        episodio = np.searchsorted(inicios, posiciones, side="right") - 1
+        candidatos = plano[posiciones] == profundidad[episodio]
+        _, primero = np.unique(episodio[candidatos], return_index=True)
+        barra_valle = posiciones[candidatos][primero] % (barras + 2) - 1
+    else:
+        profundidad = np.zeros(0)
+        barra_valle = np.zeros(0, dtype=np.int64)
+
+    # El pico es la ultima barra en maximos antes de entrar bajo el agua (la barra 0 nunca esta bajo el agua)
+    barra_pico = barra_inicio - 1
+    recuperacion = pd.Series(indice[np.minimum(barra_fin, barras - 1)]).where(recuperado)
+
+    return pd.DataFrame({"serie": np.asarray(series, dtype=object)[serie] if len(serie) else [],
+                         "pico": indice[barra_pico], "valle": indice[barra_valle],
+                         "recuperacion": recuperacion.to_numpy(),
+                         "profundidad": profundidad, "barras_hasta_valle": barra_valle - barra_pico,
+                         "duracion": barra_fin - barra_inicio, "recuperado": recuperado})
+
+
+def analizar_drawdowns(rendimientos: Rendimientos) -> ResultadoDrawdown:
+    """
+    Calcula capital, drawdown, tiempo bajo el agua y todos los episodios de drawdown de una o muchas series.
+
+    param : pd.Series | pd.DataFrame | np.ndarray : rendimientos : Rendimientos simples con el tiempo en el primer eje
+            (una columna por estrategia o ticker).
+
+    return : ResultadoDrawdown : Matrices con el mismo formato que la entrada y la tabla de episodios.
+    """
+
+    valores = _matriz(rendimientos)
+    barras, columnas = valores.shape
+    indice = rendimientos.index if isinstance(rendimientos, (pd.Series, pd.DataFrame)) else pd.RangeIndex(barras)
+
+    capital = np.cumprod(1 + valores, axis=0)
+    maximo_acumulado = np.maximum.accumulate(capital, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.nan_to_num((maximo_acumulado - capital) / maximo_acumulado, nan=0.0)
+
+    # Barras desde el ultimo maximo: distancia a la ultima barra con drawdown 0
+    filas = np.arange(barras)[:, None]
+    ultimo_maximo = np.maximum.accumulate(np.where(drawdown == 0, filas, 0), axis=0)
+    bajo_agua = filas - ultimo_maximo
+
+    episodios = _episodios(drawdown, indice, _nombres(rendimientos, columnas))
+
+    return ResultadoDrawdown(_como_entrada(capital, rendimientos), _como_entrada(drawdown, rendimientos),
+                             _como_entrada(bajo_agua, rendimientos), episodios)
+
+
+def max_drawdown_movil(rendimientos: Rendimientos, ventana: int) -> Rendimientos:
+    """
+    Maxima perdida dentro de una ventana movil: para cada barra t, la mayor caida del capital entre dos barras
+    i <= j de las ultimas `ventana` barras, 1 - capital[j] / capital[i]. Las primeras ventana - 1 barras valen NaN.
+
+    Usa el esquema por bloques de van Herk / Gil-Werman: con bloques del tamaño de la ventana, cada ventana es un sufijo
+    de un bloque mas un prefijo del siguiente, y la maxima perdida de la ventana se obtiene combinando acumulados
+    hacia adelante y hacia atras de cada bloque. El costo es O(n) por serie, independiente del tamaño de la ventana.
+
+    param : pd.Series | pd.DataFrame | np.ndarray : rendimientos : Rendimientos simples (barras x series).
+    param : int : ventana : Numero de barras de la ventana.
+
+    return : Misma forma y tipo que la entrada.
+    """
+
+    if ventana < 1:
+        raise ValueError("La ventana debe ser de al menos una barra")
+
+    valores = _matriz(rendimientos)
+    barras, columnas = valores.shape
+    capital = np.cumprod(1 + valores, axis=0)
+
+    # Completar el ultimo bloque repitiendo la ultima barra (esos valores nunca forman parte de una ventana)
+    bloques = -(-barras // ventana)
+    relleno = np.empty((bloques * ventana, columnas))
+    relleno[:barras] = capital
+    relleno[barras:] = capital[-1] if barras else 0.0
+    C = relleno.reshape(bloques, ventana, columnas)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Prefijos de cada bloque: minimo y maxima perdida desde el inicio del bloque
+        minimo_prefijo = np.minimum.accumulate(C, axis=1)
+        perdida_prefijo = np.maximum.accumulate(1 - C / np.maximum.accumulate(C, axis=1), axis=1)
+
+        # Sufijos de cada bloque: maximo y maxima perdida hasta el final del bloque
+        invertido = C[:, ::-1]
+        maximo_sufijo = np.maximum.accumulate(invertido, axis=1)[:, ::-1]
+        minimo_sufijo = np.minimum.accumulate(invertido, axis=1)[:, ::-1]
+        perdida_desde = 1 - minimo_sufijo / C
+        perdida_sufijo = np.maximum.accumulate(perdida_desde[:, ::-1], axis=1)[:, ::-1]
+
+        minimo_prefijo, perdida_prefijo, maximo_sufijo, perdida_sufijo = (
+            a.reshape(-1, columnas) for a in (minimo_prefijo, perdida_prefijo, maximo_sufijo, perdida_sufijo))
+
+        fin = np.arange(ventana - 1, barras)
+        inicio = fin - ventana + 1
+        cruzada = 1 - minimo_prefijo[fin] / maximo_sufijo[inicio]
+        combinada = np.maximum(np.maximum(perdida_sufijo[inicio], perdida_prefijo[fin]), cruzada)
+        alineada = (inicio % ventana == 0)[:, None]
+
+    resultado = np.full((barras, columnas), np.nan)
+    resultado[ventana - 1:] = np.where(alineada, perdida_sufijo[inicio], combinada)
+
+    return _como_entrada(resultado, rendimientos)
@@ -0,0 +1,171 @@
+"""
+Extraccion vectorizada de eventos de señal.
+
+Convierte las salidas de los indicadores en una tabla compacta de eventos (fecha, ticker, indicador, evento, valor)
+comparando cada barra con la anterior sobre arreglos completos, sin recorrer filas con .iloc. Los indicadores en modo
+panel (una columna por ticker) se procesan todos a la vez, asi que un universo completo se resuelve en una llamada:
+
+    eventos = extraer_eventos({"macd": macd, "tsi": tsi, "dmi": dmi, "psar": psar, "rsi": rsi, "cci": cci})
+    eventos[eventos["evento"] == "cruce_alcista"]
+
+Tipos de evento:
+
+    cruce_alcista / cruce_bajista          : una linea cruza a otra (MACD y Señal, TSI y Senal, +DI y -DI, medias).
+    entra_sobrecompra / sale_sobrecompra   : el valor supera el nivel superior (RSI 70, CCI +100) o vuelve a bajar.
+    entra_sobreventa / sale_sobreventa     : el valor cae por debajo del nivel inferior (RSI 30, CCI -100) o lo recupera.
+    giro_alcista / giro_bajista            : cambio de tendencia del SAR Parabolico.
+"""
+
+# Importar librerias
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Datos = Union[pd.Series, pd.DataFrame]
+
+COLUMNAS = ["fecha", "ticker", "indicador", "evento", "valor"]
+
+
+def _matriz(datos: Datos) -> Tuple[np.ndarray, pd.Index, list]:
+    """Valores (barras x tickers), indice de fechas y tickers (None para una Serie de un solo activo)."""
+
+    if isinstance(datos, pd.Series):
+        return datos.to_numpy(dtype=float)[:, None], datos.index, [None]
+    return datos.to_numpy(dtype=float), datos.index, list(datos.columns)
+
+
+def _tabla(mascaras: Dict[str, np.ndarray], valor: np.ndarray, indice: pd.Index, tickers: list,
+           indicador: str) -> pd.DataFrame:
+    """Construye la tabla de eventos a partir de una mascara (barras x tickers) por tipo de evento."""
+
+    filas, columnas, tipos = [], [], []
+    for evento, mascara in mascaras.items():
+        f, c = np.nonzero(mascara)
+        filas.append(f)
+        columnas.append(c)
+        tipos.append(np.full(len(f), evento, dtype=object))
+    filas, columnas, tipos = np.concatenate(filas), np.concatenate(columnas), np.concatenate(tipos)
+    orden = np.lexsort((columnas, filas))
+    filas, columnas, tipos = filas[orden], columnas[orden], tipos[orden]
+
+    return pd.DataFrame({"fecha": indice[filas], "ticker": np.asarray(tickers, dtype=object)[columnas],
+                         "indicador": indicador, "evento": tipos, "valor": valor[filas, columnas]})
+
+
+def cruces(a: Datos, b: Datos, indicador: str = "cruce") -> pd.DataFrame:
+    """
+    Cruces de la linea `a` sobre la linea `b`, con la misma regla que Cruce_Medias_Moviles: cruce alcista en t si
+    a > b en t y b > a en t - 1 (y bajista al reves). Las barras con NaN no generan eventos.
+
+    param : pd.Series | pd.DataFrame : a : Linea rapida (por ejemplo, MACD); en modo panel, una columna por ticker.
+    param : pd.Series | pd.DataFrame : b : Linea de referencia (por ejemplo, Señal), con la misma forma que a.
+    param : str : indicador : Nombre del indicador en la tabla.
+
+    return : pd.DataFrame : Eventos cruce_alcista / cruce_bajista con el valor de `a` en la barra del cruce.
+    """
+
+    A, indice, tickers = _matriz(a)
+    B = _matriz(b)[0]
+    previo_a = np.vstack([np.full((1, A.shape[1]), np.nan), A[:-1]])
+    previo_b = np.vstack([np.full((1, B.shape[1]), np.nan), B[:-1]])
+
+    return _tabla({"cruce_alcista": (A > B) & (previo_b > previo_a),
+                   "cruce_bajista": (A < B) & (previo_b < previo_a)}, A, indice, tickers, indicador)
+
+
+def cruces_nivel(datos: Datos, superior: float, inferior: Optional[float] = None,
+                 indicador: str = "nivel") -> pd.DataFrame:
+    """
+    Entradas y salidas de las zonas de sobrecompra (por encima de `superior`) y sobreventa (por debajo de `inferior`).
+
+    param : pd.Series | pd.DataFrame : datos : Oscilador (RSI, CCI, ...); en modo panel, una columna por ticker.
+    param : float : superior : Nivel de sobrecompra (por ejemplo, 70 en el RSI o 100 en el CCI).
+    param : float : inferior : Nivel de sobreventa (por defecto, -superior).
+    param : str : indicador : Nombre del indicador en la tabla.
+
+    return : pd.DataFrame : Eventos entra_/sale_sobrecompra y entra_/sale_sobreventa con el valor del oscilador.
+    """
+
+    inferior = -superior if inferior is None else inferior
+    X, indice, tickers = _matriz(datos)
+    previo = np.vstack([np.full((1, X.shape[1]), np.nan), X[:-1]])
+
+    return _tabla({"entra_sobrecompra": (X > superior) & (previo <= superior),
+                   "sale_sobrecompra": (X <= superior) & (previo > superior),
+                   "entra_sobreventa": (X < inferior) & (previo >= inferior),
+                   "sale_sobreventa": (X >= inferior) & (previo < inferior)}, X, indice, tickers, indicador)
+
+
+def cambios_tendencia(alcista: Datos, valor: Datos, indicador: str = "tendencia") -> pd.DataFrame:
+    """
+    Giros de tendencia: barras en que `alcista` cambia respecto a la barra anterior. Solo cuentan las barras en que
+    `valor` esta definido (asi el calentamiento del indicador no genera giros).
+
+    param : pd.Series | pd.DataFrame : alcista : Verdadero en las barras de tendencia alcista.
+    param : pd.Series | pd.DataFrame : valor : Valor del indicador (por ejemplo, la columna PSAR).
+    param : str : indicador : Nombre del indicador en la tabla.
+
+    return : pd.DataFrame : Eventos giro_alcista / giro_bajista con el valor del indicador.
+    """
+
+    V, indice, tickers = _matriz(valor)
+    estado = np.where(np.isnan(V), np.nan, _matriz(alcista)[0])
+    previo = np.vstack([np.full((1, V.shape[1]), np.nan), estado[:-1]])
+
+    return _tabla({"giro_alcista": (estado == 1) & (previo == 0),
+                   "giro_bajista": (estado == 0) & (previo == 1)}, V, indice, tickers, indicador)
+
+
+def _lineas(datos: Datos, prefijo: str, nombre: str) -> List[Tuple[str, Datos]]:
+    """Separa las lineas de un indicador con varias ventanas (por ejemplo, CCI_14 y CCI_20)."""
+
+    if isinstance(datos, pd.DataFrame):
+        nombres = datos.columns.get_level_values(0) if isinstance(datos.columns, pd.MultiIndex) else datos.columns
+        if all(str(n).startswith(prefijo) for n in nombres):
+            return [(str(n), datos[n]) for n in dict.fromkeys(nombres)]
+    return [(nombre, datos)]
+
+
+# Regla de eventos de cada indicador: recibe la salida del indicador (como la devuelven los scripts o el grafo, en
+# modo de un activo o panel) y el nombre con el que aparece en la tabla
+REGLAS: Dict[str, Callable[[Datos, str], pd.DataFrame]] = {
+    "cruce_medias": lambda d, nombre: cruces(d["SMA_Rapida"], d["SMA_Lenta"], nombre),
+    "macd": lambda d, nombre: cruces(d["MACD"], d["Señal"], nombre),
+    "tsi": lambda d, nombre: cruces(d["TSI"], d["Senal"], nombre),
+    "dmi": lambda d, nombre: cruces(d["+DI"], d["-DI"], nombre),
+    "ichimoku": lambda d, nombre: cruces(d["tenkan_sen"], d["kijun_sen"], nombre),
+    "psar": lambda d, nombre: cambios_tendencia(d["UpTrend"].notna(),
+                                                d["PSAR"].where(d["UpTrend"].notna() | d["DownTrend"].notna()), nombre),
+    "rsi": lambda d, nombre: cruces_nivel(d, 70, 30, nombre),
+    "cci": lambda d, nombre: pd.concat([cruces_nivel(linea, 100, -100, n) for n, linea in _lineas(d, "CCI", nombre)]),
+}
+
+
+def extraer_eventos(indicadores: Dict[str, Datos], ticker: Optional[str] = None) -> pd.DataFrame:
+    """
+    Tabla de eventos de varios indicadores a la vez.
+
+    param : dict : indicadores : Regla -> salida del indicador. Las reglas son las claves de REGLAS (cruce_medias, macd,
+            tsi, dmi, ichimoku, psar, rsi y cci); tambien se acepta "regla:etiqueta" (por ejemplo "rsi:RSI_7") para
+            usar la misma regla con otra etiqueta en la columna indicador.
+    param : str : ticker : Ticker a poner en la tabla cuando las salidas son de un solo activo (opcional).
+
+    return : pd.DataFrame : Columnas fecha, ticker, indicador, evento y valor, ordenadas por fecha y ticker. ticker,
+             indicador y evento son categoricas para que la tabla de un universo completo ocupe poco.
+    """
+
+    partes = []
+    for clave, datos in indicadores.items():
+        regla, _, etiqueta = clave.partition(":")
+        if regla.lower() not in REGLAS:
+            raise ValueError(f"Regla de eventos desconocida: {regla!r} (disponibles: {list(REGLAS)})")
+        partes.append(REGLAS[regla.lower()](datos, etiqueta or regla))
+
+    eventos = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=COLUMNAS)
+    if ticker is not None:
+        eventos["ticker"] = eventos["ticker"].where(eventos["ticker"].notna(), ticker)
+    eventos = eventos.sort_values(["fecha", "ticker"], kind="stable", na_position="first").reset_index(drop=True)
+    for columna in ("ticker", "indicador", "evento"):
+        eventos[columna] = eventos[columna].astype("category")
+    return eventos[COLUMNAS]
@@ -0,0 +1,164 @@
+"""
+Minimos y maximos moviles para varias ventanas a la vez.
+
+Ichimoku_Cloud pide rolling(...).min() y rolling(...).max() seis veces (ventanas tenkan, kijun y senkou), y los
+canales de Donchian y el estocastico %K necesitan los mismos extremos. Aqui se construye una sola vez una sparse table
+de extremos sobre potencias de dos, M_k[i] = max(x[i], ..., x[i + 2^k - 1]), y el extremo de cualquier ventana w sale
+de dos consultas que se solapan: max(M_k[t - w + 1], M_k[t - 2^k + 1]) con 2^k <= w. Cada nivel es una operacion
+vectorizada sobre todo el arreglo (todas las columnas de un panel a la vez), asi que el costo es O(n log w_max) para
+construir la tabla y O(n) por ventana pedida, sin bucles de Python por barra.
+
+Comparacion con pandas:
+
+    python -m algotrading.extremos --barras 1000000 --activos 1 --longitudes 9 26 52
+"""
+
+# Importar librerias
+import argparse
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+Datos = Union[pd.Series, pd.DataFrame, np.ndarray]
+
+
+def _tabla_dispersa(valores: np.ndarray, operacion: np.ufunc, longitud_max: int) -> List[np.ndarray]:
+    """Niveles de la sparse table: el nivel k contiene el extremo de cada bloque de 2^k barras que empieza en i."""
+
+    niveles = [valores]
+    paso = 1
+    while 2 * paso <= longitud_max:
+        anterior = niveles[-1]
+        niveles.append(operacion(anterior[:-paso], anterior[paso:]))
+        paso *= 2
+    return niveles
+
+
+def _consultar(niveles: List[np.ndarray], operacion: np.ufunc, longitud: int, barras: int) -> np.ndarray:
+    """Extremo de la ventana de `longitud` barras que termina en cada barra (NaN en las primeras longitud - 1)."""
+
+    salida = np.full((barras,) + niveles[0].shape[1:], np.nan)
+    if longitud > barras:
+        return salida
+    k = longitud.bit_length() - 1
+    bloque = niveles[k]
+    # Los dos bloques de 2^k barras que cubren la ventana [t - longitud + 1, t]: el que empieza en la ventana y el que
+    # termina en t
+    operacion(bloque[:barras - longitud + 1], bloque[longitud - (1 << k):], out=salida[longitud - 1:])
+    return salida
+
+
+def _extremos(valores: Datos, longitudes: Iterable[int], operacion: np.ufunc) -> Dict[int, Datos]:
+    longitudes = sorted(set(int(n) for n in longitudes))
+    if longitudes[0] < 1:
+        raise ValueError("Las ventanas deben ser de al menos una barra")
+
+    arreglo = np.asarray(valores, dtype=float)
+    niveles = _tabla_dispersa(arreglo, operacion, longitudes[-1])
+    resultados = {n: _consultar(niveles, operacion, n, arreglo.shape[0]) for n in longitudes}
+
+    if isinstance(valores, pd.DataFrame):
+        return {n: pd.DataFrame(v, index=valores.index, columns=valores.columns) for n, v in resultados.items()}
+    if isinstance(valores, pd.Series):
+        return {n: pd.Series(v, index=valores.index, name=valores.name) for n, v in resultados.items()}
+    return resultados
+
+
+def maximos_moviles(valores: Datos, longitudes: Iterable[int]) -> Dict[int, Datos]:
+    """
+    Maximo movil para varias ventanas con una sola sparse table. Equivale a
+    valores.rolling(window=n, min_periods=n).max() para cada n (una ventana con NaN devuelve NaN).
+
+    param : pd.Series | pd.DataFrame | np.ndarray : valores : Serie o panel (tiempo x activos).
+    param : Iterable[int] : longitudes : Ventanas a calcular.
+
+    return : dict : Ventana -> maximo movil, con el mismo tipo que la entrada.
+    """
+
+    return _extremos(valores, longitudes, np.maximum)
+
+
+def minimos_moviles(valores: Datos, longitudes: Iterable[int]) -> Dict[int, Datos]:
+    """Minimo movil para varias ventanas con una sola sparse table (ver maximos_moviles)."""
+
+    return _extremos(valores, longitudes, np.minimum)
+
+
+def canal_donchian(df: pd.DataFrame, longitud: int = 20) -> pd.DataFrame:
+    """
+    Canal de Donchian: maximo del High y minimo del Low de las ultimas `longitud` barras y su linea media.
+
+    return : pd.DataFrame : Columnas Superior, Inferior y Media (MultiIndex (linea, ticker) con varios tickers).
+    """
+
+    superior = maximos_moviles(df["High"], [longitud])[longitud]
+    inferior = minimos_moviles(df["Low"], [longitud])[longitud]
+    return pd.concat({"Superior": superior, "Inferior": inferior, "Media": (superior + inferior) / 2}, axis=1)
+
+
+def estocastico(df: pd.DataFrame, longitud_k: int = 14, suavizado_d: int = 3) -> pd.DataFrame:
+    """
+    Oscilador estocastico: %K = 100 * (Close - minimo del Low) / (maximo del High - minimo del Low) sobre
+    `longitud_k` barras, y %D como media simple de %K de `suavizado_d` barras.
+
+    return : pd.DataFrame : Columnas %K y %D (MultiIndex (linea, ticker) con varios tickers).
+    """
+
+    maximo = maximos_moviles(df["High"], [longitud_k])[longitud_k]
+    minimo = minimos_moviles(df["Low"], [longitud_k])[longitud_k]
+    K = 100 * (df["Close"] - minimo) / (maximo - minimo)
+    D = K.rolling(window=suavizado_d, min_periods=suavizado_d).mean()
+    return pd.concat({"%K": K, "%D": D}, axis=1)
+
+
+def comparar_con_pandas(barras: int = 1_000_000, activos: int = 1, longitudes: Iterable[int] = (9, 26, 52),
+                        repeticiones: int = 3, semilla: int = 0) -> pd.DataFrame:
+    """
+    Mide el tiempo de minimos y maximos moviles de todas las ventanas con la sparse table y con las llamadas
+    rolling(...).min() / rolling(...).max() de pandas, sobre un panel aleatorio, y comprueba que coinciden.
+
+    return : pd.DataFrame : Segundos (mejor de `repeticiones`) de cada metodo y la aceleracion.
+    """
+
+    generador = np.random.default_rng(semilla)
+    precios = pd.DataFrame(100 * np.exp(np.cumsum(generador.normal(0, 0.01, (barras, activos)), axis=0)))
+    longitudes = list(longitudes)
+
+    def con_pandas():
+        return ({n: precios.rolling(window=n, min_periods=n).min() for n in longitudes},
+                {n: precios.rolling(window=n, min_periods=n).max() for n in longitudes})
+
+    def con_tabla():
+        return minimos_moviles(precios, longitudes), maximos_moviles(precios, longitudes)
+
+    tiempos = {}
+    for nombre, funcion in (("pandas", con_pandas), ("sparse_table", con_tabla)):
+        mejor = np.inf
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+        tiempos[nombre] = (mejor, resultado)
+
+    for n in longitudes:
+        for i in range(2):
+            pd.testing.assert_frame_equal(tiempos["pandas"][1][i][n], tiempos["sparse_table"][1][i][n])
+
+    segundos = {nombre: t for nombre, (t, _) in tiempos.items()}
+    return pd.DataFrame({"segundos": segundos, "aceleracion": {n: segundos["pandas"] / t for n, t in segundos.items()}})
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compara la sparse table de extremos moviles con pandas.")
+    parser.add_argument("--barras", type=int, default=1_000_000, help="Barras por activo.")
+    parser.add_argument("--activos", type=int, default=1, help="Columnas del panel.")
+    parser.add_argument("--longitudes", type=int, nargs="+", default=[9, 26, 52], help="Ventanas.")
+    args = parser.parse_args(argumentos)
+
+    print(comparar_con_pandas(args.barras, args.activos, args.longitudes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Renderizado de graficos por lotes, sin ventana.
+
+Los scripts del curso terminan en plt.show() (o en webbrowser.open para el HTML de plotly), asi que generar los
+graficos de cientos de tickers requiere a alguien delante de la pantalla. Aqui los mismos diseños (velas con medias
+SMA/EMA/WMA, panel DMI, nube de Ichimoku, histograma del MACD y paneles RSI y TSI) se dibujan con el backend Agg de
+matplotlib, que no abre ventanas, en un grupo de procesos, y se guardan como PNG (mplfinance) o HTML (plotly). Los
+indicadores de todos los diseños de un ticker se calculan con un solo Grafo (los intermedios comunes una vez) y las
+series se reducen al ancho del grafico antes de dibujar. Cada grafico registra su tiempo en tiempos.csv.
+
+    python -m algotrading.graficos --tickers AAPL MSFT NVDA --graficos medias macd rsi --salida graficos/
+    python -m algotrading.graficos --archivo-tickers universo.txt --formato html --trabajadores 8
+"""
+
+# Importar librerias
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from algotrading import grafo
+from algotrading.almacen import RUTA_ALMACEN, cargar_barras
+from algotrading.reduccion import VELAS_POR_DEFECTO, reducir_indicador, reducir_velas
+
+
+class Diseño(NamedTuple):
+    """
+    Diseño de un grafico: que indicadores calcular y donde dibujarlos.
+
+    salidas : Nombre -> Nodo del grafo de indicadores.
+    superpuestos : Salidas que se dibujan sobre las velas.
+    panel : Salidas que se dibujan en un panel inferior.
+    niveles : Lineas horizontales del panel inferior (por ejemplo, 70 y 30 del RSI).
+    histograma : (a, b) para dibujar a - b como barras en el panel inferior (verde si es positivo).
+    nube : (a, b) para sombrear el area entre dos salidas superpuestas (nube de Ichimoku).
+    titulo : Titulo del grafico.
+    """
+
+    salidas: Dict[str, grafo.Nodo]
+    superpuestos: Tuple[str, ...] = ()
+    panel: Tuple[str, ...] = ()
+    niveles: Tuple[float, ...] = ()
+    histograma: Optional[Tuple[str, str]] = None
+    nube: Optional[Tuple[str, str]] = None
+    titulo: str = ""
+
+
+_MACD = grafo.MACD()
+_TSI = grafo.TSI()
+
+DISEÑOS: Dict[str, Diseño] = {
+    "medias": Diseño({"SMA 9": grafo.SMA(9), "SMA 21": grafo.SMA(21), "EMA 12": grafo.EMA(12),
+                      "EMA 26": grafo.EMA(26), "WMA 9": grafo.WMA(9)},
+                     superpuestos=("SMA 9", "SMA 21", "EMA 12", "EMA 26", "WMA 9"), titulo="Medias Moviles"),
+    "dmi": Diseño(grafo.DMI(), panel=("ADX", "+DI", "-DI"), niveles=(25,),
+                  titulo="Indice de Movimiento Direccional (DMI)"),
+    "ichimoku": Diseño(grafo.Ichimoku(), superpuestos=("tenkan_sen", "kijun_sen", "senkou_span_a", "senkou_span_b"),
+                       nube=("senkou_span_a", "senkou_span_b"), titulo="Ichimoku Cloud"),
+    "macd": Diseño({"MACD": _MACD["MACD"], "Señal": _MACD["Señal"]}, panel=("MACD", "Señal"),
+                   histograma=("MACD", "Señal"), titulo="Convergencia-Divergencia de Promedios Moviles (MACD)"),
+    "rsi": Diseño({"RSI": grafo.RSI(14)}, panel=("RSI",), niveles=(70, 30), titulo="Indice de Fuerza Relativa (RSI)"),
+    "tsi": Diseño({"TSI": _TSI["TSI"], "Senal": _TSI["Senal"]}, panel=("TSI", "Senal"), niveles=(25, -25),
+                  histograma=("TSI", "Senal"), titulo="Indicador Fuerza Verdadera (TSI)"),
+}
+
+_COLORES = ("blue", "red", "green", "purple", "orange", "brown")
+
+
+def _usar_backend_sin_ventana() -> None:
+    """Selecciona el backend Agg antes de importar pyplot (se llama al iniciar cada proceso del grupo)."""
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _variables(df: pd.DataFrame, graficos: Iterable[str]) -> pd.DataFrame:
+    """Indicadores de todos los diseños pedidos evaluados con un solo plan (los nodos repetidos se calculan una vez)."""
+
+    salidas = {}
+    for nombre in graficos:
+        salidas.update({f"{nombre}|{salida}": nodo for salida, nodo in DISEÑOS[nombre].salidas.items()})
+    return grafo.Grafo(salidas).evaluar(df)
+
+
+def _png(velas: pd.DataFrame, variables: pd.DataFrame, diseño: Diseño, titulo: str, archivo: str) -> None:
+    import matplotlib.pyplot as plt
+    import mplfinance as mpf
+
+    adicionales = []
+    for i, nombre in enumerate(diseño.superpuestos):
+        adicionales.append(mpf.make_addplot(variables[nombre], color=_COLORES[i % len(_COLORES)], label=nombre))
+    for i, nombre in enumerate(diseño.panel):
+        adicionales.append(mpf.make_addplot(variables[nombre], panel=2, color=_COLORES[i % len(_COLORES)],
+                                            ylabel=diseño.panel[0] if i == 0 else ""))
+    for nivel in diseño.niveles:
+        adicionales.append(mpf.make_addplot(np.full(len(velas), float(nivel)), panel=2, color="gray", linestyle="--"))
+    if diseño.histograma:
+        diferencia = variables[diseño.histograma[0]] - variables[diseño.histograma[1]]
+        adicionales.append(mpf.make_addplot(diferencia, panel=2, type="bar", alpha=0.4,
+                                            color=np.where(diferencia > 0, "green", "red").tolist()))
+
+    opciones = {}
+    if diseño.nube:
+        a, b = (variables[n].to_numpy() for n in diseño.nube)
+        opciones["fill_between"] = [dict(y1=a, y2=b, where=a >= b, alpha=0.3, color="green"),
+                                    dict(y1=a, y2=b, where=a < b, alpha=0.3, color="red")]
+
+    fig, _ = mpf.plot(velas, type="candle", style="yahoo", volume=True, addplot=adicionales, title=titulo,
+                      ylabel="Precio", ylabel_lower="Volumen", figsize=(22, 10), returnfig=True,
+                      warn_too_much_data=len(velas) + 1, **opciones)
+    fig.savefig(archivo, dpi=100)
+    plt.close(fig)
+
+
+def _html(velas: pd.DataFrame, variables: pd.DataFrame, diseño: Diseño, titulo: str, archivo: str) -> None:
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    con_panel = bool(diseño.panel)
+    fig = make_subplots(rows=2 if con_panel else 1, cols=1, shared_xaxes=True,
+                        row_heights=[0.65, 0.35] if con_panel else None, vertical_spacing=0.03)
+    fig.add_trace(go.Candlestick(x=velas.index, open=velas["Open"], high=velas["High"], low=velas["Low"],
+                                 close=velas["Close"], name="Precio"), row=1, col=1)
+
+    for i, nombre in enumerate(diseño.superpuestos):
+        relleno = "tonexty" if diseño.nube and nombre == diseño.nube[1] else None
+        fig.add_trace(go.Scatter(x=variables.index, y=variables[nombre], name=nombre, fill=relleno,
+                                 line=dict(color=_COLORES[i % len(_COLORES)], width=1)), row=1, col=1)
+    for i, nombre in enumerate(diseño.panel):
+        fig.add_trace(go.Scatter(x=variables.index, y=variables[nombre], name=nombre,
+                                 line=dict(color=_COLORES[i % len(_COLORES)], width=1)), row=2, col=1)
+    for nivel in diseño.niveles:
+        fig.add_hline(y=nivel, line_dash="dash", line_color="gray", row=2, col=1)
+    if diseño.histograma:
+        diferencia = variables[diseño.histograma[0]] - variables[diseño.histograma[1]]
+        fig.add_trace(go.Bar(x=variables.index, y=diferencia, name="Histograma", opacity=0.4,
+                             marker_color=np.where(diferencia > 0, "green", "red")), row=2, col=1)
+
+    fig.update_layout(title=titulo, xaxis_rangeslider_visible=False, width=1500, height=800)
+    fig.write_html(archivo, include_plotlyjs="cdn")
+
+
+def _renderizar_ticker(ticker: str, df: Optional[pd.DataFrame], graficos: List[str], salida: str, formato: str,
+                       velas: int, intervalo: str, ruta: str) -> List[dict]:
+    """Calcula los indicadores de un ticker y escribe sus graficos. Se ejecuta en un proceso del grupo."""
+
+    registros = []
+    inicio = time.perf_counter()
+    try:
+        if df is None:
+            df = cargar_barras(ticker, intervalo, ruta=ruta)
+        variables = _variables(df, graficos)
+        reducidas = reducir_velas(df, velas)
+        variables = reducir_indicador(variables, velas)
+    except Exception as error:
+        return [{"ticker": ticker, "grafico": g, "archivo": None, "segundos": np.nan,
+                 "segundos_indicadores": time.perf_counter() - inicio, "error": repr(error)} for g in graficos]
+    segundos_indicadores = time.perf_counter() - inicio
+
+    dibujar = _png if formato == "png" else _html
+    for nombre in graficos:
+        diseño = DISEÑOS[nombre]
+        archivo = os.path.join(salida, f"{ticker}_{nombre}.{formato}")
+        comienzo = time.perf_counter()
+        error = None
+        try:
+            columnas = {salida_: variables[f"{nombre}|{salida_}"] for salida_ in diseño.salidas}
+            dibujar(reducidas, pd.DataFrame(columnas), diseño, f"{diseño.titulo} - {ticker}", archivo)
+        except Exception as e:
+            archivo, error = None, repr(e)
+        registros.append({"ticker": ticker, "grafico": nombre, "archivo": archivo,
+                          "segundos": time.perf_counter() - comienzo,
+                          "segundos_indicadores": segundos_indicadores, "error": error})
+    return registros
+
+
+def renderizar_lote(datos: Union[Dict[str, pd.DataFrame], Iterable[str]], graficos: Iterable[str] = tuple(DISEÑOS),
+                    salida: str = "graficos", formato: str = "png", trabajadores: Optional[int] = None,
+                    velas: int = VELAS_POR_DEFECTO, intervalo: str = "1d", ruta: str = RUTA_ALMACEN,
+                    verbose: bool = True) -> pd.DataFrame:
+    """
+    Dibuja y guarda los graficos de muchos tickers en paralelo, sin abrir ventanas.
+
+    param : dict | Iterable[str] : datos : Diccionario ticker -> DataFrame OHLCV, o lista de tickers que cada proceso
+            carga del almacen local (evita copiar los datos entre procesos).
+    param : Iterable[str] : graficos : Diseños a dibujar (claves de DISEÑOS; por defecto, todos).
+    param : str : salida : Carpeta de salida; los archivos se llaman <ticker>_<grafico>.<formato>.
+    param : str : formato : "png" (mplfinance) o "html" (plotly).
+    param : int : trabajadores : Procesos del grupo (por defecto, os.cpu_count()).
+    param : int : velas : Velas maximas por grafico (las series largas se reducen con algotrading.reduccion).
+    param : str : intervalo : Intervalo de las barras al cargar del almacen (por defecto, '1d').
+    param : str : ruta : Carpeta raiz del almacen (por defecto, datos/ohlcv).
+    param : bool : verbose : Imprimir el avance y el resumen final.
+
+    return : pd.DataFrame : Una fila por grafico con ticker, grafico, archivo, segundos (dibujo y escritura),
+             segundos_indicadores (del ticker) y error. Tambien se guarda en <salida>/tiempos.csv.
+    """
+
+    graficos = list(graficos)
+    desconocidos = [g for g in graficos if g not in DISEÑOS]
+    if desconocidos:
+        raise ValueError(f"Graficos desconocidos: {desconocidos} (disponibles: {list(DISEÑOS)})")
+    if formato not in ("png", "html"):
+        raise ValueError(f"Formato desconocido: {formato!r} (usar 'png' o 'html')")
+
+    os.makedirs(salida, exist_ok=True)
+    tareas = datos.items() if isinstance(datos, dict) else ((ticker, None) for ticker in dict.fromkeys(datos))
+
+    registros = []
+    comienzo = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_usar_backend_sin_ventana) as grupo:
+        futuros = [grupo.submit(_renderizar_ticker, ticker, df, graficos, salida, formato, velas, intervalo, ruta)
+                   for ticker, df in tareas]
+        for n, futuro in enumerate(as_completed(futuros), start=1):
+            registros.extend(futuro.result())
+            if verbose and (n % 50 == 0 or n == len(futuros)):
+                print(f"[{n}/{len(futuros)}] {time.perf_counter() - comienzo:.1f}s")
+
+    tiempos = pd.DataFrame(registros, columns=["ticker", "grafico", "archivo", "segundos", "segundos_indicadores",
+                                               "error"])
+    tiempos.to_csv(os.path.join(salida, "tiempos.csv"), index=False)
+
+    if verbose:
+        fallidos = tiempos["error"].notna().sum()
+        print(f"Graficos: {len(tiempos) - fallidos} | Fallidos: {fallidos} | "
+              f"{time.perf_counter() - comienzo:.1f}s | mediana por grafico: {tiempos['segundos'].median():.2f}s")
+
+    return tiempos
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Genera graficos de indicadores por lotes (PNG o HTML).")
+    parser.add_argument("--tickers", nargs="*", default=[], help="Tickers a graficar (cargados del almacen).")
+    parser.add_argument("--archivo-tickers", help="Archivo de texto con un ticker por linea.")
+    parser.add_argument("--intervalo", default="1d", help="Intervalo de las barras (por defecto, 1d).")
+    parser.add_argument("--graficos", nargs="+", default=list(DISEÑOS), choices=list(DISEÑOS), help="Diseños.")
+    parser.add_argument("--formato", default="png", choices=["png", "html"], help="Formato de salida.")
+    parser.add_argument("--salida", default="graficos", help="Carpeta de salida.")
+    parser.add_argument("--trabajadores", type=int, default=None, help="Procesos en paralelo.")
+    parser.add_argument("--velas", type=int, default=VELAS_POR_DEFECTO, help="Velas maximas por grafico.")
+    parser.add_argument("--ruta", default=RUTA_ALMACEN, help="Carpeta del almacen local.")
+    args = parser.parse_args(argumentos)
+
+    tickers = list(args.tickers)
+    if args.archivo_tickers:
+        with open(args.archivo_tickers, encoding="utf-8") as f:
+            tickers += [linea.strip() for linea in f if linea.strip() and not linea.startswith("#")]
+    if not tickers:
+        parser.error("Indica al menos un ticker con --tickers o --archivo-tickers")
+
+    renderizar_lote(tickers, args.graficos, args.salida, args.formato, args.trabajadores, args.velas,
+                    args.intervalo, args.ruta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Grafo de indicadores con subexpresiones compartidas.
+
+Cada indicador se declara como una composicion de nodos (columna de precios, EMA, rango verdadero, precio tipico,
+minimos y maximos moviles, ...). Dos nodos con la misma operacion, los mismos parametros y las mismas entradas son el
+mismo nodo, asi que al planificar un conjunto de salidas los intermedios comunes se evaluan una sola vez: la EMA-12 y
+la EMA-26 del Close son compartidas por EMA y MACD, el rango verdadero por DMI y ATR, el precio tipico por CCI y las
+demas variables que lo usen, y los extremos moviles de 9, 26 y 52 barras por Ichimoku y los canales de Donchian.
+
+El plan se construye una vez y se reutiliza para cada ticker (o para un panel de tickers a la vez):
+
+    grafo = Grafo({**MACD(), "EMA_26": EMA(26), "RSI": RSI(14), **Ichimoku(), "Donchian_Alto": Donchian(26)[0]})
+    variables = grafo.evaluar(df)
+    por_ticker = grafo.evaluar_lote({"AAPL": df_aapl, "MSFT": df_msft})
+"""
+
+# Importar librerias
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from algotrading.extremos import maximos_moviles, minimos_moviles
+from algotrading.indicadores.momentum import _rsi_variaciones
+from algotrading.indicadores.tendencia import Suavizado_Wilder, _desviacion_media_movil, _kernel_wma
+from algotrading.panel import seleccionar_columna
+
+Datos = Union[pd.Series, pd.DataFrame]
+
+
+class Nodo:
+    """
+    Nodo del grafo: una operacion registrada en _OPERACIONES aplicada a otros nodos con unos parametros. La clave
+    identifica el calculo, de modo que nodos construidos por separado con la misma definicion se comparten.
+    """
+
+    __slots__ = ("operacion", "entradas", "parametros", "clave")
+
+    def __init__(self, operacion: str, entradas: Tuple["Nodo", ...] = (), **parametros):
+        if operacion not in _OPERACIONES:
+            raise ValueError(f"Operacion desconocida: {operacion}")
+        self.operacion = operacion
+        self.entradas = tuple(entradas)
+        self.parametros = parametros
+        self.clave = (operacion, tuple(e.clave for e in self.entradas), tuple(sorted(parametros.items())))
+
+    def __hash__(self):
+        return hash(self.clave)
+
+    def __eq__(self, otro):
+        return isinstance(otro, Nodo) and self.clave == otro.clave
+
+    def __repr__(self):
+        parametros = ", ".join(f"{k}={v}" for k, v in sorted(self.parametros.items()))
+        return f"{self.operacion}({parametros})"
+
+    def __add__(self, otro: "Nodo") -> "Nodo":
+        return Nodo("suma", (self, otro))
+
+    def __sub__(self, otro: "Nodo") -> "Nodo":
+        return Nodo("resta", (self, otro))
+
+    def __truediv__(self, otro: "Nodo") -> "Nodo":
+        return Nodo("division", (self, otro))
+
+
+# Operaciones primitivas -------------------------------------------------------------------------------------------
+
+def _como_datos(valores: np.ndarray, referencia: Datos) -> Datos:
+    if isinstance(referencia, pd.DataFrame):
+        return pd.DataFrame(valores, index=referencia.index, columns=referencia.columns)
+    return pd.Series(valores, index=referencia.index)
+
+
+def _desviacion_media(x: Datos, longitud: int) -> Datos:
+    """Desviacion media absoluta movil de CCI (el kernel por bloques de ventanas del indicador)."""
+
+    return _como_datos(_desviacion_media_movil(x.to_numpy(dtype=float), longitud)[1], x)
+
+
+def _wma(x: Datos, longitud: int) -> Datos:
+    """Media movil ponderada con pesos 1, 2, ..., longitud: el kernel O(n) de Media_Movil_Ponderada."""
+
+    valores = x.to_numpy(dtype=float)
+    return _como_datos(_kernel_wma(valores.reshape(valores.shape[0], -1), longitud).reshape(valores.shape), x)
+
+
+def _rango_verdadero(High: Datos, Low: Datos, Close: Datos) -> Datos:
+    cierre_previo = Close.shift(1)
+    return np.maximum(High - Low, np.maximum((High - cierre_previo).abs(), (cierre_previo - Low).abs()))
+
+
+def _movimiento_direccional(High: Datos, Low: Datos, signo: int) -> Datos:
+    """+DM (signo=1) o -DM (signo=-1) como en Indice_Movimiento_Direccional (la primera barra queda en NaN)."""
+
+    sube = High.diff()
+    baja = -Low.diff()
+    propio, contrario = (sube, baja) if signo > 0 else (baja, sube)
+    return propio.where((propio > contrario) & (propio > 0), 0.0).where(sube.notna())
+
+
+def _dmi(TR: Datos, PDM: Datos, MDM: Datos, suavizado_ADX: int, longitud_DI: int) -> Tuple[Datos, Datos, Datos]:
+    """ADX, +DI y -DI alineados con el indice completo (NaN en las primeras suavizado_ADX barras)."""
+
+    s = suavizado_ADX
+    forma = TR.to_numpy(dtype=float).reshape(len(TR), -1)
+    TRL = Suavizado_Wilder(forma[1:], s, suma=True)[s - 1:]
+    PDML = Suavizado_Wilder(PDM.to_numpy(dtype=float).reshape(forma.shape)[1:], s, suma=True)[s - 1:]
+    MDML = Suavizado_Wilder(MDM.to_numpy(dtype=float).reshape(forma.shape)[1:], s, suma=True)[s - 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        PDI = PDML / TRL * 100
+        MDI = MDML / TRL * 100
+        DX = np.abs(PDI - MDI) / (PDI + MDI) * 100
+    ADX = Suavizado_Wilder(DX, longitud_DI, suma=False, semilla=DX[:s].mean(axis=0))
+
+    def completo(valores: np.ndarray) -> Datos:
+        relleno = np.full(forma.shape, np.nan)
+        relleno[s:] = valores
+        return _como_datos(relleno if isinstance(TR, pd.DataFrame) else relleno[:, 0], TR)
+
+    return completo(ADX), completo(PDI), completo(MDI)
+
+
+_OPERACIONES: Dict[str, Callable] = {
+    "columna": None,  # se resuelve en Grafo.evaluar a partir de los datos de entrada
+    "ema": lambda x, longitud: x.ewm(span=longitud, min_periods=longitud, adjust=False).mean(),
+    "rma": lambda x, longitud: x.ewm(alpha=1 / longitud, min_periods=longitud, adjust=False).mean(),
+    "sma": lambda x, longitud: x.rolling(window=longitud, min_periods=longitud).mean(),
+    "wma": _wma,
+    "minimo_movil": lambda x, longitud: minimos_moviles(x, [longitud])[longitud],
+    "maximo_movil": lambda x, longitud: maximos_moviles(x, [longitud])[longitud],
+    "desviacion_media": _desviacion_media,
+    "diferencia": lambda x, periodos: x.diff(periods=periodos),
+    "desplazar": lambda x, periodos: x.shift(periods=periodos),
+    "absoluto": lambda x: x.abs(),
+    "suma": lambda a, b: a + b,
+    "resta": lambda a, b: a - b,
+    "division": lambda a, b: a / b,
+    "escalar": lambda x, factor: x * factor,
+    "punto_medio": lambda a, b: (a + b) / 2,
+    "precio_tipico": lambda High, Low, Close: (High + Low + Close) / 3,
+    "rango_verdadero": _rango_verdadero,
+    "movimiento_direccional": _movimiento_direccional,
+    "dmi": _dmi,
+    "elemento": lambda x, posicion: x[posicion],
+    "rsi": _rsi_variaciones,
+    "mayor": lambda a, b: a > b,
+    "cci": lambda tp, media, desviacion, constante: (tp - media) / (constante * desviacion),
+}
+
+
+# Nodos basicos ----------------------------------------------------------------------------------------------------
+
+def columna(nombre: str = "Close") -> Nodo:
+    return Nodo("columna", nombre=nombre)
+
+
+def rango_verdadero() -> Nodo:
+    """True Range: max(High - Low, |High - Close previo|, |Close previo - Low|)."""
+
+    return Nodo("rango_verdadero", (columna("High"), columna("Low"), columna("Close")))
+
+
+def precio_tipico() -> Nodo:
+    """(High + Low + Close) / 3."""
+
+    return Nodo("precio_tipico", (columna("High"), columna("Low"), columna("Close")))
+
+
+def extremos_moviles(longitud: int) -> Tuple[Nodo, Nodo]:
+    """Minimo movil del Low y maximo movil del High."""
+
+    return (Nodo("minimo_movil", (columna("Low"),), longitud=longitud),
+            Nodo("maximo_movil", (columna("High"),), longitud=longitud))
+
+
+# Indicadores (mismas formulas que los scripts del curso) ----------------------------------------------------------
+
+def SMA(longitud: int = 21, col: str = "Close") -> Nodo:
+    return Nodo("sma", (columna(col),), longitud=longitud)
+
+
+def EMA(longitud: int = 26, col: str = "Close") -> Nodo:
+    return Nodo("ema", (columna(col),), longitud=longitud)
+
+
+def WMA(longitud: int = 9, col: str = "Close") -> Nodo:
+    return Nodo("wma", (columna(col),), longitud=longitud)
+
+
+def MACD(longitud_rapida: int = 12, longitud_lenta: int = 26, longitud_señal: int = 9,
+         col: str = "Close") -> Dict[str, Nodo]:
+    MACD_d = EMA(longitud_rapida, col) - EMA(longitud_lenta, col)
+    return {"MACD": MACD_d, "Señal": Nodo("ema", (MACD_d,), longitud=longitud_señal)}
+
+
+def RSI(longitud: int = 14, col: str = "Close") -> Nodo:
+    return Nodo("rsi", (Nodo("diferencia", (columna(col),), periodos=1),), longitud=longitud)
+
+
+def TSI(longitud_rapida: int = 13, longitud_lenta: int = 25, senal: int = 13, col: str = "Close") -> Dict[str, Nodo]:
+    Momento = Nodo("diferencia", (columna(col),), periodos=1)
+    EMA_rapida = Nodo("ema", (Nodo("ema", (Momento,), longitud=longitud_lenta),), longitud=longitud_rapida)
+    Momento_abs = Nodo("absoluto", (Momento,))
+    EMA_rapida_abs = Nodo("ema", (Nodo("ema", (Momento_abs,), longitud=longitud_lenta),), longitud=longitud_rapida)
+    TSI_ = Nodo("escalar", (EMA_rapida / EMA_rapida_abs,), factor=100)
+    Senal = Nodo("ema", (TSI_,), longitud=senal)
+    return {"TSI": TSI_, "Senal": Senal, "Tendencia": Nodo("mayor", (TSI_, Senal))}
+
+
+def CCI(longitud: int = 20, constante: float = 0.015) -> Nodo:
+    tp = precio_tipico()
+    return Nodo("cci", (tp, Nodo("sma", (tp,), longitud=longitud), Nodo("desviacion_media", (tp,), longitud=longitud)),
+                constante=constante)
+
+
+def ATR(longitud: int = 14) -> Nodo:
+    """Average True Range: media de Wilder del rango verdadero."""
+
+    return Nodo("rma", (rango_verdadero(),), longitud=longitud)
+
+
+def DMI(suavizado_ADX: int = 14, longitud_DI: int = 14) -> Dict[str, Nodo]:
+    altos, bajos = columna("High"), columna("Low")
+    dmi = Nodo("dmi", (rango_verdadero(), Nodo("movimiento_direccional", (altos, bajos), signo=1),
+                       Nodo("movimiento_direccional", (altos, bajos), signo=-1)),
+               suavizado_ADX=suavizado_ADX, longitud_DI=longitud_DI)
+    return {nombre: Nodo("elemento", (dmi,), posicion=i) for i, nombre in enumerate(("ADX", "+DI", "-DI"))}
+
+
+def Ichimoku(periodo_tenkan: int = 9, periodo_kijun: int = 26, offset: bool = False) -> Dict[str, Nodo]:
+    tenkan_sen = Nodo("punto_medio", extremos_moviles(periodo_tenkan))
+    kijun_sen = Nodo("punto_medio", extremos_moviles(periodo_kijun))
+    senkou_span_a = Nodo("punto_medio", (tenkan_sen, kijun_sen))
+    senkou_span_b = Nodo("punto_medio", extremos_moviles(periodo_kijun * 2))
+    if not offset:
+        senkou_span_a = Nodo("desplazar", (senkou_span_a,), periodos=periodo_kijun)
+        senkou_span_b = Nodo("desplazar", (senkou_span_b,), periodos=periodo_kijun)
+    return {"tenkan_sen": tenkan_sen, "kijun_sen": kijun_sen, "senkou_span_a": senkou_span_a,
+            "senkou_span_b": senkou_span_b,
+            "chinkou_span": Nodo("desplazar", (columna("Close"),), periodos=-periodo_kijun)}
+
+
+def Donchian(longitud: int = 20) -> Tuple[Nodo, Nodo, Nodo]:
+    """Canal de Donchian: (maximo movil del High, minimo movil del Low, linea media)."""
+
+    minimo, maximo = extremos_moviles(longitud)
+    return maximo, minimo, Nodo("punto_medio", (maximo, minimo))
+
+
+# Planificacion y evaluacion ---------------------------------------------------------------------------------------
+
+class Grafo:
+    """
+    Plan de evaluacion de un conjunto de salidas con nombre. Los nodos se ordenan topologicamente sin duplicados y
+    cada resultado intermedio se libera en cuanto deja de necesitarse.
+
+    param : dict : salidas : Nombre de la columna de salida -> Nodo.
+    """
+
+    def __init__(self, salidas: Dict[str, Nodo]):
+        self.salidas = dict(salidas)
+        self.orden: List[Nodo] = []
+        visitados = set()
+
+        def visitar(nodo: Nodo) -> None:
+            if nodo in visitados:
+                return
+            visitados.add(nodo)
+            for entrada in nodo.entradas:
+                visitar(entrada)
+            self.orden.append(nodo)
+
+        for nodo in self.salidas.values():
+            visitar(nodo)
+
+        # Ultimo paso del plan en que se usa cada nodo (las salidas se conservan hasta el final)
+        self._ultimo_uso: Dict[Nodo, int] = {}
+        for paso, nodo in enumerate(self.orden):
+            for entrada in nodo.entradas:
+                self._ultimo_uso[entrada] = paso
+        for nodo in self.salidas.values():
+            self._ultimo_uso[nodo] = len(self.orden)
+
+    @property
+    def nodos(self) -> int:
+        """Numero de nodos que se evaluan."""
+
+        return len(self.orden)
+
+    @property
+    def nodos_sin_compartir(self) -> int:
+        """Numero de nodos que se evaluarian calculando cada salida por separado."""
+
+        def contar(nodo: Nodo) -> int:
+            return 1 + sum(contar(e) for e in nodo.entradas)
+
+        return sum(contar(nodo) for nodo in self.salidas.values())
+
+    def evaluar(self, df: Union[pd.DataFrame, np.ndarray]) -> pd.DataFrame:
+        """
+        Evalua el plan sobre los datos de un activo o de un panel de activos (descarga de varios tickers).
+
+        return : pd.DataFrame : Una columna por salida; en modo panel las columnas son un MultiIndex (salida, ticker).
+        """
+
+        valores: Dict[Nodo, Datos] = {}
+        for paso, nodo in enumerate(self.orden):
+            if nodo.operacion == "columna":
+                valores[nodo] = seleccionar_columna(df, nodo.parametros["nombre"])
+            else:
+                valores[nodo] = _OPERACIONES[nodo.operacion](*(valores[e] for e in nodo.entradas), **nodo.parametros)
+            # Una entrada puede aparecer varias veces en el mismo nodo (EMA(12) + EMA(12)): se libera una sola vez
+            for entrada in dict.fromkeys(nodo.entradas):
+                if self._ultimo_uso[entrada] == paso:
+                    del valores[entrada]
+
+        return pd.concat({nombre: valores[nodo] for nombre, nodo in self.salidas.items()}, axis=1)
+
+    def evaluar_lote(self, datos: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Evalua el mismo plan para cada ticker de un diccionario ticker -> DataFrame."""
+
+        return {ticker: self.evaluar(df) for ticker, df in datos.items()}
@@ -0,0 +1,167 @@
+"""
+Versiones incrementales (una barra a la vez) de la EMA, el RSI, el MACD y el TSI.
+
+Cada objeto guarda el estado de sus medias exponenciales y se actualiza en tiempo constante por barra, en lugar de
+recalcular ewm(...).mean() sobre toda la historia. Reproducen exactamente a Media_Movil_Exponencial,
+Indicador_Fuerza_Relativa, MACD e Indicador_Fuerza_Verdadera: misma recursion que pandas con adjust=False (incluido el tratamiento de NaN) y el
+mismo calentamiento de min_periods.
+
+Todos aceptan un escalar (un activo) o un arreglo con el precio de cada activo en la barra, de modo que un solo objeto
+puede seguir un universo completo con operaciones vectorizadas:
+
+    ema = EMAIncremental(longitud=26)
+    for precio in precios_nuevos:
+        valor = ema.actualizar(precio)
+"""
+
+# Importar librerias
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+Valor = Union[float, np.ndarray]
+
+
+def _salida(valor: np.ndarray, escalar: bool) -> Valor:
+    return valor.item() if escalar else valor
+
+
+class EWMIncremental:
+    """
+    Media exponencial equivalente a serie.ewm(span=longitud, min_periods=min_periods, adjust=False).mean().
+
+    param : int : longitud : Span de la media.
+    param : int : min_periods : Observaciones necesarias antes de devolver valores (por defecto, igual a longitud).
+    """
+
+    def __init__(self, longitud: int, min_periods: Optional[int] = None):
+        self.longitud = longitud
+        self.min_periods = max(int(longitud if min_periods is None else min_periods), 1)
+        # Mismas operaciones que pandas para obtener alpha a partir del span
+        centro_masa = (longitud - 1) / 2.0
+        self.alpha = 1.0 / (1.0 + centro_masa)
+        self.factor = 1.0 - self.alpha
+        self.media = None
+        self.peso = None
+        self.observaciones = None
+
+    def _iniciar(self, forma: tuple) -> None:
+        self.media = np.full(forma, np.nan)
+        self.peso = np.ones(forma)
+        self.observaciones = np.zeros(forma, dtype=np.int64)
+
+    def actualizar(self, x: Valor) -> Valor:
+        """Incorpora una barra y devuelve el valor de la media (NaN durante el calentamiento)."""
+
+        x = np.asarray(x, dtype=float)
+        if self.media is None:
+            self._iniciar(x.shape)
+
+        observado = x == x
+        self.observaciones += observado
+        iniciado = self.media == self.media
+
+        # Con adjust=False el peso anterior decae en cada barra (tambien en las barras sin dato) y vuelve a 1 tras
+        # cada observacion
+        self.peso = np.where(iniciado, self.peso * self.factor, self.peso)
+        actualizar = iniciado & observado & (self.media != x)
+        combinada = (self.peso * self.media + self.alpha * x) / (self.peso + self.alpha)
+        self.media = np.where(actualizar, combinada, np.where(~iniciado & observado, x, self.media))
+        self.peso = np.where(iniciado & observado, 1.0, self.peso)
+
+        valor = np.where(self.observaciones >= self.min_periods, self.media, np.nan)
+        return _salida(valor, x.ndim == 0)
+
+    def actualizar_lote(self, valores: np.ndarray) -> np.ndarray:
+        """Incorpora varias barras (filas de `valores`) y devuelve un valor por barra."""
+
+        return np.array([self.actualizar(x) for x in np.asarray(valores, dtype=float)])
+
+
+class EMAIncremental(EWMIncremental):
+    """Equivalente incremental de Media_Movil_Exponencial(df, longitud)."""
+
+    def __init__(self, longitud: int = 26):
+        super().__init__(longitud, longitud)
+
+
+class RSIIncremental:
+    """Equivalente incremental de Indicador_Fuerza_Relativa(df, longitud)."""
+
+    def __init__(self, longitud: int = 14):
+        self.longitud = longitud
+        self.media_ganancia = EWMIncremental(longitud)
+        self.media_perdida = EWMIncremental(longitud)
+        self.anterior = None
+
+    def actualizar(self, precio: Valor) -> Valor:
+        precio = np.asarray(precio, dtype=float)
+        delta = np.full(precio.shape, np.nan) if self.anterior is None else precio - self.anterior
+        self.anterior = precio
+
+        # Igual que Delta.where(...): los NaN (primera barra) cuentan como 0
+        ganancia = np.where(delta >= 0, delta, 0.0)
+        perdida = np.abs(np.where(delta < 0, delta, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            media_ganancia = np.asarray(self.media_ganancia.actualizar(ganancia))
+            RS = media_ganancia / np.asarray(self.media_perdida.actualizar(perdida))
+            RSI = np.where(RS == 0, 100, 100 - (100 / (1 + RS)))
+
+        return _salida(np.asarray(RSI, dtype=float), precio.ndim == 0)
+
+    def actualizar_lote(self, precios: np.ndarray) -> np.ndarray:
+        return np.array([self.actualizar(x) for x in np.asarray(precios, dtype=float)])
+
+
+class MACDIncremental:
+    """Equivalente incremental de MACD(df, longitud_rapida, longitud_lenta, longitud_señal). Devuelve (MACD, Señal)."""
+
+    def __init__(self, longitud_rapida: int = 12, longitud_lenta: int = 26, longitud_señal: int = 9):
+        self.rapida = EWMIncremental(longitud_rapida)
+        self.lenta = EWMIncremental(longitud_lenta)
+        self.señal = EWMIncremental(longitud_señal)
+
+    def actualizar(self, precio: Valor) -> Tuple[Valor, Valor]:
+        MACD_d = np.asarray(self.rapida.actualizar(precio)) - np.asarray(self.lenta.actualizar(precio))
+        señal = self.señal.actualizar(MACD_d)
+        return _salida(MACD_d, MACD_d.ndim == 0), señal
+
+    def actualizar_lote(self, precios: np.ndarray) -> np.ndarray:
+        """Devuelve un arreglo (barras, 2, ...) con MACD y Señal por barra."""
+
+        return np.array([self.actualizar(x) for x in np.asarray(precios, dtype=float)])
+
+
+class TSIIncremental:
+    """
+    Equivalente incremental de Indicador_Fuerza_Verdadera(df, longitud_rapida, longitud_lenta, senal).
+    Devuelve (TSI, Senal, Tendencia).
+    """
+
+    def __init__(self, longitud_rapida: int = 13, longitud_lenta: int = 25, senal: int = 13):
+        self.lenta = EWMIncremental(longitud_lenta)
+        self.rapida = EWMIncremental(longitud_rapida)
+        self.lenta_abs = EWMIncremental(longitud_lenta)
+        self.rapida_abs = EWMIncremental(longitud_rapida)
+        self.senal = EWMIncremental(senal)
+        self.anterior = None
+
+    def actualizar(self, precio: Valor) -> Tuple[Valor, Valor, Union[bool, np.ndarray]]:
+        precio = np.asarray(precio, dtype=float)
+        momento = np.full(precio.shape, np.nan) if self.anterior is None else precio - self.anterior
+        self.anterior = precio
+
+        # Las medias encadenadas reciben NaN mientras la anterior esta en calentamiento, como en la version por lotes
+        EMA_rapida = np.asarray(self.rapida.actualizar(self.lenta.actualizar(momento)))
+        EMA_rapida_abs = np.asarray(self.rapida_abs.actualizar(self.lenta_abs.actualizar(np.abs(momento))))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            TSI = 100 * (EMA_rapida / EMA_rapida_abs)
+        Senal = np.asarray(self.senal.actualizar(TSI))
+        escalar = precio.ndim == 0
+
+        return _salida(TSI, escalar), _salida(Senal, escalar), _salida(TSI > Senal, escalar)
+
+    def actualizar_lote(self, precios: np.ndarray) -> np.ndarray:
+        """Devuelve un arreglo (barras, 3, ...) con TSI, Senal y Tendencia (como 0/1) por barra."""
+
+        return np.array([self.actualizar(x) for x in np.asarray(precios, dtype=float)], dtype=float)
@@ -0,0 +1,12 @@
+"""
+Indicadores del curso como funciones importables, sin descargas ni graficos al importar.
+
+    tendencia : SMA, EMA, WMA, Cruce de Medias Moviles, DMI, MACD, CCI, Ichimoku y SAR Parabolico.
+    momentum  : Indicador de Fuerza Verdadera (TSI) e Indice de Fuerza Relativa (RSI).
+"""
+
+from algotrading.indicadores.momentum import Indicador_Fuerza_Relativa, Indicador_Fuerza_Verdadera
+from algotrading.indicadores.tendencia import (CCI, MACD, Cruce_Medias_Moviles, Ichimoku_Cloud,
+                                               Indice_Movimiento_Direccional, Media_Movil_Exponencial,
+                                               Media_Movil_Ponderada, Media_Movil_Simple, Parabolic_SAR,
+                                               SAR_Parabolico_Multiactivo, Suavizado_Wilder)
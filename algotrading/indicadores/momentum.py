@@ -0,0 +1,139 @@
+"""
+Indicadores de momentum de la carpeta "03- Indicadores de Momentum" (TSI y RSI), importables sin descargar datos ni
+abrir graficos.
+"""
+
+# Importar librerias
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from algotrading.panel import como_entrada, seleccionar_columna
+
+
+# Indicador: Indicador de Fuerza Verdadera (TSI)
+
+def Indicador_Fuerza_Verdadera(df: pd.DataFrame, longitud_rapida: int = 13, longitud_lenta: int = 25, senal: int = 13,
+                               columna: str = "Close") -> pd.DataFrame:
+    """
+    El indicador de Fuerza Verdadera (TSI) es un oscilador de impulso tecnico utilizado para identificar tendencias y reversiones.
+    Es util para determinar condiciones de sobrecompra y sobreventa, indicando cambios de direccion de la tendencias a traves
+    de cruces de la linea central o de la linea de señal, advirtiendo sobre la tendencia mediante divergencias.
+
+    Como Operarlo:
+
+    El TSI fluctua entre los positivos y negativos. Territorio positivo significa que los alcistas tienen más control sobre el activo,
+    mientras que numeros negativos indican que los bajistas tienen más control. Cuando el indicador diverge con el precio, el TSI
+    podria estar señalando que la tendencia del precio se esta debilitando y podria revertirse.
+
+    Se puede aplicar una linea de señal al indicador TSI. Cuando el TSI cruza por encima de la linea de señal, puede ser utilizado como una
+    señal de compra; cuando cruza por debajo, como una señal de venta. Los niveles de sobrecompra y sobreventa variaran segun el activo que se esté operando.
+
+    ----------------
+    Parámetros:
+
+    -----------------
+
+    param: pd.DataFrame: df: Datos del activo financiero. Tambien acepta un panel con una columna por activo
+    (descarga de varios tickers, DataFrame ancho de precios o np.ndarray tiempo x activos); en ese caso las columnas
+    del resultado son un MultiIndex (TSI/Senal/Tendencia, ticker).
+
+    ------------------
+
+    param: int: Longitud_rapida: Ventana rapida a usar en el calculo del TSI (por defecto, se establece en 13)
+
+    ------------------
+
+    param: int: Longitud_lenta: Ventana lenta a usar en el calculo del TSI (por defecto, se establece en 25)
+
+    param: int: señal: Ventana de señal a usar en el calculo del TSI (por defecto, se establece en 13)
+
+    param: str: columna: Columna a utilizar para el calculo del TSI (por defecto, se establece en 'Close')
+
+    Salida:
+    ----------------
+    return: pd.Dataframe: Calculo del Indicador de Fuerza Verdadera.
+    """
+
+    # Calcular
+    Momento = seleccionar_columna(df, columna).diff(periods=1)
+    # EMA de Momento
+    EMA_lenta = Momento.ewm(span=longitud_lenta, min_periods=longitud_lenta, adjust=False).mean()
+    EMA_rapida = EMA_lenta.ewm(span=longitud_rapida, min_periods=longitud_rapida, adjust=False).mean()
+    # EMA del Momentum Abs
+    Momento_abs = abs(Momento)
+    EMA_lenta_abs = Momento_abs.ewm(span=longitud_lenta, min_periods=longitud_lenta, adjust=False).mean()
+    EMA_rapida_abs = EMA_lenta_abs.ewm(span=longitud_rapida, min_periods=longitud_rapida, adjust=False).mean()
+    # Calcular TSI
+    TSI_df = 100 * (EMA_rapida / EMA_rapida_abs)
+    Senal = TSI_df.ewm(span=senal, min_periods=senal, adjust=False).mean()
+
+    # Determinar tendencia alcista o bajista
+    Tendencia = TSI_df > Senal
+
+    TSI = pd.concat({"TSI": TSI_df, "Senal": Senal, "Tendencia": Tendencia}, axis=1)
+
+    return como_entrada(TSI, df)
+
+
+# Indicador: Indice de Fuerza Relativa (RSI)
+
+def Indicador_Fuerza_Relativa(df: pd.DataFrame, longitud: int = 14, columna: str = "Close") -> pd.Series:
+    """
+    El Indice de Fuerza Relativa (RSI) es un indicador utlizado en el analisis tecnico que mide la magnitud de los
+    cambios recientes en los precios para evaluar condiciones de sobrecompra o sobreventa en el precio de una accion
+    u otro activo.
+
+    Como Operarlo:
+        La interpretacion y uso tradicionales del RSI indican que valores de 70 o más sugieren que un adtivo esta
+        sobrecomprado o sobrevalorado y podrian estar listos para una reversion de tendencia o una correccion de precio.
+        Una lectura de RSI de 30 o menos indican una condicion de sobreventa o infravalorada.
+
+    Parametros
+    :param pd.DataFrame: df: Datos del activo. Tambien acepta un panel con una columna por activo (descarga de varios
+        tickers, DataFrame ancho de precios o np.ndarray tiempo x activos) y devuelve un RSI por columna.
+    :param int: Longitud: Ventana a usar en el calculo del RSI (por defecto, se establece en 14).
+    :param str: Columna a utilizar en el calculo del RSI (por defecto, establece en close).
+    Salida:
+
+    :return: pd.Series : Calculo del indice de fuerza relativa (RSI).
+    """
+    # Calcular
+
+    Delta = seleccionar_columna(df, columna).diff(periods=1)
+    return como_entrada(_rsi_variaciones(Delta, longitud), df)
+
+
+def _ganancias_perdidas(Delta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ganancias y perdidas (en positivo) de las variaciones del precio. Las variaciones NaN (la primera barra) cuentan
+    como 0 en ambas, como Delta.where(...) en el RSI.
+    """
+
+    return np.where(Delta >= 0, Delta, 0.0), np.where(Delta < 0, -Delta, 0.0)
+
+
+def _rsi_desde_medias(media_ganancia: np.ndarray, media_perdida: np.ndarray) -> np.ndarray:
+    """RSI a partir de las medias de ganancias y perdidas (100 cuando no hay perdidas)."""
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        RS = media_ganancia / media_perdida
+        return np.where(RS != 0, 100 - (100 / (1 + RS)), 100)
+
+
+def _rsi_variaciones(Delta: Union[pd.Series, pd.DataFrame], longitud: int = 14) -> Union[pd.Series, pd.DataFrame]:
+    """
+    RSI de las variaciones del precio (una serie o un panel con una columna por activo): el nucleo de
+    Indicador_Fuerza_Relativa, que usan tambien el grafo de indicadores y los modos por bloques y compacto.
+    """
+
+    Ganancia, Perdida = _ganancias_perdidas(Delta.to_numpy(dtype=float).reshape(len(Delta), -1))
+    # Valores en la posicion de la longitud
+    media_ganancia, media_perdida = (pd.DataFrame(x).ewm(span=longitud, min_periods=longitud, adjust=False)
+                                     .mean().to_numpy() for x in (Ganancia, Perdida))
+    RSI = _rsi_desde_medias(media_ganancia, media_perdida)
+
+    if isinstance(Delta, pd.DataFrame):
+        return pd.DataFrame(RSI, index=Delta.index, columns=Delta.columns)
+    return pd.Series(RSI[:, 0], index=Delta.index, name="RSI")
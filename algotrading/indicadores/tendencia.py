@@ -0,0 +1,805 @@
+"""
+Indicadores de tendencia de la carpeta "02 - Indicadores de tendencia", importables sin descargar datos ni abrir
+graficos:
+
+    from algotrading.indicadores import MACD, CCI
+    macd = MACD(df)
+
+Los scripts del curso importan de aqui sus indicadores y solo conservan la descarga y los graficos. Este modulo solo
+depende de numpy y pandas (scipy.signal se importa dentro de Suavizado_Wilder).
+"""
+
+# Importar librerias
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from algotrading.extremos import maximos_moviles, minimos_moviles
+from algotrading.panel import como_entrada, seleccionar_columna
+
+
+# Indicador: Media Movil Simple (SMA)
+
+def Media_Movil_Simple(df: pd.DataFrame, longitud: int = 21, columna: str = "Close") -> pd.Series:
+
+    """
+La media movil simple (SMA o MA) se utiliza comunmente para identificar la direccion de la tendencia de una accion o para
+determinar sus niveles de soporte y resistencia. Es un indicador de seguimiento de tendencia -o rezagado- porque se basa en
+precios pasados.
+
+Cuanto más largo es el periodo de la media movil, mayor es el rezago. Así que una SMA de 200 dias tendra un mayor grado de rezago que una SMA de 20 dias
+porque contiene precios de los ultimos 200 dias.
+
+Como operarlo:
+
+    Dado que la SMA se utiliza como niveles de soporte y resistencia, la operacion basica es comprar cerca del soporte en
+    tendencias alcistas y vender cerca de la resistencia en tendencias bajistas.
+
+    Operar con solo una SMA puede llevar a malas interpretaciones, y puede ser peligroso. Por eso, operar con SMAs requerira
+    una media movil rapida y una lenta. Si la MA rapida cruza de abajo hacia arriba a la MA lenta, esto indica una oportunidad de compra. Si la MA rapida
+    cruza de arriba hacia abajo a la MA lenta, esto indica una oportunidad de venta.
+
+-----------
+Parametros
+-----------
+
+param : pd.DataFrame : df : Datos Historicos. Tambien acepta un panel con una columna por activo (descarga de varios
+tickers, DataFrame ancho de precios o np.ndarray tiempo x activos) y calcula todos los activos a la vez.
+
+param : int : longitud: Ventana a utilizar en el calculo de la SMA (por defecto, se establece en 21)
+
+param : str: columna: Columna a utilizar en el calculo de la SMA (por defecto, se establece en 'Close'
+
+Salida:
+
+return: pd.Series : Calculo de la Media Movil Simple (un DataFrame por activo en modo panel).
+    """
+
+# Calcular
+    precios = seleccionar_columna(df, columna)
+    MA = precios.rolling(window=longitud, min_periods=longitud).mean()
+    if isinstance(MA, pd.Series):
+        MA.name = "MA"
+
+    return como_entrada(MA, df)
+
+
+# Function to calculate Exponential Moving Average (EMA)
+
+def Media_Movil_Exponencial(df: pd.DataFrame, longitud: int = 26, columna: str = "Close") -> pd.Series:
+    """
+    La Media Móvil Exponencial (ema) es un indicador técnico que rastrea el precio de un activo
+    (como una acción o una mercancía) a lo largo del tiempo. La ema es un tipo de media móvil ponderada (WMA)
+    que otorga mayor peso a los datos de precios más recientes.
+    ----------
+    Parámetros:
+    ----------
+    df : pd.DataFrame
+        Datos históricos del activo. Tambien acepta un panel con una columna por activo (descarga de varios tickers,
+        DataFrame ancho de precios o np.ndarray tiempo x activos) y calcula todos los activos a la vez.
+
+    longitud : int, opcional (por defecto=26)
+        Ventana de tiempo utilizada para calcular la ema.
+
+    columna : str, opcional (por defecto='Close')
+        Columna del DataFrame sobre la cual se calculará la ema.
+
+    ----------
+    Retorna:
+    ----------
+    pd.Series
+        Serie con los valores de la Media Móvil Exponencial (ema). En modo panel, un DataFrame con una columna por activo.
+    """
+
+    precios = seleccionar_columna(df, columna)
+    EMA = precios.ewm(span=longitud, min_periods=longitud, adjust=False).mean()
+    if isinstance(EMA, pd.Series):
+        EMA.name = "EMA"
+
+    return como_entrada(EMA, df)
+
+
+# Indicador: Media Movil Ponderada (WMA)
+
+# Tamaño minimo de bloque del kernel: acota la magnitud de las sumas acumuladas para conservar la precision. Cada
+# bloque vuelve a sumar las longitud - 1 barras anteriores, asi que crece con la ventana (4 * longitud) para que ese
+# solape no domine el coste con ventanas largas.
+_BLOQUE_WMA = 256
+
+
+def _kernel_wma(valores: np.ndarray, longitud: int) -> np.ndarray:
+    """
+    Kernel O(n) de la WMA sobre un arreglo 2-D (tiempo x activos).
+
+    La suma ponderada de cada ventana se obtiene a partir de dos sumas acumuladas (la simple y la ponderada por
+    el indice), en lugar de recorrer cada ventana: W_t = (C2_t - C2_{t-n}) - (t-n) * (C1_t - C1_{t-n}).
+    Se procesa por bloques y se resta un valor de referencia en cada bloque para que las sumas acumuladas no pierdan
+    precision en series largas (la WMA es invariante a desplazamientos porque los pesos suman 1).
+    Las ventanas con algun NaN devuelven NaN, igual que rolling(min_periods=longitud).
+    """
+
+    n = valores.shape[0]
+    WMA = np.full(valores.shape, np.nan)
+    if n < longitud:
+        return WMA
+
+    suma_pesos = longitud * (longitud + 1) / 2
+    nulos = np.isnan(valores)
+    nulos_acumulados = np.concatenate([np.zeros((1,) + valores.shape[1:]), np.cumsum(nulos, axis=0)])
+    x = np.where(nulos, 0.0, valores)
+
+    bloque = max(_BLOQUE_WMA, 4 * longitud)
+    for inicio in range(longitud - 1, n, bloque):
+        fin = min(inicio + bloque, n)
+        tramo = x[inicio - longitud + 1:fin]
+        tramo = tramo - tramo[:1]
+        indice = np.arange(1, tramo.shape[0] + 1, dtype=float).reshape((-1,) + (1,) * (tramo.ndim - 1))
+
+        C1 = np.concatenate([np.zeros((1,) + tramo.shape[1:]), np.cumsum(tramo, axis=0)])
+        C2 = np.concatenate([np.zeros((1,) + tramo.shape[1:]), np.cumsum(indice * tramo, axis=0)])
+        desplazamiento = indice[:fin - inicio] - 1
+
+        suma_ponderada = (C2[longitud:] - C2[:-longitud]) - desplazamiento * (C1[longitud:] - C1[:-longitud])
+        WMA[inicio:fin] = suma_ponderada / suma_pesos + x[inicio - longitud + 1]
+
+    con_nulos = (nulos_acumulados[longitud:] - nulos_acumulados[:-longitud]) > 0
+    WMA[longitud - 1:][con_nulos] = np.nan
+
+    return WMA
+
+
+def Media_Movil_Ponderada(df: Union[pd.DataFrame, np.ndarray], longitud: int = 9,
+                          columna: str = "Close") -> Union[pd.Series, pd.DataFrame, np.ndarray]:
+
+    """
+    La Media Móvil Ponderada(WMA) es un indicador tecnico que asigna un mayor peso a los puntos de datos más recientes,
+    ya que son más relevantes que los puntos de datos en el pasado lejano. La suma de los pesos debe sumar 1. En el caso
+    de la SMA, los pesos están distribuidos por igual.
+
+    Cómo operarlo:
+
+    Las Medias Móviles Ponderadas de 9my 12 días son a menudo las más citadas y analizadas comp promedios a corto plazo.
+    La WMA se opera de la misma manera que la SMA. La principal diferencia entre estas dos es la importancia que la WMA
+    da a los datso más recientes.
+
+    -----------
+    Parámetros
+    -----------
+    para : pd.DataFrame | np.ndarray : df : Datos historicos del activo financiero. Si df[columna] es un DataFrame
+    (por ejemplo, una descarga de varios tickers con yfinance) o df es un DataFrame ancho con una columna por ticker,
+    se calcula la WMA de todos los activos a la vez. Tambien acepta un arreglo de NumPy 1-D o 2-D (tiempo x activos);
+    en ese caso se ignora la columna.
+    -----------
+    param : int : Longitud : Ventana a utilizar en el cálculo de la WMA (por defecto, se establece en 9).
+
+    -----------
+    param: str: columna : Columna a utilizar en el cálculo de la WMA (por defecto, se establece en 'Close').
+    -----------
+
+    Salidas:
+    -----------
+    return : pd.Series | pd.DataFrame | np.ndarray : Calculo de la Media Movil Ponderada, con la misma forma que la entrada.
+    """
+
+# Calcular
+
+    if isinstance(df, np.ndarray):
+        valores = np.asarray(df, dtype=float)
+        return _kernel_wma(valores.reshape(valores.shape[0], -1), longitud).reshape(valores.shape)
+
+    df = seleccionar_columna(df, columna)
+    valores = df.to_numpy(dtype=float)
+    WMA = _kernel_wma(valores.reshape(valores.shape[0], -1), longitud)
+
+    if isinstance(df, pd.DataFrame):
+        return pd.DataFrame(WMA, index=df.index, columns=df.columns)
+
+    WMA = pd.Series(WMA[:, 0], index=df.index, name="WMA")
+
+    return WMA
+
+
+# Indicador/Estrategia: Cruce de Medias Moviles
+def Cruce_Medias_Moviles(df: pd.DataFrame, longitud_rapida: int = 9, longitud_lenta: int = 26, columna: str = "Close") -> pd.DataFrame:
+
+    """
+    El cruce de Medias Moviles es un indicador tecnico que utiliza dos medias moviles como estrategia. Es un buen ejemplo de las
+    denominadas estrategias tradicionales. Las estrategias tradicionales estan siempre en largo o en corto, lo que significa que
+    nunca estan fuera del mercado.
+
+    Como operarlo:
+
+    Operar con el cruce de Medias Moviles es bastante simple. Si la Media Movil Rapida cruza de abajo hacia arriba la Media Movil Lenta,
+    esto significa una oportunidad de compra. Si la Media Movil Rapida cruza de arriba hacia abajo a la Media Movil Lenta,
+    esto significa una oportunidad de venta. El cruce de Medias Moviles a menudo se utiliza junto con otros indicadores para evitar señales
+    falsas en mercados de baja volatilidad.
+
+    Parametros:
+    -----------
+    param: pd.DataFrame: df: Datos del intrumento financiero. Tambien acepta un panel con una columna por activo (descarga de varios
+    tickers, DataFrame ancho de precios o np.ndarray tiempo x activos) y calcula todos los activos a la vez.
+    -----------
+    param: int : Longitud_rapida: Ventana rapida a utilizar en el calculo del CMM (por defecto, se establece en 9).
+    -----------
+    param: int: Longitud_Lenta: Ventana lenta a utilizar en el cálculo del CMM (por defecto, se establece 26).
+    -----------
+    param: str: columna : Columna a utilizar en el cálculo del CMM (por defecto, se establece 'Close').
+    ----------
+    Salida:
+    ----------
+    return : pd.DataFrame : Cálculo del cruce de Medias Moviles. En modo panel las columnas son un MultiIndex
+    (indicador, ticker).
+
+    """
+
+    # Calcular
+
+    columna_precio = seleccionar_columna(df, columna)
+    SMA_Rapida = columna_precio.rolling(window=longitud_rapida, min_periods=longitud_rapida).mean()
+    SMA_Rapida_S = SMA_Rapida.shift(periods=1)
+    SMA_Lenta = columna_precio.rolling(window=longitud_lenta, min_periods=longitud_lenta).mean()
+    SMA_Lenta_S = SMA_Lenta.shift(periods=1)
+
+    # Cruce (1: cruce alcista, -1: cruce bajista, 0: sin cruce)
+    alcista = (SMA_Rapida > SMA_Lenta) & (SMA_Lenta_S > SMA_Rapida_S)
+    bajista = (SMA_Rapida < SMA_Lenta) & (SMA_Lenta_S < SMA_Rapida_S)
+    Cruce = alcista.astype(int) - bajista.astype(int)
+
+    MAC = pd.concat({"SMA_Rapida": SMA_Rapida, "SMA_Lenta": SMA_Lenta, "Cruce": Cruce}, axis=1)
+
+    return MAC
+
+
+# Suavizado de Wilder (RMA)
+
+def Suavizado_Wilder(valores: np.ndarray, longitud: int, suma: bool = False, semilla: Optional[np.ndarray] = None,
+                     salida: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Media movil de Wilder (RMA) sobre el eje 0 de un arreglo 1-D o 2-D (tiempo x activos), calculada para todos los
+    activos a la vez con un filtro recursivo compilado (scipy.signal.lfilter) en lugar de un bucle de Python.
+
+    El valor inicial se coloca en la fila longitud - 1 y es la suma (suma=True) o la media de las primeras `longitud`
+    filas, salvo que se indique otra `semilla`. A partir de ahi:
+
+        suma=False : y_t = y_(t-1) * (1 - 1 / longitud) + x_t / longitud
+        suma=True  : y_t = y_(t-1) * (1 - 1 / longitud) + x_t
+
+    Las filas anteriores a la semilla quedan en NaN.
+
+    param : np.ndarray : valores : Serie o panel a suavizar.
+    param : int : longitud : Ventana del suavizado.
+    param : bool : suma : Usar la forma de suma suavizada en lugar de la media (por defecto, False).
+    param : np.ndarray : semilla : Valor inicial por activo (opcional).
+    param : np.ndarray : salida : Arreglo preasignado con la forma de `valores` donde escribir el resultado (opcional).
+
+    return : np.ndarray : Serie o panel suavizado.
+    """
+
+    from scipy.signal import lfilter
+
+    valores = np.asarray(valores, dtype=float)
+    if salida is None:
+        salida = np.empty(valores.shape)
+    salida[:] = np.nan
+    if valores.shape[0] < longitud:
+        return salida
+
+    if semilla is None:
+        semilla = valores[:longitud].sum(axis=0) if suma else valores[:longitud].mean(axis=0)
+    factor = 1 - 1 / longitud
+    peso = 1.0 if suma else 1 / longitud
+
+    salida[longitud - 1] = semilla
+    estado = factor * np.asarray(semilla, dtype=float).reshape((1,) + valores.shape[1:])
+    salida[longitud:] = lfilter([peso], [1.0, -factor], valores[longitud:], axis=0, zi=estado)[0]
+
+    return salida
+
+
+# Indicador: Indice de Movimiento Direccional
+
+def Indice_Movimiento_Direccional(df: pd.DataFrame, suavizado_ADX: int = 14, longitud_DI: int = 14) -> pd.DataFrame:
+    """
+    El Indice de Movimiento Direccional (DMI) es un indicador que indentifica en que direccion se esta moviendo el precio
+    de un activo. El indicador hace esto comparando los maximos y minimos previos y dibujando dos lineas: una linea de movimiento direccional positivo (+DI) y una linea
+    de movimiento direccional negativo (-DI). Se añade una tercera linea, llamada indice Direccional Promedio (ADX), para medir la fuerza de la tendencia alcista o bajista.
+
+    Como Operarlo:
+
+    Cuando +DI esta por encima de -DI, hay más presion alcista que bajista en el precio. Por el contrario, si -DI está por encima de +DI, entonces hay más presionbahista
+    sobre el precio. Este indicador puede ayudar a evaluar la dirección de la tendencia. Los cruces entre las Lineas tambien se utilizan a veces como señales de compra y venta.
+
+    ----------------
+    Parametros:
+    ----------------
+    param: pd.DataFrame: df: Datos historicos del intrumento financiero. Si df["High"] es un DataFrame (descarga de
+    varios tickers con yfinance) se calculan todos los activos a la vez.
+    ----------------
+    param: int : suavizado_ADX : Ventana a utilizar en el cálculo de los Movimientos Direccionales (+DM y -DM) (por defecto, se establece en 14).
+    ----------------
+    param : int : Longitud_DI : Ventana a utilizar en el cálculo de los indicadores Direccionales (+DI y -DI) (por defecto, se establece en 14).
+    ---------------
+    Salida:
+    ---------------
+    return : pd.DataFrame: Cálculo del Indice de Movimiento Direccional (columnas ADX, +DI y -DI). Con varios tickers
+    las columnas son un MultiIndex (indicador, ticker).
+
+    """
+
+
+# Preparar los precios como arreglos 2-D (tiempo x activos)
+
+    panel = isinstance(df["High"], pd.DataFrame)
+    High, Low, Close = (df[c].to_numpy(dtype=float).reshape(df.shape[0], -1) for c in ("High", "Low", "Close"))
+
+# Calcular el Rango Verdadero
+
+    prev_clo = np.vstack([np.full((1, Close.shape[1]), np.nan), Close[:-1]])
+    TR = np.maximum(High - Low, np.maximum(np.abs(High - prev_clo), np.abs(prev_clo - Low)))
+
+# Calcular los Movimientos Direccionales (+DM y -DM)
+
+    pre_PDM = High[1:] - High[:-1]
+    pre_MDM = Low[:-1] - Low[1:]
+    plus_DM = np.where((pre_PDM > pre_MDM) & (pre_PDM > 0), pre_PDM, 0.0)
+    minus_DM = np.where((pre_MDM > pre_PDM) & (pre_MDM > 0), pre_MDM, 0.0)
+
+# Calcular las sumas suavizadas de TR, +DM y -DM utilizando el metodo Wilder (desde la barra suavizado_ADX)
+
+    TRL = Suavizado_Wilder(TR[1:], suavizado_ADX, suma=True)[suavizado_ADX - 1:]
+    PDML = Suavizado_Wilder(plus_DM, suavizado_ADX, suma=True)[suavizado_ADX - 1:]
+    MDML = Suavizado_Wilder(minus_DM, suavizado_ADX, suma=True)[suavizado_ADX - 1:]
+
+# Calcular los indicadores Direccionales (+DI y -DI)
+
+    PDI = PDML / TRL * 100
+    MDI = MDML / TRL * 100
+
+# Calcular el indice Direccional (DX)
+
+    DX = np.abs(PDI - MDI) / (PDI + MDI) * 100
+
+# Calcular el indice Direccional Promedio (ADX) utilizando la longitud_DI
+
+    ADX = Suavizado_Wilder(DX, longitud_DI, semilla=DX[:suavizado_ADX].mean(axis=0))
+
+    indice = df.index[suavizado_ADX:]
+    if panel:
+        columnas = df["High"].columns
+        return pd.concat({"ADX": pd.DataFrame(ADX, index=indice, columns=columnas),
+                          "+DI": pd.DataFrame(PDI, index=indice, columns=columnas),
+                          "-DI": pd.DataFrame(MDI, index=indice, columns=columnas)}, axis=1)
+
+    return pd.DataFrame({"ADX": ADX[:, 0], "+DI": PDI[:, 0], "-DI": MDI[:, 0]}, index=indice)
+
+
+# Indicador: Convergencia-Divergencia de Promedios Moviles (MACD)
+
+def MACD(df: pd.DataFrame, longitud_rapida: int = 12, longitud_lenta: int = 26, longitud_señal: int = 9,
+         columna: str = "Close") -> pd.DataFrame:
+    """
+    La Convergencia-Divergencia de Promedios Moviles (MACD) es un indicador de seguimiento de tendencias que muestra la relacion entre
+    dos promedios moviles del precio de un activo. El MACD se calcula restando el promedio movil exponencial de largo plazo (usualmente 26 periodos)
+    del promedio movil exponencial de corto plazo (usualmente de 12 periodos).
+
+    Como Operarlo:
+
+        El resultado del calculo es la linea MACD. Un EMA de n-periodos de la MACD, llamada "Linea de señal", se traza sobre la linea MACD,
+        que puede funcionar como un desencadenante para señales de compra y venta. Los traders pueden comprar el activo cuando la MACD cruza por encima de su
+        linea de señal y vender en corto plazo cuando la MACD cruza por debajo de la linea de señal.
+
+        -------------
+        Parametros:
+
+        ------------
+        param : pd.Dataframe: df: Datos del intrumento o activo financiero. Tambien acepta un panel con una columna
+        por activo (descarga de varios tickers, DataFrame ancho de precios o np.ndarray tiempo x activos); en ese caso
+        las columnas del resultado son un MultiIndex (MACD/Señal, ticker).
+        ------------
+        param: int: Longitud:rapida: Ventana rapida a utilizar en el calculo del MACD (por defecto, se establece en 12).
+        ------------
+        param: int : Longitud_lenta: Ventana lenta a utilizar en el calculo del MACD (por defecto, se establece en 26).
+        -----------
+        param: int: longitud_señal: Ventana de la señal a utilizar en el calculo del MACD (por defecto, se establece en 9).
+        -----------
+        param : str: columna : Columna a utilizar en el calculo del MACD (por defecto, se establece en "close").
+        -----------
+        salida:
+        -----------
+        return: pd.DataFrame: Calculo de la convergencia-divergencia de Promedios Moviles.
+
+    """
+
+    # Calcular los promedios moviles exponenciales
+
+    precios = seleccionar_columna(df, columna)
+    MA_Rapida = precios.ewm(span=longitud_rapida, min_periods=longitud_rapida, adjust=False).mean()
+    MA_Lenta = precios.ewm(span=longitud_lenta, min_periods=longitud_lenta, adjust=False).mean()
+
+    #Determinar la linea MACD como la diferencia entre el EMA corto y el EMA largo
+    MACD_d = MA_Rapida - MA_Lenta
+
+    #Calcular la linea de señal como el EMA de la linea MACD
+    señal = MACD_d.ewm(span=longitud_señal, min_periods=longitud_señal, adjust=False).mean()
+    MACD = pd.concat({"MACD": MACD_d, "Señal": señal}, axis=1)
+
+    return como_entrada(MACD, df)
+
+
+# Indicador: Indice de Canal de Materias Primas (CCI)
+
+# Numero de ventanas que se procesan a la vez: acota la memoria temporal del calculo de la desviacion media.
+_BLOQUE_CCI = 65536
+
+
+def _desviacion_media_movil(valores: np.ndarray, longitud: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula la media movil y la desviacion media absoluta movil de una serie (1-D) o de un panel tiempo x activos (2-D)
+    sin llamar a Python en cada ventana.
+
+    Las ventanas se obtienen con sliding_window_view (una vista, sin copiar datos) y se reducen por bloques de
+    _BLOQUE_CCI ventanas con operaciones vectorizadas de NumPy. Las ventanas incompletas o con NaN devuelven NaN.
+    """
+
+    media = np.full(valores.shape, np.nan)
+    desviacion = np.full(valores.shape, np.nan)
+    if valores.shape[0] < longitud:
+        return media, desviacion
+
+    ventanas = sliding_window_view(valores, longitud, axis=0)
+    for inicio in range(0, ventanas.shape[0], _BLOQUE_CCI):
+        bloque = ventanas[inicio:inicio + _BLOQUE_CCI]
+        media_bloque = bloque.mean(axis=-1)
+        fila = inicio + longitud - 1
+        media[fila:fila + bloque.shape[0]] = media_bloque
+        desviacion[fila:fila + bloque.shape[0]] = np.abs(bloque - media_bloque[..., None]).mean(axis=-1)
+
+    return media, desviacion
+
+
+def CCI(df: pd.DataFrame, longitud: Union[int, Sequence[int]] = 20,
+        constante: float = 0.015) -> Union[pd.Series, pd.DataFrame]:
+    """
+    El indice de Canal de materias primas (CCI) es un indicador tecnico utilizado para determinar cuando el precio de un activo esta
+    alcanzando niveles de sobrecompra o sobreventa. Evalua la direccion y fuerza de la tendencia de precio, permitiendo traders
+    determinar cuando entrar o salir de una operacion.
+
+    Como operarlo:
+
+        El CCI es un oscilador sin limites, lo que signifca que puede subir o bajar indefinidamente. Por esta razon, los nivles de
+        sobrecompra y sobreventa se determinan tipicamente para cada activo mirando los niveles extremos historicos del CCI
+        donde el precio se revirtio.
+
+    Parametros:
+    ------------
+
+    :param : pd.DataFrame: df: Datos historicos del activo financiero. Si es una descarga de varios tickers
+             (df["High"] es un DataFrame) se calculan todos los activos a la vez.
+    :param : int | list[int] :longitud: Ventana a utilizar en el calculo del CCI (por defecto, se establece en 20).
+             Si se pasa una lista de ventanas, se calculan todas en una sola llamada reutilizando el precio tipico.
+    :param : float : constante : Constante multiplicadora (por defecto, se establece en 0.0015).
+    Salida:
+    -------
+    :return: pd.Series | pd.DataFrame : Calculo del indice de canal de materias primas. Con varias ventanas se devuelve
+             un DataFrame con una columna "CCI_<longitud>" por ventana. En modo panel se devuelve un DataFrame con una
+             columna por ticker, o con columnas MultiIndex (CCI_<longitud>, ticker) si hay varias ventanas.
+    """
+
+    # Calcular el Precio Tipico
+
+    precio_tipico = (df["High"] + df["Low"] + df["Close"]) / 3
+    valores = precio_tipico.to_numpy(dtype=float)
+
+    longitudes = [longitud] if isinstance(longitud, (int, np.integer)) else list(longitud)
+    resultados = {}
+    for ventana in longitudes:
+        media, desviacion_media = _desviacion_media_movil(valores, ventana)
+        resultados[f"CCI_{ventana}"] = (valores - media) / (constante * desviacion_media)
+
+    if isinstance(precio_tipico, pd.DataFrame):
+        resultados = {nombre: pd.DataFrame(valores_cci, index=df.index, columns=precio_tipico.columns)
+                      for nombre, valores_cci in resultados.items()}
+        if isinstance(longitud, (int, np.integer)):
+            return resultados[f"CCI_{longitud}"]
+        return pd.concat(resultados, axis=1)
+
+    if isinstance(longitud, (int, np.integer)):
+        CCI_ = pd.Series(resultados[f"CCI_{longitud}"], index=df.index, name="CCI")
+        return CCI_
+
+    return pd.DataFrame(resultados, index=df.index)
+
+
+# Indicador: Nube Ichimoku
+
+def Ichimoku_Cloud(df: pd.DataFrame, periodo_tenkan: int = 9, periodo_kijun: int = 26,
+                   offset: bool = False) -> pd.DataFrame:
+    """
+    El Ichimoku Cloud es una coleccion de indicadores tecnicos que muestran niveles de soporte y resistencia, asi como direccion y momento de la tendencia.
+    Calcula multiples promedios y traza una "nube" para pronosticar donde el precio puede encontrar soporte o resistencia en el futuro.
+
+    Comom Operarlo:
+
+    La tendencia general es alcista cuando el precio esta por encima de la nube (posiciones Largas), bajista cuando el precio esta por debajo
+    de la nube (posiciones cortas) y sin tendencia o en transicion cuando el precio esta en la nube.
+
+    Cuando el Span A (Senkou Span A) esta en aumento por encima del Span B (Senkou Span B), esto ayuda a confirmar la
+    tendencia alcista y el espacio entre las lineas se colorea tipicamente verde. Cuando el Span A esta en disminucion
+    y por debajo del Span B, esto confirma la tendencia Bajista y el espacio entre las lineas se colorea rojo.
+
+    -------------
+    Parametros:
+    -------------
+    :param: pd.DataFrame: df: Datos activo. Si es una descarga de varios tickers (df["High"] es un DataFrame) se
+        calculan todos los activos a la vez y las columnas del resultado son un MultiIndex (linea, ticker).
+    :param : int: periodo_tenkan: Ventana a utilizar en el calculo de Ichimoku Cloud (por defecto, se establece en 9).
+    :param : int: periodo_kijun: Ventana a utilizar en el calculo de  Ichimoku Cloud ( por defecto, se establece en 26).
+    :param : bool: Offset: Mostrar datos desplazados (por defecto, se establece False).
+
+    Saluda:
+    --------
+    :return: pd.DataFrame : Calculo de Ichimoku Cloud.
+    """
+
+    # Calcular
+
+    High, Low = df["High"], df["Low"]
+
+    # Minimos y maximos moviles de las tres ventanas en una sola pasada (ver algotrading/extremos.py)
+    longitudes = [periodo_tenkan, periodo_kijun, periodo_kijun * 2]
+    rolling_min = minimos_moviles(Low, longitudes)
+    rolling_max = maximos_moviles(High, longitudes)
+
+    # Tenkan Sen: Linea de Señal a corto plazo
+    rolling_min_tenkan = rolling_min[periodo_tenkan]
+    rolling_max_tenkan = rolling_max[periodo_tenkan]
+    tenkan_sen = (rolling_max_tenkan + rolling_min_tenkan) / 2
+
+    # Kijun Sen: Linea de señal a largo plazo
+    rolling_min_kijun = rolling_min[periodo_kijun]
+    rolling_max_kijun = rolling_max[periodo_kijun]
+    kijun_sen = (rolling_max_kijun + rolling_min_kijun) / 2
+
+    # Senkou Span A - Nube
+    senkou_span_a = ((tenkan_sen + kijun_sen) / 2)
+
+    # Senkou Span B - Nube
+
+    rolling_min_senkou = rolling_min[periodo_kijun * 2]
+    rolling_max_senkou = rolling_max[periodo_kijun * 2]
+    senkou_span_b = ((rolling_min_senkou + rolling_max_senkou) / 2)
+
+    # Chikou Span: Linea de confirmacion
+
+    chikou_span = df["Close"].shift(periods=-periodo_kijun)
+
+    # Desplazar los Span para la nube
+
+    if not offset:
+        senkou_span_a = senkou_span_a.shift(periods=periodo_kijun)
+        senkou_span_b = senkou_span_b.shift(periods=periodo_kijun)
+
+    # Crear un DataFrame con los resultados
+
+    IC = pd.concat({"tenkan_sen": tenkan_sen, "kijun_sen": kijun_sen, "senkou_span_a": senkou_span_a,
+                    "senkou_span_b": senkou_span_b, "chinkou_span": chikou_span}, axis=1)
+
+    return IC
+
+
+# Motor del SAR Parabolico para varios activos
+
+# A partir de este numero de activos conviene recorrer el tiempo una sola vez operando sobre todos los activos a la vez.
+_MIN_ACTIVOS_VECTORIAL = 64
+
+
+def _psar_activo(High: np.ndarray, Low: np.ndarray, Close: np.ndarray, incremento: float, max_paso: float,
+                 psar: np.ndarray, alcista: np.ndarray, reversion: np.ndarray,
+                 estado: Optional[Tuple[bool, float, float, float]] = None) -> Tuple[bool, float, float, float]:
+    """
+    Maquina de estados del PSAR para un solo activo (bucle escalar sobre listas de Python). Escribe en los buffers
+    psar, alcista y reversion (1-D) sin modificar los precios de entrada.
+
+    Para continuar un calculo ya empezado (algotrading.bloques) se pasa el estado devuelto por la llamada anterior
+    (up_trend, up_trend_high, down_trend_low, acc_factor), con las dos ultimas barras de esa llamada al principio de
+    High y Low y sus dos ultimos PSAR en lugar del Close.
+    """
+
+    High, Low = High.tolist(), Low.tolist()
+    valores = Close.tolist()
+
+    # Inicializar variables
+    if estado is None:
+        estado = (True, High[0], Low[0], incremento)
+    up_trend, up_trend_high, down_trend_low, acc_factor = estado
+
+    for i in range(2, len(valores)):
+        reversal = False
+        max_high = High[i]
+        min_low = Low[i]
+
+        # Tendencia Alcista
+        if up_trend:
+            valor = valores[i - 1] + (acc_factor * (up_trend_high - valores[i - 1]))
+            if min_low < valor:  # Verificar si hay reversion a tendencia bajista
+                reversal = True
+                valor = up_trend_high
+                down_trend_low = min_low
+                acc_factor = incremento
+            elif max_high > up_trend_high:  # Actualizar el maximo en tendencia alcista
+                up_trend_high = max_high
+                acc_factor = min(acc_factor + incremento, max_paso)
+                if Low[i - 2] < valor:  # Asegurarnos que el PSAR no está por encima de los precios más bajos recientes.
+                    valor = Low[i - 2]
+                elif Low[i - 1] < valor:
+                    valor = Low[i - 1]
+
+        # Tendencia Bajista
+        else:
+            valor = valores[i - 1] - (acc_factor * (valores[i - 1] - down_trend_low))
+            if max_high > valor:  # Verificar si hay reversion a tendencia alcista
+                reversal = True
+                valor = down_trend_low
+                up_trend_high = max_high
+                acc_factor = incremento
+            elif min_low < down_trend_low:  # actualizar el minimo en tendencia bajista
+                down_trend_low = min_low
+                acc_factor = min(acc_factor + incremento, max_paso)
+                if High[i - 2] > valor:  # Asegurarnos que el PSAR no está por debajo de los precios más altos recientes.
+                    valor = High[i - 2]
+                elif High[i - 1] > valor:
+                    valor = High[i - 1]
+
+        up_trend = up_trend != reversal
+        valores[i] = valor
+        alcista[i] = up_trend
+        reversion[i] = reversal
+
+    psar[:] = valores
+
+    return up_trend, up_trend_high, down_trend_low, acc_factor
+
+
+def _psar_panel(High: np.ndarray, Low: np.ndarray, Close: np.ndarray, incremento: float, max_paso: float,
+                psar: np.ndarray, alcista: np.ndarray, reversion: np.ndarray) -> None:
+    """
+    Maquina de estados del PSAR para un panel (tiempo x activos). Recorre el tiempo una sola vez y actualiza el estado
+    de todos los activos con operaciones vectorizadas, por lo que el costo en Python no crece con el numero de activos.
+    """
+
+    n, m = High.shape
+    psar[:2] = Close[:2]
+
+    up_trend = np.ones(m, dtype=bool)
+    up_trend_high = High[0].copy()
+    down_trend_low = Low[0].copy()
+    acc_factor = np.full(m, incremento)
+
+    for i in range(2, n):
+        anterior = psar[i - 1]
+        max_high, min_low = High[i], Low[i]
+
+        valor = np.where(up_trend, anterior + acc_factor * (up_trend_high - anterior),
+                         anterior - acc_factor * (anterior - down_trend_low))
+
+        # Reversiones de tendencia
+        reversal = np.where(up_trend, min_low < valor, max_high > valor)
+        valor = np.where(reversal, np.where(up_trend, up_trend_high, down_trend_low), valor)
+
+        # Nuevos extremos sin reversion
+        nuevo_max = up_trend & ~reversal & (max_high > up_trend_high)
+        nuevo_min = ~up_trend & ~reversal & (min_low < down_trend_low)
+        limite_alcista = np.where(Low[i - 2] < valor, Low[i - 2], np.where(Low[i - 1] < valor, Low[i - 1], valor))
+        limite_bajista = np.where(High[i - 2] > valor, High[i - 2], np.where(High[i - 1] > valor, High[i - 1], valor))
+        valor = np.where(nuevo_max, limite_alcista, np.where(nuevo_min, limite_bajista, valor))
+
+        # Actualizar el estado
+        down_trend_low = np.where((reversal & up_trend) | nuevo_min, min_low, down_trend_low)
+        up_trend_high = np.where((reversal & ~up_trend) | nuevo_max, max_high, up_trend_high)
+        acc_factor = np.where(reversal, incremento,
+                              np.where(nuevo_max | nuevo_min, np.minimum(acc_factor + incremento, max_paso), acc_factor))
+        up_trend = up_trend != reversal
+
+        psar[i] = valor
+        alcista[i] = up_trend
+        reversion[i] = reversal
+
+
+def SAR_Parabolico_Multiactivo(High: np.ndarray, Low: np.ndarray, Close: np.ndarray, incremento: float = 0.02,
+                               max_paso: float = 0.20, psar: Optional[np.ndarray] = None,
+                               alcista: Optional[np.ndarray] = None,
+                               reversion: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcula el SAR Parabolico de N activos a la vez sobre arreglos 2-D (tiempo x activos). Los precios de entrada no
+    se modifican: los resultados se escriben en buffers separados, que pueden pasarse ya asignados (por ejemplo, en
+    memoria compartida entre procesos). Close solo se usa como valor inicial del PSAR en las dos primeras barras.
+
+    param : np.ndarray : High, Low, Close : Precios del panel (tiempo x activos).
+    param : float : incremento : Incremento del factor de aceleracion (por defecto, 0.02).
+    param : float : max_paso : Factor de aceleracion maximo (por defecto, 0.20).
+    param : np.ndarray : psar : Buffer float de salida para el PSAR (opcional).
+    param : np.ndarray : alcista : Buffer bool de salida con la tendencia alcista en cada barra (opcional).
+    param : np.ndarray : reversion : Buffer bool de salida, True en las barras donde se revierte la tendencia (opcional).
+
+    return : Tuple[np.ndarray, np.ndarray, np.ndarray] : psar, alcista y reversion.
+    """
+
+    # Los precios float32 (modo compacto) se usan tal cual; cualquier otro tipo se convierte a float64
+    High, Low, Close = (x if isinstance(x, np.ndarray) and x.dtype == np.float32 else np.asarray(x, dtype=float)
+                        for x in (High, Low, Close))
+    psar = np.empty(High.shape) if psar is None else psar
+    alcista = np.zeros(High.shape, dtype=bool) if alcista is None else alcista
+    reversion = np.zeros(High.shape, dtype=bool) if reversion is None else reversion
+    psar[:2] = Close[:2]
+    alcista[:2] = True
+    reversion[:2] = False
+
+    if High.shape[0] > 2:
+        if High.ndim == 2 and High.shape[1] >= _MIN_ACTIVOS_VECTORIAL:
+            _psar_panel(High, Low, Close, incremento, max_paso, psar, alcista, reversion)
+        elif High.ndim == 2:
+            for j in range(High.shape[1]):
+                _psar_activo(High[:, j], Low[:, j], Close[:, j], incremento, max_paso,
+                             psar[:, j], alcista[:, j], reversion[:, j])
+        else:
+            _psar_activo(High, Low, Close, incremento, max_paso, psar, alcista, reversion)
+
+    return psar, alcista, reversion
+
+
+# Indicador: SAR Parabolico
+def Parabolic_SAR(df: pd.DataFrame, incremento: float = 0.02, max_paso: float = 0.20) -> pd.DataFrame:
+    """
+    El indicador Parabolic SAR (Stop and Reverse) se usa para determinar la direccion de la tendencia y posibles
+    reversales en el precio. El SAR Parabolico utiliza un metodo de stop para indentificar puntos adecuados en la entrada
+    y salida.
+
+    Como Operarlo:
+
+    El PSAR genera señales de compra y venta cuando la posicion de los puntos se mueve de un lado del precio del activo
+    al otro. Por ejemplo, una señal de compra ocurre cuando los puntos se mueven de arriba del precio abajo del precio,
+    mientras que una señal de venta ocurre cuando los puntos se mueven de abajo del precio a arriba del precio.
+
+    Los puntos del PSAR se utilizan para establecer ordenes de stop loss en tendencia. Si el precio esta subiendo y el PSAR
+    tambien esta subiendo, el PSAR puede usarse como una posible salida si estas en una posicion larga. Si el precio cae por debajo del PSAR
+    sal de la operacion larga.
+
+    ------------
+    Parametros:
+    -----------
+    param : pd.DataFrame : df: Datos del activo. Si df["High"] es un DataFrame (descarga de varios tickers con yfinance)
+    se calculan todos los activos a la vez. El DataFrame de entrada no se modifica.
+    -----------
+    param: float: incremento: Incremento maximo a utilizar en el cálculo del Parabolic SAR (por defecto, se establece en 0.2)
+    ----------
+    param: float: max_paso : Paso máximo a utilizar en el cálculo del Parabolic SAR (por defecto, se establece en 0.20).
+    ---------
+    Salida:
+    ---------
+    return: pd.DataFrame : Cálculo del SAR Parabolico (columnas PSAR, UpTrend, DownTrend y Reversion). Con varios
+    tickers las columnas son un MultiIndex (indicador, ticker).
+    """
+
+    # Calculo
+
+    panel = isinstance(df["High"], pd.DataFrame)
+    High, Low, Close = (df[c].to_numpy(dtype=float).reshape(df.shape[0], -1) for c in ("High", "Low", "Close"))
+    psar, alcista, reversion = SAR_Parabolico_Multiactivo(High, Low, Close, incremento, max_paso)
+
+    # Asignar los valores de PSAR a las respectivas tendencias (las dos primeras barras no tienen tendencia)
+
+    calculado = (np.arange(psar.shape[0]) >= 2)[:, None]
+    psar_up = np.where(alcista & calculado, psar, np.nan)
+    psar_down = np.where(~alcista & calculado, psar, np.nan)
+
+    if panel:
+        columnas = df["High"].columns
+        return pd.concat({"PSAR": pd.DataFrame(psar, index=df.index, columns=columnas),
+                          "UpTrend": pd.DataFrame(psar_up, index=df.index, columns=columnas),
+                          "DownTrend": pd.DataFrame(psar_down, index=df.index, columns=columnas),
+                          "Reversion": pd.DataFrame(reversion, index=df.index, columns=columnas)}, axis=1)
+
+    return pd.DataFrame({"PSAR": psar[:, 0], "UpTrend": psar_up[:, 0], "DownTrend": psar_down[:, 0],
+                         "Reversion": reversion[:, 0]}, index=df.index)
@@ -0,0 +1,200 @@
+"""
+Ingesta masiva de barras OHLCV para un universo de tickers.
+
+Es la version en lote del paso de descarga de "01-Descargar Datos Historicos.py": reparte los pares (ticker, intervalo)
+entre un grupo acotado de hilos, limita la frecuencia de peticiones al proveedor con un token bucket, reintenta los
+errores con espera exponencial y guarda el progreso en disco para poder reanudar una ingesta interrumpida. Cada
+descarga pasa por la cache incremental de algotrading.descargas, asi que solo se piden los tramos que faltan.
+
+Uso desde la linea de comandos:
+
+    python -m algotrading.ingesta --tickers AAPL TSLA BTC-USD --intervalos 1d 1h --inicio 2020-01-01
+    python -m algotrading.ingesta --archivo-tickers universo.txt --trabajadores 16 --tasa 4
+"""
+
+# Importar librerias
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from algotrading.almacen import RUTA_ALMACEN, Fecha
+from algotrading.descargas import ProveedorDatos, descargar, proveedor_por_defecto
+
+
+class LimitadorTasa:
+    """
+    Token bucket compartido entre hilos: se reponen `tasa` fichas por segundo hasta un maximo de `capacidad`, y cada
+    peticion consume una ficha (esperando si no hay ninguna disponible).
+    """
+
+    def __init__(self, tasa: float, capacidad: Optional[float] = None):
+        self.tasa = tasa
+        self.capacidad = capacidad if capacidad is not None else max(1.0, tasa)
+        self._fichas = self.capacidad
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def tomar(self) -> None:
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self._fichas = min(self.capacidad, self._fichas + (ahora - self._ultimo) * self.tasa)
+                self._ultimo = ahora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                espera = (1 - self._fichas) / self.tasa
+            time.sleep(espera)
+
+
+class _ProveedorLimitado(ProveedorDatos):
+    """Envuelve un proveedor para que cada peticion pase por el limitador y se reintente si falla."""
+
+    def __init__(self, proveedor: ProveedorDatos, limitador: LimitadorTasa, reintentos: int, espera_base: float):
+        self.proveedor = proveedor
+        self.limitador = limitador
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self.peticiones = 0
+        self._lock = threading.Lock()
+
+    def descargar(self, ticker: str, inicio: pd.Timestamp, fin: pd.Timestamp, intervalo: str) -> pd.DataFrame:
+        for intento in range(self.reintentos + 1):
+            self.limitador.tomar()
+            with self._lock:
+                self.peticiones += 1
+            try:
+                return self.proveedor.descargar(ticker, inicio, fin, intervalo)
+            except Exception:
+                if intento == self.reintentos:
+                    raise
+                # Espera exponencial con jitter para no reintentar todos los hilos a la vez
+                time.sleep(self.espera_base * 2 ** intento * (0.5 + random.random()))
+
+
+class _Progreso:
+    """Registro en disco de los pares (ticker, intervalo) ya completados para una ingesta dada."""
+
+    def __init__(self, archivo: Optional[str], firma: str):
+        self.archivo = archivo
+        self.firma = firma
+        self.completados = set()
+        self._lock = threading.Lock()
+        if archivo and os.path.exists(archivo):
+            with open(archivo, encoding="utf-8") as f:
+                guardado = json.load(f)
+            if guardado.get("firma") == firma:
+                self.completados = set(guardado["completados"])
+
+    def marcar(self, clave: str) -> None:
+        with self._lock:
+            self.completados.add(clave)
+            if self.archivo:
+                temporal = self.archivo + ".tmp"
+                with open(temporal, "w", encoding="utf-8") as f:
+                    json.dump({"firma": self.firma, "completados": sorted(self.completados)}, f)
+                os.replace(temporal, self.archivo)
+
+
+def ingerir(tickers: Iterable[str], intervalos: Iterable[str] = ("1d",), inicio: Fecha = None, fin: Fecha = None,
+            proveedor: Optional[ProveedorDatos] = None, trabajadores: int = 8, tasa: float = 2.0,
+            reintentos: int = 3, espera_base: float = 1.0, archivo_progreso: Optional[str] = None,
+            ruta: str = RUTA_ALMACEN, verbose: bool = True) -> Dict[str, object]:
+    """
+    Descarga al almacen local todos los pares (ticker, intervalo) de forma concurrente.
+
+    param : Iterable[str] : tickers : Universo de tickers.
+    param : Iterable[str] : intervalos : Intervalos a descargar (por defecto, solo '1d').
+    param : str | pd.Timestamp : inicio, fin : Rango de fechas, como en descargar().
+    param : ProveedorDatos : proveedor : Origen de los datos (por defecto, Yahoo Finance).
+    param : int : trabajadores : Numero maximo de descargas simultaneas (por defecto, 8).
+    param : float : tasa : Peticiones por segundo permitidas al proveedor (por defecto, 2).
+    param : int : reintentos : Reintentos por peticion fallida (por defecto, 3).
+    param : float : espera_base : Segundos de espera antes del primer reintento; se duplica en cada intento.
+    param : str : archivo_progreso : JSON con los pares completados para reanudar la ingesta (opcional).
+    param : str : ruta : Carpeta raiz del almacen (por defecto, datos/ohlcv).
+    param : bool : verbose : Imprimir el avance y el resumen final.
+
+    return : dict : Resumen con completados, fallidos (y su error), omitidos, peticiones, segundos y simbolos_por_minuto.
+    """
+
+    proveedor = _ProveedorLimitado(proveedor_por_defecto if proveedor is None else proveedor,
+                                   LimitadorTasa(tasa), reintentos, espera_base)
+    tickers, intervalos = list(dict.fromkeys(tickers)), list(intervalos)
+    progreso = _Progreso(archivo_progreso, json.dumps([str(inicio), str(fin), sorted(intervalos)]))
+
+    pendientes = [(t, i) for t in tickers for i in intervalos if f"{t}|{i}" not in progreso.completados]
+    omitidos = len(tickers) * len(intervalos) - len(pendientes)
+    fallidos: Dict[str, str] = {}
+    completados: List[str] = []
+
+    def tarea(ticker: str, intervalo: str) -> None:
+        descargar(ticker, inicio, fin, intervalo, proveedor=proveedor, ruta=ruta)
+
+    comienzo = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=trabajadores) as grupo:
+        futuros = {grupo.submit(tarea, t, i): f"{t}|{i}" for t, i in pendientes}
+        for n, futuro in enumerate(as_completed(futuros), start=1):
+            clave = futuros[futuro]
+            try:
+                futuro.result()
+                completados.append(clave)
+                progreso.marcar(clave)
+            except Exception as error:
+                fallidos[clave] = repr(error)
+            if verbose and (n % 100 == 0 or n == len(futuros)):
+                print(f"[{n}/{len(futuros)}] {time.perf_counter() - comienzo:.1f}s")
+
+    segundos = time.perf_counter() - comienzo
+
+    # Una ingesta terminada sin errores no necesita reanudarse: la proxima ejecucion vuelve a recorrer el universo
+    if not fallidos and archivo_progreso and os.path.exists(archivo_progreso):
+        os.remove(archivo_progreso)
+
+    simbolos = len({c.split("|")[0] for c in completados})
+    resumen = {"completados": completados, "fallidos": fallidos, "omitidos": omitidos,
+               "peticiones": proveedor.peticiones, "segundos": segundos,
+               "simbolos_por_minuto": simbolos / segundos * 60 if segundos > 0 else float("nan")}
+
+    if verbose:
+        print(f"Completados: {len(completados)} | Fallidos: {len(fallidos)} | Omitidos: {omitidos} | "
+              f"Peticiones: {proveedor.peticiones} | {resumen['simbolos_por_minuto']:.1f} simbolos por minuto")
+
+    return resumen
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Ingesta masiva de barras OHLCV al almacen local.")
+    parser.add_argument("--tickers", nargs="*", default=[], help="Tickers a descargar.")
+    parser.add_argument("--archivo-tickers", help="Archivo de texto con un ticker por linea.")
+    parser.add_argument("--intervalos", nargs="+", default=["1d"], help="Intervalos (por defecto, 1d).")
+    parser.add_argument("--inicio", help="Fecha inicial (AAAA-MM-DD).")
+    parser.add_argument("--fin", help="Fecha final, excluida (AAAA-MM-DD).")
+    parser.add_argument("--trabajadores", type=int, default=8, help="Descargas simultaneas.")
+    parser.add_argument("--tasa", type=float, default=2.0, help="Peticiones por segundo al proveedor.")
+    parser.add_argument("--reintentos", type=int, default=3, help="Reintentos por peticion fallida.")
+    parser.add_argument("--progreso", default=os.path.join(RUTA_ALMACEN, "progreso_ingesta.json"),
+                        help="Archivo de progreso para reanudar.")
+    args = parser.parse_args(argumentos)
+
+    tickers = list(args.tickers)
+    if args.archivo_tickers:
+        with open(args.archivo_tickers, encoding="utf-8") as f:
+            tickers += [linea.strip() for linea in f if linea.strip() and not linea.startswith("#")]
+    if not tickers:
+        parser.error("Indica al menos un ticker con --tickers o --archivo-tickers")
+
+    os.makedirs(os.path.dirname(args.progreso) or ".", exist_ok=True)
+    ingerir(tickers, args.intervalos, args.inicio, args.fin, trabajadores=args.trabajadores, tasa=args.tasa,
+            reintentos=args.reintentos, archivo_progreso=args.progreso)
+
+
+if __name__ == "__main__":
+    main()
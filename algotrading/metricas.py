@@ -0,0 +1,86 @@
+"""
+Rendimientos y metricas de "01 - ABC del Trading" como funciones importables.
+
+    datos["Rendimiento_Simple"] = rendimiento_simple(datos["Close"])
+    datos["Rendimiento_Logaritmico_Acumulado"] = rendimiento_acumulado(rendimiento_logaritmico(datos["Close"]),
+                                                                       logaritmico=True)
+
+Aceptan una Serie o un DataFrame con una columna por ticker. Para todos los episodios de drawdown, el drawdown movil
+y el tiempo bajo el agua de muchas series a la vez ver algotrading.drawdown.
+"""
+
+# Importar librerias
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from algotrading.drawdown import analizar_drawdowns
+
+Datos = Union[pd.Series, pd.DataFrame]
+
+
+def rendimiento_simple(precios: Datos) -> Datos:
+    """
+    Tasa de cambio porcentual del precio de una barra a la siguiente: precios / precios.shift(1) - 1.
+
+    param : pd.Series | pd.DataFrame : precios : Precios de cierre (una columna por ticker en un DataFrame).
+
+    return : pd.Series | pd.DataFrame : Rendimientos simples (NaN en la primera barra).
+    """
+
+    return precios / precios.shift(periods=1) - 1
+
+
+def rendimiento_logaritmico(precios: Datos) -> Datos:
+    """
+    Diferencia logaritmica del precio de una barra a la siguiente: log(precios / precios.shift(1)). A diferencia del
+    rendimiento simple, es aditivo a lo largo del tiempo.
+
+    param : pd.Series | pd.DataFrame : precios : Precios de cierre (una columna por ticker en un DataFrame).
+
+    return : pd.Series | pd.DataFrame : Rendimientos logaritmicos (NaN en la primera barra).
+    """
+
+    return np.log(precios / precios.shift(periods=1))
+
+
+def rendimiento_acumulado(rendimientos: Datos, logaritmico: bool = False) -> Datos:
+    """
+    Crecimiento total desde la primera barra: (1 + r).cumprod() - 1 para rendimientos simples y exp(r.cumsum()) - 1
+    para rendimientos logaritmicos. Las barras sin rendimiento (NaN) no cambian el acumulado.
+
+    param : pd.Series | pd.DataFrame : rendimientos : Rendimientos simples o logaritmicos.
+    param : bool : logaritmico : Verdadero si los rendimientos son logaritmicos.
+
+    return : pd.Series | pd.DataFrame : Rendimiento acumulado.
+    """
+
+    if logaritmico:
+        return np.exp(rendimientos.cumsum()) - 1
+    return (1 + rendimientos).cumprod() - 1
+
+
+def max_drawdown(rendimientos: pd.Series) -> Tuple[float, pd.Series, pd.Series, pd.Timestamp, pd.Timestamp]:
+    """
+    Calcula la máxima pérdida, el capital acumulado, la serie de drawdown,
+    la fecha del pico previo y la fecha del valle (máximo drawdown).
+
+    Para muchas series a la vez (todos los episodios, drawdown movil, tiempo bajo el agua) ver algotrading.drawdown.
+    """
+    resultado = analizar_drawdowns(rendimientos)
+
+    # Como cumprod, las barras sin rendimiento (NaN) quedan sin capital ni drawdown
+    validos = rendimientos.notna()
+    capital_acumulado, drawdown = resultado.capital.where(validos), resultado.drawdown.where(validos)
+
+    # Valor de máxima pérdida
+    maxima_perdida_valor = drawdown.max()
+
+    # Fecha del valle (primer día donde el drawdown es máximo; sin drawdown, la primera fecha)
+    fecha_valle = drawdown.idxmax()
+
+    # Fecha del pico previo (primer máximo acumulado anterior al valle)
+    fecha_pico = capital_acumulado.loc[:fecha_valle].idxmax()
+
+    return maxima_perdida_valor, capital_acumulado, drawdown, fecha_pico, fecha_valle
@@ -0,0 +1,57 @@
+"""
+Entrada y salida de los indicadores en modo panel (tiempo x activos).
+
+Los indicadores aceptan, ademas del DataFrame de un solo activo:
+
+    - una descarga de varios tickers de yfinance (columnas MultiIndex Price / Ticker): df["Close"] ya es un panel,
+    - un DataFrame ancho de precios con una columna por ticker,
+    - un arreglo de NumPy 2-D (tiempo x activos).
+
+Los calculos de pandas (rolling, ewm, shift, aritmetica) se aplican a todas las columnas a la vez, y el resultado se
+devuelve alineado sobre el mismo indice de fechas.
+"""
+
+# Importar librerias
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+Entrada = Union[pd.DataFrame, pd.Series, np.ndarray]
+
+_COLUMNAS_OHLCV = {"Open", "High", "Low", "Close", "Adj Close", "Volume"}
+
+
+def seleccionar_columna(df: Entrada, columna: str) -> Union[pd.Series, pd.DataFrame]:
+    """
+    Devuelve la serie (un activo) o el panel (varios activos) sobre el que se calcula el indicador.
+
+    param : pd.DataFrame | np.ndarray : df : Datos de entrada en cualquiera de los formatos admitidos.
+    param : str : columna : Columna de precios a utilizar (se ignora para arreglos y DataFrames anchos).
+
+    return : pd.Series | pd.DataFrame : Serie de un activo o panel con una columna por activo.
+    """
+
+    if isinstance(df, np.ndarray):
+        return pd.DataFrame(df) if df.ndim == 2 else pd.Series(df, name=columna)
+    if isinstance(df, pd.Series):
+        return df
+    if columna in df.columns.get_level_values(0):
+        return df[columna]
+    if _COLUMNAS_OHLCV & set(df.columns.get_level_values(0)):
+        raise KeyError(columna)
+
+    # DataFrame ancho: una columna de precios por ticker
+    return df
+
+
+def es_panel(datos: Union[pd.Series, pd.DataFrame]) -> bool:
+    return isinstance(datos, pd.DataFrame)
+
+
+def como_entrada(resultado: Union[pd.Series, pd.DataFrame], df: Entrada):
+    """Si la entrada era un arreglo de NumPy, devuelve el resultado tambien como arreglo (salvo salidas multiples)."""
+
+    if isinstance(df, np.ndarray) and not isinstance(getattr(resultado, "columns", None), pd.MultiIndex):
+        return resultado.to_numpy()
+    return resultado
@@ -0,0 +1,212 @@
+"""
+Reduccion de datos antes de graficar.
+
+Un grafico de 22 pulgadas a 100 dpi tiene unos 2.200 pixeles de ancho: pasarle a mpf.plot, ax.plot o go.Candlestick las
+~900.000 barras de un año de datos de 1 minuto solo hace el dibujo (y el HTML de plotly) mas lento y pesado, sin
+cambiar lo que se ve. Aqui se reduce cada serie al presupuesto de pixeles:
+
+    - Lineas (ax.plot): LTTB (Largest-Triangle-Three-Buckets), que conserva la forma visual, o min/max por cubeta, que
+      conserva exactamente los picos y valles.
+    - Velas (mpf.plot, go.Candlestick): cada cubeta de barras consecutivas se agrega a una vela (Open de la primera
+      barra, High maximo, Low minimo, Close de la ultima y Volume sumado), y los indicadores que se dibujan encima se
+      reducen a las mismas cubetas con reducir_indicador.
+
+    velas = reducir_velas(df, velas=599)
+    ap = [mpf.make_addplot(reducir_indicador(rsi, velas=599), panel=2)]
+    mpf.plot(velas, type="candle", addplot=ap)
+"""
+
+# Importar librerias
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from algotrading.cubetas import ultimo_valido
+
+Datos = Union[pd.Series, pd.DataFrame]
+
+# Numero de velas por defecto: unos 3 pixeles por vela en un grafico de 22 pulgadas a 100 dpi, sin pasar el limite de
+# mpf.plot (warn_too_much_data=599) a partir del cual avisa de que hay demasiados datos
+VELAS_POR_DEFECTO = 599
+
+# Numero de puntos por defecto para las lineas: aproximadamente un punto por pixel
+PUNTOS_POR_DEFECTO = 2000
+
+
+def presupuesto_puntos(figsize: Tuple[float, float] = (22, 10), dpi: int = 100, figscale: float = 1.0,
+                       pixeles_por_punto: float = 1.0) -> int:
+    """
+    Numero de puntos que caben a lo ancho de una figura: ancho en pulgadas x dpi x figscale / pixeles_por_punto.
+    Para velas conviene pixeles_por_punto=3 (cuerpo, mecha y separacion).
+    """
+
+    return max(int(figsize[0] * dpi * figscale / pixeles_por_punto), 3)
+
+
+def _eje_x(indice: pd.Index) -> np.ndarray:
+    if isinstance(indice, pd.DatetimeIndex):
+        return indice.asi8.astype(float)
+    try:
+        return np.asarray(indice, dtype=float)
+    except (TypeError, ValueError):
+        return np.arange(len(indice), dtype=float)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, puntos: int) -> np.ndarray:
+    """
+    Posiciones elegidas por Largest-Triangle-Three-Buckets: el primer y el ultimo punto, y en cada una de las
+    puntos - 2 cubetas intermedias el punto que forma el triangulo de mayor area con el punto elegido en la cubeta
+    anterior y el promedio de la cubeta siguiente.
+
+    param : np.ndarray : x : Coordenada x (creciente, sin NaN).
+    param : np.ndarray : y : Valores (sin NaN).
+    param : int : puntos : Puntos a conservar.
+
+    return : np.ndarray : Posiciones crecientes de los puntos conservados.
+    """
+
+    n = len(y)
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    limites = np.linspace(1, n - 1, puntos - 1).astype(np.int64)
+    # Promedios de cada cubeta (y del ultimo punto, que hace de cubeta siguiente para la ultima) con sumas acumuladas
+    inicios = np.append(limites[:-1], n - 1)
+    fines = np.append(limites[1:], n)
+    suma_x = np.concatenate([[0.0], np.cumsum(x)])
+    suma_y = np.concatenate([[0.0], np.cumsum(y)])
+    media_x = (suma_x[fines] - suma_x[inicios]) / (fines - inicios)
+    media_y = (suma_y[fines] - suma_y[inicios]) / (fines - inicios)
+
+    seleccion = np.empty(puntos, dtype=np.int64)
+    seleccion[0], seleccion[-1] = 0, n - 1
+    a = 0
+    for i in range(puntos - 2):
+        inicio, fin = limites[i], limites[i + 1]
+        area = np.abs((x[a] - media_x[i + 1]) * (y[inicio:fin] - y[a])
+                      - (x[a] - x[inicio:fin]) * (media_y[i + 1] - y[a]))
+        a = inicio + int(np.argmax(area))
+        seleccion[i + 1] = a
+    return seleccion
+
+
+def indices_minmax(y: np.ndarray, puntos: int) -> np.ndarray:
+    """
+    Posiciones del minimo y el maximo de cada una de puntos // 2 cubetas de barras consecutivas (y del primer y ultimo
+    punto), de modo que ningun pico ni valle se pierde al dibujar.
+
+    return : np.ndarray : Posiciones crecientes y sin repetir.
+    """
+
+    n = len(y)
+    if puntos >= n:
+        return np.arange(n)
+
+    tamaño = -(-n // max(puntos // 2, 1))
+    cubetas = -(-n // tamaño)
+    relleno = np.full(cubetas * tamaño, np.nan)
+    relleno[:n] = y
+    bloques = relleno.reshape(cubetas, tamaño)
+    vacia = np.isnan(bloques).all(axis=1)
+
+    base = np.arange(cubetas) * tamaño
+    minimos = base + np.argmin(np.where(np.isnan(bloques), np.inf, bloques), axis=1)
+    maximos = base + np.argmax(np.where(np.isnan(bloques), -np.inf, bloques), axis=1)
+    return np.unique(np.concatenate([[0, n - 1], minimos[~vacia], maximos[~vacia]]))
+
+
+def reducir_serie(datos: Datos, puntos: int = PUNTOS_POR_DEFECTO, metodo: str = "lttb") -> Datos:
+    """
+    Reduce una serie (o cada columna de un DataFrame) a unos `puntos` puntos para dibujarla como linea.
+
+    param : pd.Series | pd.DataFrame : datos : Serie o columnas a graficar.
+    param : int : puntos : Presupuesto de puntos (ver presupuesto_puntos).
+    param : str : metodo : "lttb" (forma visual) o "minmax" (picos y valles exactos).
+
+    return : Las filas conservadas, con el mismo tipo que la entrada. En un DataFrame se conserva la union de las filas
+             elegidas para cada columna.
+    """
+
+    if metodo not in ("lttb", "minmax"):
+        raise ValueError(f"Metodo de reduccion desconocido: {metodo!r} (usar 'lttb' o 'minmax')")
+    if len(datos) <= puntos:
+        return datos
+
+    columnas = datos.to_frame() if isinstance(datos, pd.Series) else datos
+    x = _eje_x(columnas.index)
+    elegidas = []
+    for i in range(columnas.shape[1]):
+        y = columnas.iloc[:, i].to_numpy(dtype=float)
+        validas = np.flatnonzero(~np.isnan(y))
+        if metodo == "lttb":
+            elegidas.append(validas[lttb(x[validas], y[validas], puntos)])
+        else:
+            elegidas.append(validas[indices_minmax(y[validas], puntos)])
+    return datos.iloc[np.unique(np.concatenate(elegidas))]
+
+
+def _cubetas(barras: int, velas: int) -> np.ndarray:
+    """Primera barra de cada cubeta; todas las cubetas tienen el mismo tamaño salvo la ultima."""
+
+    tamaño = -(-barras // max(velas, 1))
+    return np.arange(0, barras, tamaño)
+
+
+def reducir_velas(df: pd.DataFrame, velas: int = VELAS_POR_DEFECTO) -> pd.DataFrame:
+    """
+    Agrega las barras OHLCV en `velas` velas de barras consecutivas: Open de la primera barra, High maximo, Low minimo,
+    Volume sumado y, para Close y el resto de columnas, el ultimo valor. Cada vela toma la fecha de su primera barra.
+
+    param : pd.DataFrame : df : Datos OHLCV (tambien con columnas MultiIndex (campo, ticker) de una descarga de varios
+            tickers).
+    param : int : velas : Numero maximo de velas (ver presupuesto_puntos con pixeles_por_punto=3).
+
+    return : pd.DataFrame : Velas agregadas con las mismas columnas que df (df sin cambios si ya cabe).
+    """
+
+    barras = len(df)
+    if barras <= velas:
+        return df
+
+    inicios = _cubetas(barras, velas)
+    campos = df.columns.get_level_values(0) if isinstance(df.columns, pd.MultiIndex) else df.columns
+    valores = df.to_numpy(dtype=float)
+    agregado = ultimo_valido(valores, inicios)
+
+    for j, campo in enumerate(campos):
+        columna = valores[:, j]
+        if campo == "Open":
+            agregado[:, j] = columna[inicios]
+        elif campo == "High":
+            agregado[:, j] = np.fmax.reduceat(columna, inicios)
+        elif campo == "Low":
+            agregado[:, j] = np.fmin.reduceat(columna, inicios)
+        elif campo == "Volume":
+            agregado[:, j] = np.add.reduceat(np.nan_to_num(columna), inicios)
+
+    return pd.DataFrame(agregado, index=df.index[inicios], columns=df.columns)
+
+
+def reducir_indicador(datos: Datos, velas: int = VELAS_POR_DEFECTO) -> Datos:
+    """
+    Reduce un indicador calculado sobre df a las mismas cubetas que reducir_velas(df, velas), tomando el ultimo valor
+    valido de cada cubeta, para dibujarlo encima de las velas reducidas (mpf.make_addplot necesita la misma longitud).
+    Las columnas booleanas (por ejemplo, Tendencia del TSI) se conservan como booleanas.
+    """
+
+    barras = len(datos)
+    if barras <= velas:
+        return datos
+
+    inicios = _cubetas(barras, velas)
+    columnas = datos.to_frame() if isinstance(datos, pd.Series) else datos
+    agregado = ultimo_valido(columnas.to_numpy(dtype=float), inicios)
+    resultado = pd.DataFrame(agregado, index=columnas.index[inicios], columns=columnas.columns)
+    for columna, tipo in columnas.dtypes.items():
+        if tipo == bool:
+            resultado[columna] = resultado[columna].astype(bool)
+
+    return resultado.iloc[:, 0].rename(datos.name) if isinstance(datos, pd.Series) else resultado
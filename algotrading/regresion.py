@@ -0,0 +1,194 @@
+"""
+Alpha y beta de forma cerrada para muchos tickers y uno o varios indices de referencia.
+
+La regresion y = alpha + beta * x de "05- Metricas de Rendimiento.py" (sm.OLS con sm.add_constant) tiene solucion
+cerrada: beta = cov(x, y) / var(x) y alpha = media(y) - beta * media(x). Aqui las sumas necesarias se obtienen con
+productos de matrices sobre los rendimientos alineados, de modo que N tickers contra K indices se resuelven en una sola
+llamada y sin importar statsmodels. El modo movil usa sumas acumuladas (cada barra cuesta O(1) por ticker) y
+AlphaBetaIncremental actualiza la regresion barra a barra para seguir la deriva de beta de un universo completo.
+"""
+
+# Importar librerias
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+Rendimientos = Union[pd.Series, pd.DataFrame]
+
+
+def _alinear(rendimientos: Rendimientos, benchmark: Rendimientos):
+    """Alinea por fecha y devuelve las matrices (barras x tickers) y (barras x indices) con sus nombres."""
+
+    y = rendimientos.to_frame() if isinstance(rendimientos, pd.Series) else rendimientos
+    x = benchmark.to_frame() if isinstance(benchmark, pd.Series) else benchmark
+    y, x = y.align(x, join="inner", axis=0)
+    return y.to_numpy(dtype=float), x.to_numpy(dtype=float), y.columns, x.columns, y.index
+
+
+def _coeficientes(n, Sx, Sy, Sxx, Sxy, Syy):
+    """Alpha (sin anualizar), beta y R^2 a partir del numero de observaciones y las sumas de x, y, x^2, x*y e y^2."""
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media_x, media_y = Sx / n, Sy / n
+        var_x = Sxx - Sx * media_x
+        cov_xy = Sxy - Sx * media_y
+        var_y = Syy - Sy * media_y
+        beta = cov_xy / var_x
+        alpha = media_y - beta * media_x
+        r2 = cov_xy ** 2 / (var_x * var_y)
+
+    return alpha, beta, r2
+
+
+def alpha_beta(rendimientos: Rendimientos, benchmark: Rendimientos,
+               periodos_anuales: Optional[int] = 252) -> pd.DataFrame:
+    """
+    Alpha y beta de cada ticker contra cada indice de referencia, equivalentes a sm.OLS(y, sm.add_constant(x)).
+
+    Cada par (ticker, indice) usa las fechas en las que ambos tienen dato, como si se hiciera dropna por separado.
+
+    param : pd.Series | pd.DataFrame : rendimientos : Rendimientos de los tickers (una columna por ticker).
+    param : pd.Series | pd.DataFrame : benchmark : Rendimientos del indice o indices de referencia (por ejemplo ^GSPC).
+    param : int : periodos_anuales : Periodos por año para anualizar el alpha (por defecto, 252; None no anualiza).
+
+    return : pd.DataFrame : Una fila por ticker con alpha, beta, r2 y observaciones. Con varios indices las columnas
+             son un MultiIndex (metrica, indice).
+    """
+
+    Y, X, tickers, indices, _ = _alinear(rendimientos, benchmark)
+    valido_y, valido_x = ~np.isnan(Y), ~np.isnan(X)
+
+    # Centrar cada serie en su media reduce la cancelacion numerica en var y cov (ambas son invariantes al centrado)
+    Y0 = np.where(valido_y, Y - np.nanmean(Y, axis=0), 0.0)
+    X0 = np.where(valido_x, X - np.nanmean(X, axis=0), 0.0)
+    My, Mx = valido_y.astype(float), valido_x.astype(float)
+
+    # Sumas por par (indice x ticker) restringidas a las fechas validas de ambos
+    n = Mx.T @ My
+    alpha, beta, r2 = _coeficientes(n, X0.T @ My, Mx.T @ Y0, (X0 ** 2).T @ My, X0.T @ Y0, Mx.T @ Y0 ** 2)
+    alpha = alpha + np.nanmean(Y, axis=0) - beta * np.nanmean(X, axis=0)[:, None]
+    if periodos_anuales:
+        alpha = alpha * periodos_anuales
+
+    resultado = {"alpha": alpha.T, "beta": beta.T, "r2": r2.T, "observaciones": n.T.astype(np.int64)}
+    if len(indices) == 1:
+        return pd.DataFrame({k: v[:, 0] for k, v in resultado.items()}, index=tickers)
+    return pd.concat({k: pd.DataFrame(v, index=tickers, columns=indices) for k, v in resultado.items()}, axis=1)
+
+
+def alpha_beta_movil(rendimientos: Rendimientos, benchmark: Rendimientos, ventana: int,
+                     min_periods: Optional[int] = None, periodos_anuales: Optional[int] = 252) -> pd.DataFrame:
+    """
+    Alpha y beta sobre una ventana movil de `ventana` barras para todos los tickers a la vez.
+
+    Las sumas de la ventana se obtienen como diferencia de sumas acumuladas, asi que cada barra cuesta O(1) por ticker
+    sin importar el tamaño de la ventana.
+
+    param : pd.Series | pd.DataFrame : rendimientos : Rendimientos de los tickers.
+    param : pd.Series | pd.DataFrame : benchmark : Rendimientos del indice o indices de referencia.
+    param : int : ventana : Numero de barras de la ventana.
+    param : int : min_periods : Observaciones validas necesarias en la ventana (por defecto, igual a ventana).
+    param : int : periodos_anuales : Periodos por año para anualizar el alpha (por defecto, 252).
+
+    return : pd.DataFrame : Columnas MultiIndex (metrica, ticker) con alpha y beta; con varios indices,
+             (metrica, indice, ticker).
+    """
+
+    Y, X, tickers, indices, fechas = _alinear(rendimientos, benchmark)
+    min_periods = ventana if min_periods is None else min_periods
+    valido_y = ~np.isnan(Y)
+    Y0 = np.where(valido_y, Y - np.nanmean(Y, axis=0), 0.0)
+
+    def movil(valores: np.ndarray) -> np.ndarray:
+        acumulado = np.concatenate([np.zeros((1,) + valores.shape[1:]), np.cumsum(valores, axis=0)])
+        inicio = np.maximum(np.arange(1, len(valores) + 1) - ventana, 0)
+        return acumulado[1:] - acumulado[inicio]
+
+    resultados = {}
+    for k, nombre in enumerate(indices):
+        x = X[:, k:k + 1]
+        media_x = np.nanmean(x)
+        valido = valido_y & ~np.isnan(x)
+        x0 = np.where(valido, x - media_x, 0.0)
+        y0 = np.where(valido, Y0, 0.0)
+
+        n = movil(valido.astype(float))
+        alpha, beta, _ = _coeficientes(n, movil(x0), movil(y0), movil(x0 ** 2), movil(x0 * y0), movil(y0 ** 2))
+        alpha = alpha + np.nanmean(Y, axis=0) - beta * media_x
+        if periodos_anuales:
+            alpha = alpha * periodos_anuales
+        insuficiente = n < max(min_periods, 2)
+        resultados[nombre] = {"alpha": np.where(insuficiente, np.nan, alpha),
+                              "beta": np.where(insuficiente, np.nan, beta)}
+
+    if len(indices) == 1:
+        return pd.concat({m: pd.DataFrame(v, index=fechas, columns=tickers)
+                          for m, v in resultados[indices[0]].items()}, axis=1)
+    return pd.concat({(m, nombre): pd.DataFrame(resultados[nombre][m], index=fechas, columns=tickers)
+                      for m in ("alpha", "beta") for nombre in indices}, axis=1)
+
+
+class AlphaBetaIncremental:
+    """
+    Alpha y beta moviles actualizados barra a barra en O(1) por ticker, para seguir la deriva de beta a diario.
+
+    Mantiene las sumas de la ventana y un buffer circular con las barras que salen. Cada `ventana` barras las sumas se
+    recalculan desde el buffer para que los errores de redondeo de sumar y restar no se acumulen.
+
+    param : int : ventana : Numero de barras de la ventana.
+    param : int : min_periods : Observaciones validas necesarias (por defecto, igual a ventana).
+    param : int : periodos_anuales : Periodos por año para anualizar el alpha (por defecto, 252).
+    """
+
+    def __init__(self, ventana: int, min_periods: Optional[int] = None, periodos_anuales: Optional[int] = 252):
+        self.ventana = ventana
+        self.min_periods = max(ventana if min_periods is None else min_periods, 2)
+        self.periodos_anuales = periodos_anuales
+        self.x = None
+        self.y = None
+        self.posicion = 0
+
+    def _sumas(self):
+        valido = ~np.isnan(self.y) & ~np.isnan(self.x)[:, None]
+        x = np.where(valido, self.x[:, None], 0.0)
+        y = np.where(valido, self.y, 0.0)
+        return [valido.sum(axis=0).astype(float), x.sum(axis=0), y.sum(axis=0), (x ** 2).sum(axis=0),
+                (x * y).sum(axis=0), (y ** 2).sum(axis=0)]
+
+    def actualizar(self, rendimientos, benchmark: float):
+        """
+        Incorpora una barra: rendimientos de los tickers (escalar o arreglo) y del indice de referencia.
+
+        return : (alpha, beta) de la ventana que termina en esta barra (NaN si no hay suficientes observaciones).
+        """
+
+        y = np.atleast_1d(np.asarray(rendimientos, dtype=float))
+        if self.y is None:
+            self.x = np.full(self.ventana, np.nan)
+            self.y = np.full((self.ventana, y.shape[0]), np.nan)
+            self.sumas = self._sumas()
+
+        # Quitar de las sumas la barra que sale de la ventana y añadir la nueva
+        for signo, x_barra, y_barra in ((-1.0, self.x[self.posicion], self.y[self.posicion]), (1.0, benchmark, y)):
+            valido = ~np.isnan(y_barra) & (x_barra == x_barra)
+            xv = np.where(valido, x_barra, 0.0)
+            yv = np.where(valido, y_barra, 0.0)
+            for i, termino in enumerate((valido, xv, yv, xv * xv, xv * yv, yv * yv)):
+                self.sumas[i] = self.sumas[i] + signo * termino
+        self.x[self.posicion] = benchmark
+        self.y[self.posicion] = y
+        self.posicion = (self.posicion + 1) % self.ventana
+        if self.posicion == 0:
+            self.sumas = self._sumas()
+
+        n = self.sumas[0]
+        alpha, beta, _ = _coeficientes(*self.sumas)
+        if self.periodos_anuales:
+            alpha = alpha * self.periodos_anuales
+        insuficiente = n < self.min_periods
+        alpha, beta = np.where(insuficiente, np.nan, alpha), np.where(insuficiente, np.nan, beta)
+
+        if np.ndim(rendimientos) == 0:
+            return alpha.item(), beta.item()
+        return alpha, beta
@@ -0,0 +1,232 @@
+"""
+Remuestreo local de barras: barras de 15 minutos, 1 hora o 1 dia construidas a partir de las de 1 minuto del almacen.
+
+Yahoo Finance limita la historia de cada intervalo (7 dias para 1m, 60 dias para 15m), y descargar cada intervalo por
+separado multiplica las peticiones. Con las barras finas guardadas, cualquier intervalo mas grueso se obtiene sin red:
+
+    barras_15m = remuestrear(barras_1m, "15m")
+    barras_1h = remuestrear(barras_1m, "1h", sesion=("09:30", "16:00"))     # horas alineadas a la apertura (NYSE)
+    remuestrear_almacen("BTC-USD", origen="1m", destino="1d")               # particion BTC-USD/1d del almacen
+
+Cada barra agregada toma el Open de la primera barra, el High maximo, el Low minimo, el Close de la ultima y la suma
+del Volume (Dividends se suman y los Stock Splits se multiplican; el resto de columnas toma el ultimo valor). Solo se
+generan barras para las cubetas con datos, con la fecha de inicio de la cubeta.
+
+Las cubetas se calculan sobre los instantes ordenados como enteros (nanosegundos) y se agregan con ufunc.reduceat,
+sin groupby. Zona horaria y sesion:
+
+    - Los intervalos de un dia o mas (1d, 5d, 1wk, 1mo, 3mo) se cortan en la hora local de `zona_horaria` (por
+      defecto, la del indice): un dia de AAPL es el dia de Nueva York aunque las barras vengan en UTC.
+    - Los intervalos intradia (1m a 90m, 1h) se cortan en la hora local pero se agrupan por instante, de modo que la
+      hora repetida al terminar el horario de verano no se mezcla en una sola barra y las fechas siempre crecen (con
+      90m, la cubeta que cruza el cambio se alarga hasta la siguiente cubeta local).
+    - `sesion` = (apertura, cierre) descarta las barras fuera del horario (pre y post mercado) y alinea las cubetas a
+      la apertura: con ("09:30", "16:00") las barras de 1h empiezan a las 9:30 como las de Yahoo. Una sesion que cruza
+      la medianoche (("18:00", "17:00") para los futuros del CME) agrupa en un dia de 18:00 a 18:00.
+
+RemuestreoIncremental y remuestrear_almacen actualizan las barras gruesas a medida que llegan barras de 1 minuto,
+volviendo a agregar solo la ultima cubeta (la unica que puede estar incompleta).
+"""
+
+# Importar librerias
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from algotrading.almacen import RUTA_ALMACEN, anexar_barras, cargar_arreglos, cargar_barras, guardar_barras, leer_meta
+from algotrading.cubetas import primero_valido, ultimo_valido
+
+Sesion = Optional[Tuple[str, str]]
+
+_NS_MINUTO = 60 * 10 ** 9
+_NS_DIA = 24 * 60 * _NS_MINUTO
+
+# Minutos de cada unidad de los intervalos de Yahoo Finance ('mo' se trata aparte: los meses no tienen duracion fija)
+_UNIDADES = {"m": 1, "h": 60, "d": 24 * 60, "wk": 7 * 24 * 60}
+
+# El 1970-01-01 fue jueves: las semanas se alinean al lunes siguiente
+_LUNES = 4 * _NS_DIA
+
+
+def _parsear_intervalo(intervalo: str) -> Tuple[int, str]:
+    coincidencia = re.fullmatch(r"(\d+)(mo|wk|m|h|d)", intervalo)
+    if coincidencia is None or int(coincidencia.group(1)) == 0:
+        raise ValueError(f"Intervalo no soportado: {intervalo!r} (por ejemplo '15m', '1h', '1d', '1wk' o '1mo')")
+    return int(coincidencia.group(1)), coincidencia.group(2)
+
+
+def _hora(texto: str) -> int:
+    """'09:30' -> nanosegundos desde la medianoche."""
+
+    return pd.Timedelta(texto + (":00" if texto.count(":") == 1 else "")).value
+
+
+def _instantes(indice: pd.DatetimeIndex, zona: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Instantes UTC y hora local (de pared) de cada barra, en nanosegundos. Un indice sin zona se toma como local."""
+
+    # asi8 en la unidad del indice (s, ms, us o ns) escalado a ns: as_unit copiaria todo el indice
+    escala = pd.Timedelta(1, unit=indice.unit).value
+    utc = indice.asi8 * escala
+    if indice.tz is None or zona == "UTC":
+        return utc, utc
+    return utc, indice.tz_convert(zona).tz_localize(None).asi8 * escala
+
+
+def _claves(utc: np.ndarray, local: np.ndarray, intervalo: str, apertura: int) -> Tuple[np.ndarray, bool]:
+    """
+    Clave de la cubeta de cada barra y si la clave es hora local (intervalos de un dia o mas) o un instante UTC
+    (intradia). Las claves no decrecen si los instantes estan ordenados.
+    """
+
+    cantidad, unidad = _parsear_intervalo(intervalo)
+    if unidad == "mo":
+        meses = (local - apertura).astype("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+        inicio = ((meses // cantidad) * cantidad).astype("datetime64[M]").astype("datetime64[ns]").astype(np.int64)
+        return inicio + apertura, True
+
+    paso = cantidad * _UNIDADES[unidad] * _NS_MINUTO
+    origen = apertura + (_LUNES if unidad == "wk" else 0)
+    inicio_local = (local - origen) // paso * paso + origen
+    if paso >= _NS_DIA:
+        return inicio_local, True
+    # Inicio de la cubeta como instante: la hora local de inicio menos la diferencia horaria de la barra. Al volver al
+    # horario de invierno, si el intervalo no divide la hora repetida (90m), el inicio de la barra siguiente al cambio
+    # queda antes que el de la anterior: esas barras siguen en la cubeta abierta hasta la siguiente cubeta local
+    return np.maximum.accumulate(inicio_local - (local - utc)), False
+
+
+def _en_sesion(local: np.ndarray, sesion: Sesion) -> np.ndarray:
+    apertura, cierre = (_hora(h) for h in sesion)
+    hora = np.mod(local, _NS_DIA)
+    if apertura < cierre:
+        return (hora >= apertura) & (hora < cierre)
+    return (hora >= apertura) | (hora < cierre)
+
+
+def _agregar(valores: np.ndarray, campos: pd.Index, inicios: np.ndarray) -> np.ndarray:
+    """Agrega las filas de cada cubeta (que empieza en `inicios`) segun el campo de cada columna."""
+
+    # Sin NaN, el primer y el ultimo valor de cada cubeta son los de sus filas extremas
+    completos = not np.isnan(valores).any()
+    fines = np.append(inicios[1:], valores.shape[0]) - 1
+    agregado = valores[fines] if completos else ultimo_valido(valores, inicios)
+    for j, campo in enumerate(campos):
+        columna = valores[:, j]
+        if campo == "Open":
+            agregado[:, j] = columna[inicios] if completos else primero_valido(valores[:, j:j + 1], inicios)[:, 0]
+        elif campo == "High":
+            agregado[:, j] = np.fmax.reduceat(columna, inicios)
+        elif campo == "Low":
+            agregado[:, j] = np.fmin.reduceat(columna, inicios)
+        elif campo in ("Volume", "Dividends"):
+            agregado[:, j] = np.add.reduceat(np.nan_to_num(columna), inicios)
+        elif campo == "Stock Splits":
+            # 0 significa sin split; varios splits en la misma cubeta se encadenan
+            factores = np.multiply.reduceat(np.where(np.nan_to_num(columna) == 0, 1.0, columna), inicios)
+            agregado[:, j] = np.where(factores == 1.0, 0.0, factores)
+    return agregado
+
+
+def _remuestrear(df: pd.DataFrame, intervalo: str, zona_horaria: Optional[str],
+                 sesion: Sesion) -> Tuple[pd.DataFrame, int]:
+    """remuestrear y la posicion (en df) de la primera barra de la ultima cubeta."""
+
+    indice = pd.DatetimeIndex(df.index)
+    if not indice.is_monotonic_increasing:
+        raise ValueError("Las barras deben estar ordenadas por fecha")
+    zona = zona_horaria or (str(indice.tz) if indice.tz is not None else None)
+    utc, local = _instantes(indice, zona)
+
+    valores = df.to_numpy(dtype=float)
+    posiciones = np.arange(len(df))
+    if sesion is not None:
+        posiciones = posiciones[_en_sesion(local, sesion)]
+        utc, local, valores = utc[posiciones], local[posiciones], valores[posiciones]
+    if not len(posiciones):
+        return df.iloc[:0], len(df)
+
+    claves, es_local = _claves(utc, local, intervalo, _hora(sesion[0]) if sesion is not None else 0)
+    inicios = np.concatenate([[0], np.flatnonzero(np.diff(claves)) + 1])
+    campos = df.columns.get_level_values(0) if isinstance(df.columns, pd.MultiIndex) else df.columns
+    agregado = _agregar(valores, campos, inicios)
+
+    fechas = pd.DatetimeIndex(claves[inicios].astype("datetime64[ns]"), name=indice.name)
+    if indice.tz is not None:
+        fechas = (fechas.tz_localize(zona, ambiguous=np.zeros(len(fechas), dtype=bool), nonexistent="shift_forward")
+                  if es_local else fechas.tz_localize("UTC").tz_convert(zona))
+
+    return pd.DataFrame(agregado, index=fechas, columns=df.columns), int(posiciones[inicios[-1]])
+
+
+def remuestrear(df: pd.DataFrame, intervalo: str, zona_horaria: Optional[str] = None,
+                sesion: Sesion = None) -> pd.DataFrame:
+    """
+    Agrega barras OHLCV a un intervalo mas grueso.
+
+    param : pd.DataFrame : df : Barras ordenadas por fecha (tambien con columnas MultiIndex (campo, ticker)).
+    param : str : intervalo : Intervalo de destino con la notacion de Yahoo Finance ('15m', '1h', '1d', '1wk', '1mo').
+    param : str : zona_horaria : Zona en la que se cortan las cubetas (por defecto, la del indice). Un indice sin zona
+            se toma como hora local.
+    param : tuple : sesion : (apertura, cierre) en hora local, por ejemplo ("09:30", "16:00"): filtra las barras fuera
+            de la sesion y alinea las cubetas a la apertura (opcional).
+
+    return : pd.DataFrame : Barras agregadas, con la fecha de inicio de cada cubeta (en zona_horaria si el indice
+             tiene zona) y las mismas columnas que df.
+    """
+
+    return _remuestrear(df, intervalo, zona_horaria, sesion)[0]
+
+
+class RemuestreoIncremental:
+    """
+    Remuestreo de barras que llegan por tandas (por ejemplo, cada minuto). Guarda las barras finas de la ultima
+    cubeta, que puede estar incompleta, y en cada tanda solo vuelve a agregar esa cubeta y las nuevas. Una barra que
+    llega de nuevo con la misma fecha (la barra en curso revisada) reemplaza a la anterior.
+
+    param : str : intervalo : Intervalo de destino.
+    param : str : zona_horaria : Zona en la que se cortan las cubetas (por defecto, la del indice).
+    param : tuple : sesion : (apertura, cierre) en hora local (opcional).
+    """
+
+    def __init__(self, intervalo: str, zona_horaria: Optional[str] = None, sesion: Sesion = None):
+        _parsear_intervalo(intervalo)
+        self.intervalo = intervalo
+        self.zona_horaria = zona_horaria
+        self.sesion = sesion
+        self.pendientes: Optional[pd.DataFrame] = None
+
+    def actualizar(self, barras: pd.DataFrame) -> pd.DataFrame:
+        """
+        Incorpora nuevas barras finas y devuelve las barras gruesas que cambiaron: la ultima ya emitida (actualizada)
+        si las nuevas barras caen en su cubeta, y las nuevas cubetas.
+        """
+
+        if self.pendientes is not None and len(self.pendientes):
+            barras = pd.concat([self.pendientes, barras])
+            barras = barras[~barras.index.duplicated(keep="last")].sort_index()
+        resultado, ultima = _remuestrear(barras, self.intervalo, self.zona_horaria, self.sesion)
+        self.pendientes = barras.iloc[ultima:]
+        return resultado
+
+
+def remuestrear_almacen(ticker: str, origen: str = "1m", destino: str = "15m", zona_horaria: Optional[str] = None,
+                        sesion: Sesion = None, ruta: str = RUTA_ALMACEN) -> str:
+    """
+    Construye (o pone al dia) la particion ticker/destino del almacen a partir de las barras de ticker/origen, sin
+    descargar nada. Si la particion de destino ya existe solo se leen las barras de origen desde el inicio de su
+    ultima barra, que se reemplaza junto con las nuevas (anexar_barras).
+
+    return : str : Carpeta de la particion escrita.
+    """
+
+    inicio = None
+    meta = leer_meta(ticker, destino, ruta)
+    if meta is not None and meta["filas"]:
+        inicio = pd.Timestamp(int(cargar_arreglos(ticker, destino, ruta=ruta)["fecha"][-1]), tz="UTC")
+
+    nuevas = remuestrear(cargar_barras(ticker, origen, inicio=inicio, ruta=ruta), destino, zona_horaria, sesion)
+    if inicio is None:
+        return guardar_barras(nuevas, ticker, destino, ruta)
+    return anexar_barras(nuevas, ticker, destino, ruta)
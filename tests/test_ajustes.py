@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from algotrading import ajustes, almacen
+
+
+def _barras(n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": 1e6,
+                         "Dividends": 0.0, "Stock Splits": 0.0},
+                        index=pd.date_range("2020-01-01", periods=n, freq="D", tz="America/New_York"))
+
+
+def _comparar(ruta: str, df: pd.DataFrame) -> None:
+    np.testing.assert_allclose(ajustes.cargar_ajustadas("X", "1d", ruta=ruta)["Close"],
+                               ajustes.ajustar_barras(df)["Close"], rtol=1e-12)
+
+
+def test_barras_reenviadas_con_acciones_y_cierres_nuevos(tmp_path):
+    ruta = str(tmp_path)
+    df = _barras()
+    almacen.guardar_barras(df.iloc[:250], "X", "1d", ruta)
+    ajustes.actualizar_ajustes("X", "1d", ruta)
+
+    # Las tres ultimas barras guardadas vuelven con un dividendo y un cierre corregido, junto con barras nuevas
+    df.iloc[247, df.columns.get_loc("Dividends")] = 1.0
+    df.iloc[248, df.columns.get_loc("Close")] *= 1.02
+    df.iloc[270, df.columns.get_loc("Stock Splits")] = 2.0
+    almacen.anexar_barras(df.iloc[247:280], "X", "1d", ruta)
+    assert ajustes.actualizar_ajustes("X", "1d", ruta) == 250
+    _comparar(ruta, df.iloc[:280])
+
+    almacen.anexar_barras(df.iloc[280:], "X", "1d", ruta)
+    assert ajustes.actualizar_ajustes("X", "1d", ruta) == 0
+    _comparar(ruta, df)
+
+
+def test_registrar_accion_escribe_una_version_nueva(tmp_path):
+    ruta = str(tmp_path)
+    df = _barras()
+    almacen.guardar_barras(df, "X", "1d", ruta)
+    ajustes.actualizar_ajustes("X", "1d", ruta)
+    version = almacen.leer_meta("X", "1d", ruta)["version"]
+
+    assert ajustes.registrar_accion("X", "1d", df.index[120], dividendo=0.5, ruta=ruta) == 120
+    assert almacen.leer_meta("X", "1d", ruta)["version"] == version + 1
+    df.iloc[120, df.columns.get_loc("Dividends")] = 0.5
+    _comparar(ruta, df)
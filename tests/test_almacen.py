@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from algotrading import almacen
+from algotrading.benchmark import generar_ohlcv
+
+
+def _barras(n: int = 300) -> pd.DataFrame:
+    df = generar_ohlcv(n, 1, semilla=5)
+    df.index = pd.date_range("2024-01-01", periods=n, freq="min", tz="UTC")
+    return df
+
+
+@pytest.mark.parametrize("reenviar", [False, True])
+def test_anexar_interrumpido_conserva_la_version_anterior(tmp_path, monkeypatch, reenviar):
+    ruta = str(tmp_path)
+    df = _barras()
+    almacen.guardar_barras(df.iloc[:200], "X", "1m", ruta)
+    antes = almacen.cargar_barras("X", "1m", ruta=ruta)
+
+    # Las barras nuevas empiezan en la ultima guardada, con otro cierre si reenviar
+    nuevas = df.iloc[199:250].copy()
+    if reenviar:
+        nuevas.iloc[0, nuevas.columns.get_loc("Close")] += 1.0
+
+    def interrumpir(*argumentos):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as m:
+        m.setattr(almacen, "_confirmar_particion", interrumpir)
+        with pytest.raises(KeyboardInterrupt):
+            almacen.anexar_barras(nuevas, "X", "1m", ruta)
+    pd.testing.assert_frame_equal(almacen.cargar_barras("X", "1m", ruta=ruta), antes)
+
+    almacen.anexar_barras(nuevas, "X", "1m", ruta)
+    esperado = pd.concat([df.iloc[:199], nuevas])
+    pd.testing.assert_frame_equal(almacen.cargar_barras("X", "1m", ruta=ruta), esperado, check_names=False,
+                                  check_index_type=False, check_freq=False)
+    assert almacen.leer_meta("X", "1m", ruta)["version"] == (2 if reenviar else 1)
+
+
+def test_anexar_sin_cambios_no_toca_las_filas_guardadas(tmp_path):
+    ruta = str(tmp_path)
+    df = _barras()
+    almacen.guardar_barras(df.iloc[:200], "X", "1m", ruta)
+    lector = almacen.cargar_arreglos("X", "1m", ruta=ruta)
+    close = np.array(lector["Close"])
+
+    almacen.anexar_barras(df.iloc[150:], "X", "1m", ruta)
+    np.testing.assert_array_equal(lector["Close"], close)
+    np.testing.assert_array_equal(almacen.cargar_arreglos("X", "1m", ruta=ruta)["Close"], df["Close"].to_numpy())
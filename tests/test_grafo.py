@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from algotrading import grafo
+from algotrading.benchmark import generar_ohlcv
+
+
+def test_entrada_repetida():
+    df = generar_ohlcv(500, 1, semilla=3)
+    ema = df["Close"].ewm(span=12, min_periods=12, adjust=False).mean()
+
+    variables = grafo.Grafo({"doble": grafo.EMA(12) + grafo.EMA(12)}).evaluar(df)
+    pd.testing.assert_series_equal(variables["doble"], 2 * ema, check_names=False)
+
+    precio = grafo.columna("Close")
+    variables = grafo.Grafo({"suma": grafo.Nodo("suma", (precio, precio)), "EMA": grafo.EMA(12)}).evaluar(df)
+    np.testing.assert_allclose(variables["suma"], 2 * df["Close"])
+    np.testing.assert_allclose(variables["EMA"], ema)
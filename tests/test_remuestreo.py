@@ -0,0 +1,14 @@
+import pandas as pd
+import pytest
+
+from algotrading.remuestreo import remuestrear
+
+
+@pytest.mark.parametrize("intervalo", ["15m", "1h", "90m"])
+def test_fin_del_horario_de_verano_no_repite_fechas(intervalo):
+    indice = pd.date_range("2024-11-02 20:00", "2024-11-03 06:00", freq="min", tz="America/New_York")
+    df = pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1.0}, index=indice)
+
+    barras = remuestrear(df, intervalo)
+    assert barras.index.is_monotonic_increasing and barras.index.is_unique
+    assert barras["Volume"].sum() == len(df)